@@ -0,0 +1,222 @@
+import logging
+import re
+import sqlite3
+import time
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from .csv_service import CSVService
+from .metrics import timed
+from .repository import APP_TABLES
+from .schemas.field_checks import unwrap_optional
+from .schemas.registry import schema_name_for
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany and transaction
+LOAD_BATCH_SIZE = 100_000
+# Loading favours speed: a crash mid-load loses at most the current batch,
+# which is reported as not loaded anyway. Only for a database the loader
+# owns, synchronous=OFF risks corrupting whatever else a database holds
+LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": -256 * 1024,
+}
+# For a database shared with the app, durability is left as configured
+SHARED_DB_PRAGMAS = {
+    "temp_store": "MEMORY",
+    "cache_size": -256 * 1024,
+}
+TRUE_VALUES = {"1", "on", "t", "true", "y", "yes"}
+FALSE_VALUES = {"0", "off", "f", "false", "n", "no"}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_SQLITE_TYPES = {int: "INTEGER", float: "REAL", bool: "INTEGER"}
+
+
+class LoadProgress(BaseModel):
+    rows_loaded: int
+    # From the upload profile, unknown for files stored without one
+    total_rows: int | None = None
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_loaded / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class LoadResult(BaseModel):
+    table: str
+    rows_loaded: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+def create_table_sql(schema_class: type[BaseModel], table: str) -> str:
+    """
+    One column per schema field, typed from its annotation
+    (SQLite affinity turns numeric strings into numbers on insert).
+    Required fields are NOT NULL.
+    """
+    columns = []
+    for name, field in schema_class.model_fields.items():
+        sql_type = _SQLITE_TYPES.get(unwrap_optional(field.annotation), "TEXT")
+        not_null = " NOT NULL" if field.is_required() else ""
+        columns.append(f"{_quote(name)} {sql_type}{not_null}")
+    return f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(columns)})'
+
+
+class SQLiteBulkLoader:
+    """
+    Loads the mapped columns of a stored upload into a table built from the
+    target schema. Rows are inserted with executemany, one transaction per
+    batch, on a dedicated connection with load-oriented pragmas.
+    Tables of the app's own database are never loaded into.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        schema_class: type[BaseModel],
+        table: str | None = None,
+        batch_size: int = LOAD_BATCH_SIZE,
+        pragmas: Dict[str, str | int] | None = None,
+        owns_db: bool = True,
+    ):
+        """
+        owns_db=False when the database is shared with the app: the unsafe
+        load pragmas are then left out.
+        """
+        self.db_path = db_path
+        self.schema_class = schema_class
+        self.table = table or schema_name_for(schema_class)
+        if not _IDENTIFIER.fullmatch(self.table):
+            raise ValueError(f"Invalid table name: {self.table}")
+        # SQLite table names are case-insensitive
+        lowered = self.table.lower()
+        if lowered in APP_TABLES or lowered.startswith("sqlite_"):
+            raise ValueError(f"Table {self.table} is reserved")
+        self.batch_size = batch_size
+        if pragmas is None:
+            pragmas = LOAD_PRAGMAS if owns_db else SHARED_DB_PRAGMAS
+        self.pragmas = pragmas
+
+    @timed("load.sqlite")
+    def load(
+        self,
+        csv_service: CSVService,
+        filename: str,
+        mapping: Dict[str, str | None],
+        replace: bool = False,
+        progress: Callable[[LoadProgress], None] | None = None,
+    ) -> LoadResult:
+        """
+        Appends the mapped rows (or replaces the table's content with replace).
+        Batches committed before a failure stay loaded.
+        Raises ValueError when nothing is mapped or mapped columns are not in
+        the file, before anything is written.
+        """
+        targets = [
+            target for target in self.schema_class.model_fields if mapping.get(target)
+        ]
+        if not targets:
+            raise ValueError("No mapped columns to load")
+        columns = set(csv_service.get_columns(csv_service.storage_path / filename))
+        missing = sorted({mapping[target] for target in targets} - columns)
+        if missing:
+            raise ValueError(f"Mapped columns not in file: {', '.join(missing)}")
+        bool_targets = {
+            target
+            for target in targets
+            if unwrap_optional(self.schema_class.model_fields[target].annotation)
+            is bool
+        }
+        profile = csv_service.get_profile(filename)
+        total_rows = profile.row_count if profile is not None else None
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            for pragma, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {pragma} = {value}")
+            if replace:
+                conn.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+            conn.execute(create_table_sql(self.schema_class, self.table))
+            insert = (
+                f'INSERT INTO "{self.table}" ({", ".join(map(_quote, targets))}) '
+                f'VALUES ({", ".join("?" * len(targets))})'
+            )
+
+            start = time.perf_counter()
+            rows_loaded = 0
+            # Only empty fields are NULL, text like "NA" is loaded as it is
+            for chunk in csv_service.iter_chunks(
+                filename,
+                {mapping[target] for target in targets},
+                self.batch_size,
+                na_tokens=False,
+            ):
+                rows = self._rows(chunk, targets, mapping, bool_targets)
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(insert, rows)
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+                rows_loaded += len(chunk)
+                if progress is not None:
+                    progress(
+                        LoadProgress(
+                            rows_loaded=rows_loaded,
+                            total_rows=total_rows,
+                            elapsed_seconds=time.perf_counter() - start,
+                        )
+                    )
+            elapsed = time.perf_counter() - start
+        finally:
+            conn.close()
+
+        logger.info(f"Loaded {rows_loaded} rows into {self.table} in {elapsed:.2f}s")
+        return LoadResult(
+            table=self.table,
+            rows_loaded=rows_loaded,
+            elapsed_seconds=elapsed,
+            rows_per_second=rows_loaded / elapsed if elapsed else 0.0,
+        )
+
+    @staticmethod
+    def _rows(
+        chunk: pd.DataFrame,
+        targets: List[str],
+        mapping: Dict[str, str | None],
+        bool_targets: set,
+    ):
+        """
+        Row tuples for executemany, NAs as NULL. Booleans become 0/1,
+        other values are passed as strings and left to column affinity.
+        """
+        columns = []
+        for target in targets:
+            values = chunk[mapping[target]].to_numpy(dtype=object, na_value=None)
+            if target in bool_targets:
+                values = np.array([_to_bool(value) for value in values], dtype=object)
+            columns.append(values)
+        return zip(*columns)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _to_bool(value: str | None):
+    if value is None:
+        return None
+    lowered = value.strip().lower()
+    if lowered in TRUE_VALUES:
+        return 1
+    if lowered in FALSE_VALUES:
+        return 0
+    return value
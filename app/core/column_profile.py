@@ -0,0 +1,172 @@
+import codecs
+import csv
+import logging
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Set
+from pydantic import BaseModel
+from .sampling import ReservoirSampler
+from .csv_records import RecordSplitter, dedupe_column_names, detect_delimiter
+
+logger = logging.getLogger(__name__)
+
+# Values pandas.read_csv treats as NA by default
+NA_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+SAMPLE_SIZE = 5
+# Rows kept in the uniform row sample that preview validation runs on
+RESERVOIR_SIZE = 2000
+
+
+class ColumnProfile(BaseModel):
+    null_count: int = 0
+    sample: List[str] = []
+
+
+class FileProfile(BaseModel):
+    row_count: int = 0
+    columns: Dict[str, ColumnProfile] = {}
+
+    def columns_with_na(self, columns: Iterable[str]) -> Set[str]:
+        return {
+            col
+            for col in columns
+            if col in self.columns and self.columns[col].null_count > 0
+        }
+
+
+class ColumnProfiler:
+    """
+    Builds a FileProfile from raw CSV bytes fed chunk by chunk,
+    so it can ride along with the upload write instead of re-reading the file.
+    Without a header row, columns are named column_n after the first record.
+    A uniform sample of raw rows is drawn on the way, see sample_rows.
+    """
+
+    def __init__(
+        self,
+        has_header: bool = True,
+        sample_size: int = SAMPLE_SIZE,
+        reservoir_size: int = RESERVOIR_SIZE,
+        seed: int | None = None,
+    ):
+        self.has_header = has_header
+        self.sample_size = sample_size
+        self._reservoir: ReservoirSampler[List[str]] = ReservoirSampler(
+            reservoir_size, seed
+        )
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._splitter = RecordSplitter()
+        self._columns: List[str] | None = None
+        self._delimiter: str | None = None
+        self._profile: FileProfile | None = None
+        self._failed = False
+
+    @property
+    def columns(self) -> List[str] | None:
+        """
+        Column names, available as soon as the first record has been fed.
+        """
+        return self._columns
+
+    @property
+    def delimiter(self) -> str | None:
+        """
+        Delimiter sniffed from the first record.
+        """
+        return self._delimiter
+
+    @property
+    def sample_rows(self) -> List[List[str]]:
+        """
+        Uniformly sampled data rows, as raw field values.
+        """
+        return self._reservoir.items
+
+    def feed(self, chunk: bytes):
+        if self._failed:
+            return
+        self._consume(self._splitter.feed(self._decoder.decode(chunk)))
+
+    def finish(self) -> FileProfile | None:
+        """
+        Returns the profile, or None if the content could not be parsed as CSV.
+        """
+        if not self._failed:
+            records = self._splitter.feed(self._decoder.decode(b"", final=True))
+            if self._splitter.in_quotes:
+                logger.warning("Skipping column profile: unterminated quoted field")
+                self._failed = True
+            else:
+                self._consume(records + self._splitter.flush())
+        if self._failed:
+            return None
+        return self._profile or FileProfile()
+
+    def _consume(self, records: List[str]):
+        if not records or self._failed:
+            return
+        if self._delimiter is None:
+            first = next((record for record in records if record.strip("\r\n")), None)
+            if first is None:
+                return
+            self._delimiter = detect_delimiter(first)
+        try:
+            rows = [
+                row for row in csv.reader(records, delimiter=self._delimiter) if row
+            ]
+        except csv.Error as e:
+            logger.warning(f"Skipping column profile: {e}")
+            self._failed = True
+            return
+
+        if self._profile is None and rows:
+            if self.has_header:
+                self._columns = dedupe_column_names(rows.pop(0))
+            else:
+                self._columns = [f"column_{i}" for i in range(len(rows[0]))]
+            self._profile = self._empty_profile(self._columns)
+        if not rows:
+            return
+
+        self._profile.row_count += len(rows)
+        self._reservoir.offer(rows)
+        width = len(self._columns)
+        # Pad short rows so every column sees a value, like pandas' NaN filling
+        rows[0] = rows[0] + [""] * (width - len(rows[0]))
+        for name, values in zip(self._columns, zip_longest(*rows, fillvalue="")):
+            column = self._profile.columns[name]
+            column.null_count += sum(map(NA_VALUES.__contains__, values))
+            if len(column.sample) < self.sample_size:
+                self._add_sample(column, values)
+
+    def _add_sample(self, column: ColumnProfile, values: Iterable[str]):
+        for value in values:
+            if value not in NA_VALUES and value not in column.sample:
+                column.sample.append(value)
+                if len(column.sample) >= self.sample_size:
+                    break
+
+    @staticmethod
+    def _empty_profile(columns: List[str]) -> FileProfile:
+        return FileProfile(columns={name: ColumnProfile() for name in columns})
@@ -0,0 +1,431 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Set
+
+logger = logging.getLogger(__name__)
+
+# Data types stored as they are, everything else is stored as text
+_NATIVE_KINDS = "biufcmM"
+# Bytes per row on top of the text itself: an int64 offset and a NA flag
+_TEXT_ROW_BYTES = 9
+# Ends every stored text value, so a chunk of values is split in one call
+_TERMINATOR = "\x00"
+
+
+class ColumnarCache:
+    """
+    On-disk cache of parsed CSVs, one set of files per column so single columns
+    can be loaded without touching the rest, and scans add the columns they
+    read to what is already cached for a file. Columns are written chunk by
+    chunk and read back chunk by chunk from memory-mapped files.
+    Text is stored as NUL-terminated UTF-8 with row offsets and a NA mask, so
+    long values cost only their own length and nothing is ever unpickled.
+    Columns parsed with na_tokens=False (only empty fields are NA) are
+    cached apart from those parsed with pandas' default NA tokens.
+    Entries are evicted least-recently-used first once max_bytes is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+    def get(self, key: str, columns: List[str] | None = None) -> pd.DataFrame | None:
+        """
+        Returns the cached columns, or just those requested that are cached,
+        in file order. None if nothing is cached for key or it was evicted
+        mid-read.
+        """
+        opened = self._open(key, columns)
+        if opened is None:
+            return None
+        return _slice(opened, 0, _row_count(opened))
+
+    def iter_chunks(
+        self,
+        key: str,
+        columns: Iterable[str],
+        chunk_size: int,
+        na_tokens: bool = True,
+    ) -> Iterator[pd.DataFrame] | None:
+        """
+        The requested columns chunk by chunk, indexed by row number.
+        None unless every one of columns is cached.
+        """
+        columns = list(columns)
+        opened = self._open(key, columns, na_tokens)
+        if opened is None or len(opened) != len(set(columns)):
+            return None
+        rows = _row_count(opened)
+        return (
+            _slice(opened, start, min(start + chunk_size, rows))
+            for start in range(0, rows, chunk_size)
+        )
+
+    def na_columns(self, key: str, columns: Iterable[str]) -> Set[str] | None:
+        """
+        Which of columns hold a NA, without decoding any text.
+        None unless every one of columns is cached.
+        """
+        columns = set(columns)
+        opened = self._open(key, columns)
+        if opened is None or len(opened) != len(columns):
+            return None
+        return {
+            entry["name"]
+            for entry, arrays in opened
+            if (
+                arrays["na"].any() if entry["text"] else pd.isna(arrays["values"]).any()
+            )
+        }
+
+    def has(self, key: str, columns: Iterable[str]) -> bool:
+        """
+        Whether every one of columns is cached for key.
+        """
+        try:
+            cached = {entry["name"] for entry in self._entries(self.cache_dir / key)}
+        except (OSError, ValueError, KeyError):
+            return False
+        return set(columns) <= cached
+
+    def writer(
+        self, key: str, positions: Dict[str, int], na_tokens: bool = True
+    ) -> "CacheWriter":
+        """
+        Writer adding the columns in positions (name to place in the file)
+        that are not cached yet under key.
+        """
+        return CacheWriter(self, key, positions, na_tokens)
+
+    def put(self, key: str, df: pd.DataFrame, positions: Dict[str, int] | None = None):
+        """
+        Adds the columns of df that are not cached yet under key, then evicts
+        old entries to respect max_bytes. positions gives the place of each
+        column in the file, df's column order by default.
+        """
+        if positions is None:
+            positions = {name: i for i, name in enumerate(df.columns)}
+        writer = self.writer(key, positions)
+        if writer.append(df):
+            writer.commit()
+
+    def evict(self):
+        """
+        Removes least-recently-used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            try:
+                entries.append(
+                    (entry_dir.stat().st_mtime, _dir_size(entry_dir), entry_dir)
+                )
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted {entry_dir.name} from columnar cache")
+
+    def discard(self, key: str):
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+
+    def size(self) -> int:
+        total = 0
+        for entry_dir in self.cache_dir.iterdir():
+            try:
+                total += _dir_size(entry_dir)
+            except OSError:
+                continue
+        return total
+
+    def _open(self, key: str, columns: Iterable[str] | None, na_tokens: bool = True):
+        """
+        Memory-maps the requested cached columns of key, in file order.
+        None if nothing is cached for key or it was evicted mid-read.
+        """
+        entry_dir = self.cache_dir / key
+        try:
+            entries = self._entries(entry_dir, na_tokens)
+            if not entries:
+                return None
+            if columns is not None:
+                wanted = set(columns)
+                entries = [entry for entry in entries if entry["name"] in wanted]
+            opened = [(entry, _map_column(entry_dir, entry)) for entry in entries]
+            # Mark as recently used
+            os.utime(entry_dir)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Columnar cache miss for {key}: {e}")
+            return None
+        return opened
+
+    @staticmethod
+    def _entries(entry_dir: Path, na_tokens: bool = True) -> List[dict]:
+        """
+        Descriptions of the complete columns of an entry, in file order.
+        """
+        entries = [
+            entry
+            for entry in (
+                json.loads(path.read_text())
+                for path in entry_dir.glob("*.json")
+                if not path.name.startswith(".")
+            )
+            if entry.get("na_tokens", True) == na_tokens
+        ]
+        return sorted(entries, key=lambda entry: entry["position"])
+
+
+class CacheWriter:
+    """
+    Streams chunks of a scan into new columns of a cache entry. Nothing is
+    visible to readers until commit(); a scan that stops early or outgrows
+    the cache budget leaves nothing behind.
+    """
+
+    def __init__(
+        self,
+        cache: ColumnarCache,
+        key: str,
+        positions: Dict[str, int],
+        na_tokens: bool = True,
+    ):
+        self.cache = cache
+        self.entry_dir = cache.cache_dir / key
+        self.positions = positions
+        self.na_tokens = na_tokens
+        self.rows = 0
+        self.bytes = 0
+        self._tmp = f".tmp-{uuid.uuid4().hex}"
+        # Description of every column written so far
+        self._columns: Dict[str, dict] = {}
+        # Byte offset where the text written so far ends, per column
+        self._ends: Dict[str, int] = {}
+        self._files = {}
+        self._failed = False
+        try:
+            cached = {
+                entry["name"] for entry in cache._entries(self.entry_dir, na_tokens)
+            }
+        except (OSError, ValueError, KeyError):
+            cached = set()
+        self._pending = [name for name in positions if name not in cached]
+
+    def append(self, chunk: pd.DataFrame) -> bool:
+        """
+        Writes the next rows of the pending columns. False once the entry
+        would exceed the cache budget or could not be written, the writer is
+        then aborted and ignores further chunks.
+        """
+        if self._failed:
+            return False
+        if not self._pending:
+            return True
+        # Checked before anything is encoded, text takes at least a byte per character
+        estimate = sum(_estimate_bytes(chunk[name]) for name in self._pending)
+        if self.bytes + estimate > self.cache.max_bytes:
+            logger.info(f"Not caching {self.entry_dir.name}: exceeds the cache limit")
+            self.abort()
+            return False
+
+        try:
+            self.entry_dir.mkdir(exist_ok=True)
+            for name in self._pending:
+                self.bytes += self._write(name, chunk[name])
+        except OSError as e:
+            # Evicted meanwhile
+            logger.debug(
+                f"Could not store {self.entry_dir.name} in columnar cache: {e}"
+            )
+            self.abort()
+            return False
+        self.rows += len(chunk)
+        if self.bytes > self.cache.max_bytes:
+            self.abort()
+            return False
+        return True
+
+    def commit(self):
+        """
+        Publishes the written columns, then evicts old entries to respect
+        max_bytes.
+        """
+        if self._failed or not self._columns:
+            return
+        try:
+            for file_obj in self._files.values():
+                file_obj.close()
+            for name, column in self._columns.items():
+                stem = _stem(name, self.na_tokens)
+                for part in _PARTS[column["text"]]:
+                    os.replace(
+                        self.entry_dir / f"{self._tmp}-{stem}.{part}",
+                        self.entry_dir / f"{stem}.{part}",
+                    )
+                # Written last, a column only counts as cached once it exists
+                description = {
+                    "name": name,
+                    "position": self.positions[name],
+                    "file": stem,
+                    "rows": self.rows,
+                    "na_tokens": self.na_tokens,
+                    **column,
+                }
+                (self.entry_dir / f"{self._tmp}-{stem}.json").write_text(
+                    json.dumps(description)
+                )
+                os.replace(
+                    self.entry_dir / f"{self._tmp}-{stem}.json",
+                    self.entry_dir / f"{stem}.json",
+                )
+        except OSError as e:
+            logger.debug(
+                f"Could not store {self.entry_dir.name} in columnar cache: {e}"
+            )
+            self.abort()
+            return
+        self.cache.evict()
+
+    def abort(self):
+        self._failed = True
+        for file_obj in self._files.values():
+            file_obj.close()
+        for leftover in self.entry_dir.glob(f"{self._tmp}-*"):
+            leftover.unlink(missing_ok=True)
+
+    def _write(self, name: str, series: pd.Series) -> int:
+        column = self._columns.get(name)
+        if column is None:
+            text = not (
+                isinstance(series.dtype, np.dtype)
+                and series.dtype.kind in _NATIVE_KINDS
+            )
+            column = self._columns[name] = {"text": text, "dtype": str(series.dtype)}
+        if not column["text"]:
+            return self._open_file(name, "values").write(series.to_numpy().tobytes())
+
+        mask = series.isna().to_numpy()
+        texts = series.to_numpy(dtype=object)[~mask].tolist()
+        if not isinstance(series.dtype, pd.StringDtype):
+            texts = list(map(str, texts))
+        joined = _TERMINATOR.join(texts) + _TERMINATOR if texts else ""
+        if joined.count(_TERMINATOR) != len(texts):
+            # Terminators are ambiguous, read back value by value instead
+            column["nul"] = True
+        data = joined.encode("utf-8")
+        lengths = np.zeros(len(series), dtype=np.int64)
+        if data.isascii():
+            lengths[~mask] = np.fromiter(map(len, texts), np.int64, len(texts)) + 1
+        else:
+            lengths[~mask] = [len(text.encode("utf-8")) + 1 for text in texts]
+        # Offsets hold where every value ends, the first one starts at 0
+        offsets = self._ends.get(name, 0) + np.cumsum(lengths)
+        if len(offsets):
+            self._ends[name] = int(offsets[-1])
+        return (
+            self._open_file(name, "offsets").write(offsets.tobytes())
+            + self._open_file(name, "data").write(data)
+            + self._open_file(name, "na").write(mask.tobytes())
+        )
+
+    def _open_file(self, name: str, part: str):
+        file_obj = self._files.get((name, part))
+        if file_obj is None:
+            path = self.entry_dir / f"{self._tmp}-{_stem(name, self.na_tokens)}.{part}"
+            file_obj = self._files[(name, part)] = open(path, "wb")
+        return file_obj
+
+
+# Files making up a column, for text and for native values
+_PARTS = {True: ("offsets", "data", "na"), False: ("values",)}
+
+
+def _stem(name: str, na_tokens: bool) -> str:
+    # Column names can be anything, file names are derived from them
+    stem = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+    return stem if na_tokens else f"{stem}-literal"
+
+
+def _estimate_bytes(series: pd.Series) -> int:
+    """
+    Lower bound on the cached size of a chunk of a column.
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in _NATIVE_KINDS:
+        return series.dtype.itemsize * len(series)
+    texts = series.dropna()
+    if texts.dtype == object:
+        texts = texts.astype(str)
+    return int(texts.str.len().sum()) + _TEXT_ROW_BYTES * len(series)
+
+
+def _map_column(entry_dir: Path, entry: dict) -> Dict[str, np.ndarray]:
+    stem = entry["file"]
+    if not entry["text"]:
+        return {"values": _map(entry_dir / f"{stem}.values", entry["dtype"])}
+    return {
+        "offsets": _map(entry_dir / f"{stem}.offsets", np.int64),
+        "data": _map(entry_dir / f"{stem}.data", np.uint8),
+        "na": _map(entry_dir / f"{stem}.na", np.bool_),
+    }
+
+
+def _map(path: Path, dtype) -> np.ndarray:
+    # Empty files cannot be memory-mapped
+    if path.stat().st_size == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _row_count(opened) -> int:
+    return opened[0][0]["rows"] if opened else 0
+
+
+def _slice(opened, start: int, stop: int) -> pd.DataFrame:
+    index = pd.RangeIndex(start, stop)
+    data = {}
+    for entry, arrays in opened:
+        if entry["text"]:
+            data[entry["name"]] = _decode(arrays, start, stop, entry, index)
+        else:
+            data[entry["name"]] = pd.Series(
+                np.array(arrays["values"][start:stop]), index=index
+            )
+    return pd.DataFrame(
+        data, index=index, columns=[entry["name"] for entry, _ in opened]
+    )
+
+
+def _decode(arrays, start: int, stop: int, entry: dict, index) -> pd.Series:
+    offsets = arrays["offsets"][start:stop]
+    first = int(arrays["offsets"][start - 1]) if start else 0
+    last = int(offsets[-1]) if len(offsets) else first
+    blob = arrays["data"][first:last].tobytes()
+    na = np.array(arrays["na"][start:stop])
+    values = np.full(len(offsets), None, dtype=object)
+    if entry.get("nul"):
+        starts = [first] + offsets[:-1].tolist()
+        values[~na] = [
+            blob[begin - first : end - first - 1].decode("utf-8")
+            for begin, end, missing in zip(starts, offsets.tolist(), na)
+            if not missing
+        ]
+    elif blob:
+        # One decode and split for the whole chunk
+        values[~na] = blob.decode("utf-8").split(_TERMINATOR)[:-1]
+    return pd.Series(values, index=index, dtype=entry["dtype"])
+
+
+def _dir_size(path: Path) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path))
@@ -0,0 +1,198 @@
+import gzip
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+try:
+    import zstandard
+except ImportError:  # optional, installed with the `zstd` extra
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+COMPRESSIONS = (GZIP, ZSTD)
+
+# Suffixes of stored objects, after .csv
+SUFFIXES = {GZIP: ".gz", ZSTD: ".zst"}
+_MAGIC = {GZIP: b"\x1f\x8b", ZSTD: b"\x28\xb5\x2f\xfd"}
+_MAGIC_LENGTH = max(len(magic) for magic in _MAGIC.values())
+# Most plain text produced at once, a small compressed chunk can inflate to gigabytes
+OUTPUT_CHUNK_SIZE = 1024 * 1024
+# Compressed bytes fed to zstd at once, its output cannot be bounded otherwise.
+# A zstd block of a few bytes can describe up to 128 KiB
+ZSTD_INPUT_SLICE = 128
+
+
+class UnsupportedCompression(ValueError):
+    pass
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def require_compression(compression: str):
+    """
+    Raises UnsupportedCompression unless this compression can be used here.
+    """
+    if compression not in COMPRESSIONS:
+        raise UnsupportedCompression(f"Unknown compression {compression}")
+    if compression == ZSTD and zstandard is None:
+        raise UnsupportedCompression("zstd needs the zstandard package (zstd extra)")
+
+
+def detect_compression(prefix: bytes) -> str | None:
+    """
+    Compression of a stream from its magic bytes, None for plain text.
+    """
+    for compression, magic in _MAGIC.items():
+        if prefix.startswith(magic):
+            return compression
+    return None
+
+
+def compression_of(path: Path) -> str | None:
+    """
+    Compression of a stored file from the suffix of what it links to.
+    """
+    suffix = Path(path).resolve().suffix
+    for compression, compressed_suffix in SUFFIXES.items():
+        if suffix == compressed_suffix:
+            return compression
+    return None
+
+
+def open_stored(path: Path) -> BinaryIO:
+    """
+    Opens a stored file for reading, decompressing on the fly.
+    Only the blocks actually read are decompressed.
+    """
+    compression = compression_of(path)
+    if compression == GZIP:
+        return gzip.open(path, "rb")
+    if compression == ZSTD:
+        require_compression(ZSTD)
+        return zstandard.open(path, "rb")
+    return open(path, "rb")
+
+
+class StreamDecompressor:
+    """
+    Inflates an upload chunk by chunk. The format is detected from the
+    magic bytes of the first chunk, plain text passes through unchanged.
+    Concatenated gzip members are decompressed one after the other.
+    Output comes in pieces of bounded size, so callers can check limits
+    before a highly compressed chunk is inflated all at once.
+    """
+
+    def __init__(self):
+        self.compression: str | None = None
+        self._prefix = b""
+        self._detected = False
+        self._inflater = None
+
+    def decompress(self, chunk: bytes) -> Iterator[bytes]:
+        """
+        Yields the plain text of chunk in pieces of about OUTPUT_CHUNK_SIZE.
+        """
+        if not self._detected:
+            self._prefix += chunk
+            if len(self._prefix) < _MAGIC_LENGTH:
+                return
+            chunk, self._prefix = self._prefix, b""
+            self._detect(chunk)
+        if self._inflater is None:
+            yield chunk
+        elif self.compression == GZIP:
+            yield from self._inflate_gzip(chunk)
+        else:
+            yield from self._inflate_zstd(chunk)
+
+    def flush(self) -> bytes:
+        """
+        Returns the rest of the output.
+        Raises ValueError when the compressed stream is truncated.
+        """
+        if not self._detected:
+            # Shorter than any magic number, so plain text
+            self._detected = True
+            return self._prefix
+        if self._inflater is None:
+            return b""
+        if self.compression == GZIP:
+            rest = self._inflater.flush()
+            if not self._inflater.eof:
+                raise ValueError("Truncated gzip stream")
+            return rest
+        if not getattr(self._inflater, "eof", True):
+            raise ValueError("Truncated zstd stream")
+        return b""
+
+    def _detect(self, prefix: bytes):
+        self._detected = True
+        self.compression = detect_compression(prefix)
+        if self.compression is not None:
+            require_compression(self.compression)
+            self._inflater = self._new_inflater()
+
+    def _new_inflater(self):
+        if self.compression == GZIP:
+            return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def _inflate_gzip(self, data: bytes) -> Iterator[bytes]:
+        while True:
+            piece = self._inflater.decompress(data, OUTPUT_CHUNK_SIZE)
+            if piece:
+                yield piece
+            data = self._inflater.unconsumed_tail
+            if self._inflater.eof and self._inflater.unused_data:
+                data = self._inflater.unused_data
+                self._inflater = self._new_inflater()
+            elif not data and len(piece) < OUTPUT_CHUNK_SIZE:
+                return
+
+    def _inflate_zstd(self, data: bytes) -> Iterator[bytes]:
+        view = memoryview(data)
+        for start in range(0, len(view), ZSTD_INPUT_SLICE):
+            piece = self._inflater.decompress(view[start : start + ZSTD_INPUT_SLICE])
+            if piece:
+                yield piece
+
+
+def decompress_prefix(data: bytes, max_bytes: int) -> bytes:
+    """
+    Plain text of the start of a possibly compressed stream, as far as the
+    given bytes allow and up to about max_bytes. Used to read headers from
+    a first chunk.
+    """
+    if len(data) < _MAGIC_LENGTH:
+        return data
+    output = []
+    size = 0
+    for piece in StreamDecompressor().decompress(data):
+        output.append(piece)
+        size += len(piece)
+        if size >= max_bytes:
+            break
+    return b"".join(output)[:max_bytes]
+
+
+class StreamCompressor:
+    """
+    Compresses stored uploads as they are written.
+    """
+
+    def __init__(self, compression: str):
+        require_compression(compression)
+        self.compression = compression
+        if compression == GZIP:
+            self._deflater = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        else:
+            self._deflater = zstandard.ZstdCompressor().compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._deflater.compress(data)
+
+    def flush(self) -> bytes:
+        return self._deflater.flush()
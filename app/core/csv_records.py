@@ -0,0 +1,196 @@
+import codecs
+import csv
+import re
+from typing import BinaryIO, List
+from pydantic import BaseModel
+
+# Delimiters considered when sniffing a header, the first one wins ties
+DELIMITERS = (",", ";", "\t", "|")
+# Upper bound on bytes read to find the header record
+HEADER_MAX_BYTES = 1024 * 1024
+HEADER_READ_SIZE = 64 * 1024
+# Block size for the quote-parity pass that finds record boundaries
+BOUNDARY_BLOCK_SIZE = 4 * 1024 * 1024
+
+_QUOTED = re.compile(r'"[^"]*"')
+
+
+class RecordSplitter:
+    """
+    Groups incrementally fed CSV text into complete records.
+    A newline only ends a record when the quotes seen so far are balanced,
+    so quoted fields spanning several lines (or several chunks) stay whole.
+    """
+
+    def __init__(self, quotechar: str = '"'):
+        self.quotechar = quotechar
+        self._partial = ""
+        self._record: List[str] = []
+        self._in_quotes = False
+
+    @property
+    def in_quotes(self) -> bool:
+        """
+        Whether the text fed so far ends inside a quoted field.
+        """
+        return self._in_quotes != bool(self._partial.count(self.quotechar) % 2)
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Returns every record completed by this text, one string per record
+        (embedded newlines included), ready to be handed to csv.reader.
+        """
+        pieces = (self._partial + text).split("\n")
+        self._partial = pieces.pop()
+
+        records = []
+        for piece in pieces:
+            self._record.append(piece + "\n")
+            if piece.count(self.quotechar) % 2:
+                self._in_quotes = not self._in_quotes
+            if not self._in_quotes:
+                records.append("".join(self._record))
+                self._record = []
+        return records
+
+    def flush(self) -> List[str]:
+        """
+        Returns whatever is left once the input is exhausted,
+        including a last record without a trailing newline.
+        """
+        rest = "".join(self._record) + self._partial
+        self._partial = ""
+        self._record = []
+        self._in_quotes = False
+        return [rest] if rest else []
+
+
+def dedupe_column_names(names: List[str]) -> List[str]:
+    """
+    Names columns the way pandas does: blanks become 'Unnamed: i'
+    and repeats get a '.n' suffix.
+    """
+    result = []
+    seen = {}
+    for i, name in enumerate(names):
+        name = name or f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+
+def detect_delimiter(record: str) -> str:
+    """
+    Picks the candidate delimiter occurring most often outside quoted fields.
+    Falls back to a comma.
+    """
+    unquoted = _QUOTED.sub("", record)
+    best, best_count = DELIMITERS[0], 0
+    for delimiter in DELIMITERS:
+        count = unquoted.count(delimiter)
+        if count > best_count:
+            best, best_count = delimiter, count
+    return best
+
+
+class CSVHeader(BaseModel):
+    columns: List[str]
+    delimiter: str = ","
+
+
+def read_header(
+    file_obj: BinaryIO, has_header: bool = True, max_bytes: int = HEADER_MAX_BYTES
+) -> CSVHeader:
+    """
+    Reads just enough of a binary stream to parse its first record,
+    without pandas. Handles a UTF-8 BOM, quoted (even multi-line) names
+    and sniffs the delimiter. Without a header, columns are named column_n.
+    Raises ValueError when no record is found within max_bytes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    splitter = RecordSplitter()
+    records: List[str] = []
+    read = 0
+    while not records:
+        chunk = file_obj.read(HEADER_READ_SIZE)
+        read += len(chunk)
+        if chunk:
+            found = splitter.feed(decoder.decode(chunk))
+        else:
+            found = splitter.feed(decoder.decode(b"", final=True)) + splitter.flush()
+        # Blank lines before the header are skipped, as pandas does
+        records = [record for record in found if record.strip("\r\n")]
+        if not chunk:
+            break
+        if not records and read >= max_bytes:
+            raise ValueError(f"No complete record within the first {max_bytes} bytes")
+
+    if not records:
+        raise ValueError("No columns found")
+    return _parse_header_record(records[0], has_header)
+
+
+def header_from_prefix(data: bytes, has_header: bool = True) -> CSVHeader | None:
+    """
+    Parses the first record of a file from its first bytes only, e.g. the
+    first chunk of an upload. None while that record is not complete yet.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    records = RecordSplitter().feed(decoder.decode(data))
+    record = next((record for record in records if record.strip("\r\n")), None)
+    if record is None:
+        return None
+    return _parse_header_record(record, has_header)
+
+
+def _parse_header_record(record: str, has_header: bool) -> CSVHeader:
+    delimiter = detect_delimiter(record)
+    fields = next(csv.reader([record], delimiter=delimiter))
+    if has_header:
+        columns = dedupe_column_names(fields)
+    else:
+        columns = [f"column_{i}" for i in range(len(fields))]
+    return CSVHeader(columns=columns, delimiter=delimiter)
+
+
+def find_record_boundaries(
+    file_obj: BinaryIO, offsets: List[int], quotechar: bytes = b'"'
+) -> List[int]:
+    """
+    For each byte offset (ascending), returns the offset just past the first
+    newline at or after it that ends a record, so splitting there never cuts
+    a quoted field. Quote parity is tracked from the start of the stream with
+    bytes.count, which keeps the pass close to raw read speed.
+    Offsets with no record end after them are dropped.
+    """
+    boundaries = []
+    pending = iter(sorted(offsets))
+    target = next(pending, None)
+    in_quotes = False
+    base = 0
+    file_obj.seek(0)
+    while target is not None and (block := file_obj.read(BOUNDARY_BLOCK_SIZE)):
+        pos = 0
+        while target is not None and target < base + len(block):
+            start = max(target - base, pos)
+            in_quotes ^= bool(block.count(quotechar, pos, start) % 2)
+            pos = start
+            found = False
+            while (newline := block.find(b"\n", pos)) >= 0:
+                in_quotes ^= bool(block.count(quotechar, pos, newline) % 2)
+                pos = newline + 1
+                if not in_quotes:
+                    found = True
+                    break
+            if not found:
+                break
+            if not boundaries or boundaries[-1] != base + pos:
+                boundaries.append(base + pos)
+            target = next(pending, None)
+        in_quotes ^= bool(block.count(quotechar, pos) % 2)
+        base += len(block)
+    return boundaries
@@ -1,59 +1,773 @@
+import csv
+import hashlib
+import multiprocessing
 import os
-import time
+import pickle
+import threading
+import uuid
 import pandas as pd
-import shutil
 import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO, StringIO
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
+from .column_profile import ColumnProfiler, FileProfile
+from .columnar_cache import ColumnarCache
+from .compression import (
+    COMPRESSIONS,
+    SUFFIXES,
+    StreamCompressor,
+    StreamDecompressor,
+    compression_of,
+    detect_compression,
+    open_stored,
+    require_compression,
+)
+from .csv_records import CSVHeader, find_record_boundaries, read_header
+from .metrics import BYTES_READ, BYTES_WRITTEN, ROWS_SCANNED, timed
 
 logger = logging.getLogger(__name__)
 
+# Bytes per read when streaming an upload to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Rows per chunk when scanning a stored file, bounds memory regardless of file size
+SCAN_CHUNK_SIZE = 50_000
+# read_csv options under which only empty fields are NA
+LITERAL_NA = {"keep_default_na": False, "na_values": [""]}
+
+
+# Upper bound on the bytes one parallel scan worker parses at a time
+SCAN_RANGE_BYTES = 16 * 1024 * 1024
+# Unique contents live here, named by their SHA-256
+OBJECTS_DIR = "objects"
+
+
+# Held while a new upload reuses or links an object and while retention
+# deletes one, so an object is never deleted between the two
+objects_lock = threading.Lock()
+
+
+def profile_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + ".profile.json")
+
+
+def sample_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + ".sample")
+
+
+def sidecar_paths(file_path: Path) -> List[Path]:
+    return [profile_path(file_path), sample_path(file_path)]
+
+
+def _sample_csv(profiler: ColumnProfiler) -> bytes | None:
+    """
+    The row sample of a profiled file as CSV text, None if it could not be parsed.
+    """
+    if profiler.columns is None:
+        return None
+    text = StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(profiler.columns)
+    writer.writerows(profiler.sample_rows)
+    return text.getvalue().encode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(f".tmp-{uuid.uuid4().hex}")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+_scan_pools: Dict[int, ProcessPoolExecutor] = {}
+_scan_pools_lock = threading.Lock()
+
+
+def _get_scan_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Worker processes are expensive to start, so pools live for the process.
+    They are spawned rather than forked as the server is multi-threaded.
+    """
+    with _scan_pools_lock:
+        if workers not in _scan_pools:
+            _scan_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _scan_pools[workers]
+
+
+def shutdown_scan_pools():
+    with _scan_pools_lock:
+        for pool in _scan_pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _scan_pools.clear()
+
+
+def _scan_range(
+    file_path: Path,
+    header_end: int,
+    start: int,
+    end: int,
+    columns: List[str],
+    delimiter: str,
+    scans: bytes | None = None,
+) -> Tuple[int, Dict[str, int], list]:
+    """
+    Runs in a worker process: parses one record-aligned byte range,
+    prefixed with the header, and counts rows and NAs per column.
+    The values are also fed to the pickled scans, returned with the counts.
+    """
+    with open(file_path, "rb") as file_obj:
+        header = file_obj.read(header_end)
+        file_obj.seek(start)
+        data = file_obj.read(end - start)
+    df = pd.read_csv(BytesIO(header + data), sep=delimiter, usecols=columns, dtype=str)
+    counts = {col: int(df[col].isna().sum()) for col in df.columns}
+    range_scans = pickle.loads(scans) if scans else []
+    for scan in range_scans:
+        scan.consume(df)
+    return len(df), counts, range_scans
+
+
+def _picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def _object_name(digest: str, compression: str | None = None) -> str:
+    return f"{digest}.csv{SUFFIXES[compression] if compression else ''}"
+
+
+def _store_object(
+    objects_path: Path,
+    tmp_path: Path,
+    digest: str,
+    profile: FileProfile | None,
+    compression: str | None = None,
+    sample: bytes | None = None,
+) -> Path:
+    """
+    Moves a completed body into objects/<digest>.csv (plus .gz or .zst when
+    stored compressed) with its profile and row sample sidecars. The digest is that of the
+    plain text, so content already in storage, compressed or not,
+    is not stored again.
+    """
+    for stored in (None, *COMPRESSIONS):
+        object_path = objects_path / _object_name(digest, stored)
+        if object_path.exists():
+            tmp_path.unlink()
+            # A fresh mtime tells retention the object is about to be linked
+            os.utime(object_path)
+            return object_path
+    object_path = objects_path / _object_name(digest, compression)
+    os.replace(tmp_path, object_path)
+    if profile is not None:
+        _write_atomic(profile_path(object_path), profile.model_dump_json().encode())
+    if sample is not None:
+        _write_atomic(sample_path(object_path), sample)
+    return object_path
+
+
+def _link_object(path: Path, object_path: Path):
+    os.symlink(os.path.join(OBJECTS_DIR, object_path.name), path)
+
+
+class UploadWriter:
+    """
+    Push-style writer for one upload: chunks are written as they arrive,
+    hashed and profiled on the way. Column names are known once the first
+    record has been written, so callers can start mapping while the rest streams.
+
+    Storage is content-addressed: the body lands in objects/<sha256>.csv,
+    stored once however many times it is uploaded, and the upload name
+    is a symlink to it.
+
+    gzip or zstd compressed uploads are detected from their first bytes and
+    decompressed as they stream in. With a storage compression, the body is
+    compressed again on its way to disk.
+    """
+
+    def __init__(
+        self,
+        objects_path: Path,
+        target_path: Path,
+        has_header: bool = True,
+        compression: str | None = None,
+        max_size: int | None = None,
+    ):
+        self.path = target_path
+        # Bounds the plain text of compressed uploads, which may inflate a lot
+        self.max_size = max_size
+        self.objects_path = objects_path
+        self.digest: str | None = None
+        # Plain text bytes received so far
+        self.size = 0
+        self._decompressor = StreamDecompressor()
+        self._compressor = StreamCompressor(compression) if compression else None
+        self._profiler = ColumnProfiler(has_header=has_header)
+        self._hash = hashlib.sha256()
+        self._tmp_path = objects_path / f".tmp-{uuid.uuid4().hex}"
+        self._file = self._tmp_path.open("wb")
+        # Without a header the generated one must be written first,
+        # so data is held back until the first record reveals the width
+        self._pending: List[bytes] | None = None if has_header else []
+
+    @property
+    def columns(self) -> List[str] | None:
+        return self._profiler.columns
+
+    @property
+    def upload_compression(self) -> str | None:
+        """
+        Compression the upload arrived with, once its first bytes are in.
+        """
+        return self._decompressor.compression
+
+    @timed("upload.write_chunk")
+    def write(self, chunk: bytes):
+        # Piece by piece, so max_size is enforced before a chunk inflates fully
+        for piece in self._decompressor.decompress(chunk):
+            self._feed(piece)
+
+    def _feed(self, chunk: bytes):
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes uncompressed")
+        self._profiler.feed(chunk)
+        if self._pending is None:
+            self._write(chunk)
+            return
+
+        self._pending.append(chunk)
+        if self.columns is not None:
+            self._flush_pending()
+
+    @timed("upload.finalize")
+    def close(self) -> Path:
+        """
+        Completes the file and its profile sidecar, returns the stored path.
+        Content already in storage is not stored again.
+        """
+        try:
+            self._feed(self._decompressor.flush())
+            profile = self._profiler.finish()
+            if self._pending is not None:
+                if self.columns is None:
+                    raise ValueError("No columns found in upload")
+                self._flush_pending()
+            if self._compressor is not None:
+                self._file.write(self._compressor.flush())
+            self._file.close()
+
+            self.digest = self._hash.hexdigest()
+            with objects_lock:
+                object_path = _store_object(
+                    self.objects_path,
+                    self._tmp_path,
+                    self.digest,
+                    profile,
+                    self._compressor.compression if self._compressor else None,
+                    _sample_csv(self._profiler) if profile is not None else None,
+                )
+                _link_object(self.path, object_path)
+        except Exception:
+            self.abort()
+            raise
+        return self.path
+
+    def abort(self):
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _write(self, data: bytes):
+        self._hash.update(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._file.write(data)
+        BYTES_WRITTEN.inc("upload", len(data))
+
+    def _flush_pending(self):
+        delimiter = self._profiler.delimiter or ","
+        self._write((delimiter.join(self.columns) + "\n").encode("utf-8"))
+        for chunk in self._pending:
+            self._write(chunk)
+        self._pending = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
 
 class CSVService:
-    def __init__(self, storage_path: str):
+    def __init__(
+        self,
+        storage_path: str,
+        cache_max_bytes: int = 0,
+        scan_workers: int = 1,
+        compression: str | None = None,
+    ):
+        """
+        cache_max_bytes > 0 enables the columnar cache of parsed uploads.
+        scan_workers > 1 lets parallel scans use that many worker processes.
+        compression ("gzip" or "zstd") keeps new uploads compressed on disk,
+        every read then goes through a streaming decompressor.
+        """
+        if compression:
+            require_compression(compression)
+        self.scan_workers = scan_workers
+        self.compression = compression
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True, parents=True)
+        self.objects_path = self.storage_path / OBJECTS_DIR
+        self.objects_path.mkdir(exist_ok=True)
+        self.cache = (
+            ColumnarCache(self.storage_path / ".columnar_cache", cache_max_bytes)
+            if cache_max_bytes > 0
+            else None
+        )
 
-    def save_upload(self, file_name: str, file_obj, has_header: bool = True) -> Path:
+    def save_upload(
+        self,
+        file_name: str,
+        file_obj,
+        has_header: bool = True,
+        max_size: int | None = None,
+    ) -> Path:
         """
         Streams the file object to disk to handle up to 100MB safely.
+        A column profile is computed during the same pass and stored as a sidecar.
+        """
+        with self.open_upload(file_name, has_header, max_size) as writer:
+            while chunk := file_obj.read(UPLOAD_CHUNK_SIZE):
+                writer.write(chunk)
+            return writer.close()
+
+    def open_upload(
+        self, file_name: str, has_header: bool = True, max_size: int | None = None
+    ) -> UploadWriter:
+        """
+        Starts an upload that the caller feeds chunk by chunk,
+        for bodies that arrive incrementally rather than as a file object.
+        max_size bounds the uncompressed bytes, see UploadTooLarge.
         """
         target_path = self.storage_path / self._generate_file_name(file_name)
-        with target_path.open("wb") as buffer:
-            if not has_header:
-                df_peek = pd.read_csv(file_obj, nrows=0)
-                col_count = len(df_peek.columns)
-                header_str = ",".join([f"column_{i}" for i in range(col_count)]) + "\n"
-                buffer.write(header_str.encode("utf-8"))
-                file_obj.seek(0)
-            shutil.copyfileobj(file_obj, buffer)
+        return UploadWriter(
+            self.objects_path,
+            target_path,
+            has_header=has_header,
+            compression=self.compression,
+            max_size=max_size,
+        )
+
+    @timed("upload.finalize")
+    def store_file(
+        self,
+        file_name: str,
+        source_path: Path,
+        has_header: bool = True,
+        max_size: int | None = None,
+    ) -> Path:
+        """
+        Stores a body already assembled on disk, e.g. from upload chunks.
+        It is read once to hash and profile it, then moved into storage
+        rather than copied. When it was uploaded compressed, is to be stored
+        compressed or has no header row (the generated one is written first),
+        it goes through a regular upload instead.
+        source_path must be on the storage filesystem and is consumed.
+        """
+        with open(source_path, "rb") as file_obj:
+            upload_compression = detect_compression(file_obj.read(4))
+        if not has_header or upload_compression or self.compression:
+            with open(source_path, "rb") as file_obj:
+                saved_path = self.save_upload(file_name, file_obj, has_header, max_size)
+            source_path.unlink()
+            return saved_path
+
+        profiler = ColumnProfiler(has_header=has_header)
+        digest = hashlib.sha256()
+        with open(source_path, "rb") as file_obj:
+            while chunk := file_obj.read(UPLOAD_CHUNK_SIZE):
+                profiler.feed(chunk)
+                digest.update(chunk)
+                BYTES_READ.inc("upload", len(chunk))
+        target_path = self.storage_path / self._generate_file_name(file_name)
+        profile = profiler.finish()
+        sample = _sample_csv(profiler) if profile is not None else None
+        with objects_lock:
+            object_path = _store_object(
+                self.objects_path,
+                source_path,
+                digest.hexdigest(),
+                profile,
+                sample=sample,
+            )
+            _link_object(target_path, object_path)
         return target_path
 
     @staticmethod
     def _generate_file_name(file_name: str) -> str:
         """
-        Append current timestamp for name uniqueness (naive approach)
+        Prefix a random token for name uniqueness, even for uploads in the same second
+        """
+        return uuid.uuid4().hex + "_" + os.path.basename(file_name)
+
+    def content_key(self, filename: str) -> str:
+        """
+        Identifies what a stored upload contains: the content hash for
+        content-addressed uploads, so caches are shared by identical files,
+        or the file name itself for files placed in storage directly.
+        """
+        file_path = self.storage_path / filename
+        if file_path.is_symlink():
+            return Path(os.readlink(file_path)).name.split(".")[0]
+        return filename
+
+    def touch(self, filename: str):
+        """
+        Records an access to a stored upload, retention evicts the least
+        recently accessed uploads first. The link is touched, not the object
+        it points to, as identical uploads share the object.
+        """
+        if os.path.basename(filename) != filename:
+            return
+        try:
+            os.utime(self.storage_path / filename, follow_symlinks=False)
+        except FileNotFoundError:
+            pass
+
+    def get_profile(self, filename: str) -> FileProfile | None:
+        """
+        Returns the column profile computed at upload time, if any.
         """
-        timestamp = str(int(time.time()))
-        return timestamp + "_" + file_name
+        sidecar = profile_path((self.storage_path / filename).resolve())
+        if not sidecar.exists():
+            return None
+        return FileProfile.model_validate_json(sidecar.read_text())
+
+    @timed("csv.sample")
+    def get_sample(self, filename: str) -> pd.DataFrame:
+        """
+        Uniform sample of the data rows of a stored upload, as raw strings
+        (NAs as NaN) like iter_chunks. It is drawn while the upload is saved.
+        Files stored before that, or placed in storage directly, are sampled
+        now with one pass, and the sample is kept for stored objects.
+        Raises ValueError when the file cannot be parsed as CSV.
+        """
+        file_path = (self.storage_path / filename).resolve()
+        sidecar = sample_path(file_path)
+        if sidecar.exists():
+            return pd.read_csv(sidecar, dtype=str)
+
+        profiler = ColumnProfiler()
+        with open_stored(file_path) as file_obj:
+            while chunk := file_obj.read(UPLOAD_CHUNK_SIZE):
+                profiler.feed(chunk)
+                BYTES_READ.inc("sample", len(chunk))
+        sample = _sample_csv(profiler) if profiler.finish() is not None else None
+        if sample is None:
+            raise ValueError(f"Could not sample {filename}")
+        if file_path.parent == self.objects_path.resolve():
+            _write_atomic(sidecar, sample)
+        return pd.read_csv(BytesIO(sample), dtype=str)
+
+    @staticmethod
+    @timed("csv.header")
+    def get_header(file_path: Path, has_header: bool = True) -> CSVHeader:
+        """
+        Parses the first record only, with a bounded read and no pandas.
+        """
+        with open_stored(file_path) as file_obj:
+            header = read_header(file_obj, has_header=has_header)
+            BYTES_READ.inc("header", file_obj.tell())
+            return header
 
     def get_columns(self, file_path: Path, has_header: bool = True) -> List[str]:
         """
         Extracts columns. If no header, generates generic column_n names.
-        Uses nrows=0 for speed and memory efficiency.
         """
         try:
-            if has_header:
-                # nrows=0 reads only the header row
-                df = pd.read_csv(file_path, nrows=0)
-                return df.columns.tolist()
-            else:
-                # Read 1 row to count columns, then generate names
-                df = pd.read_csv(file_path, nrows=1, header=None)
-                return [f"column_{i}" for i in range(len(df.columns))]
+            return self.get_header(file_path, has_header=has_header).columns
         except Exception as e:
             logger.error(f"Failed to parse columns: {e}")
             return []
 
-    def get_file_df(self, filename: str) -> pd.DataFrame:
-        return pd.read_csv(self.storage_path / filename)
+    def _read_csv(self, file_path: Path, **kwargs):
+        """
+        pandas.read_csv with the delimiter sniffed from the file's header,
+        decompressing stored compressed uploads as it goes.
+        """
+        try:
+            delimiter = self.get_header(file_path).delimiter
+        except ValueError:
+            delimiter = ","
+        return pd.read_csv(
+            file_path, sep=delimiter, compression=compression_of(file_path), **kwargs
+        )
+
+    @timed("csv.read_file")
+    def get_file_df(
+        self, filename: str, columns: Iterable[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Reads a stored upload, optionally restricted to some columns.
+        """
+        wanted = set(columns) if columns is not None else None
+        usecols = (lambda col: col in wanted) if wanted is not None else None
+        return self._parse_file(filename, usecols=usecols)
+
+    def _parse_file(self, filename: str, **kwargs) -> pd.DataFrame:
+        file_path = self.storage_path / filename
+        df = self._read_csv(file_path, **kwargs)
+        BYTES_READ.inc("read_file", file_path.stat().st_size)
+        ROWS_SCANNED.inc("read_file", len(df))
+        return df
+
+    def iter_chunks(
+        self,
+        filename: str,
+        columns: Iterable[str],
+        chunk_size: int = SCAN_CHUNK_SIZE,
+        na_tokens: bool = True,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yields the requested columns chunk by chunk as raw strings (NAs as NaN),
+        indexed by data row number. Columns missing from the file are ignored.
+        With na_tokens=False only empty fields are NA, and values like "NA" or
+        "null" that pandas reads as NA by default are kept as text.
+        With the columnar cache enabled, a file is parsed once per column:
+        a complete scan writes the columns it read to the cache chunk by
+        chunk, later scans of cached columns are served from memory-mapped
+        files. Either way only one chunk is held in memory.
+        """
+        file_path = self.storage_path / filename
+        wanted = set(columns)
+        file_columns = self.get_columns(file_path)
+        present = [col for col in file_columns if col in wanted]
+        if not present:
+            return
+
+        writer = None
+        if self.cache is not None:
+            key = self.content_key(filename)
+            cached = self.cache.iter_chunks(key, present, chunk_size, na_tokens)
+            if cached is not None:
+                for chunk in cached:
+                    ROWS_SCANNED.inc("cache", len(chunk))
+                    yield chunk
+                return
+            writer = self.cache.writer(
+                key, {col: file_columns.index(col) for col in present}, na_tokens
+            )
+
+        try:
+            with self._read_csv(
+                file_path,
+                usecols=present,
+                dtype=str,
+                chunksize=chunk_size,
+                **({} if na_tokens else LITERAL_NA),
+            ) as reader:
+                for chunk in reader:
+                    ROWS_SCANNED.inc("chunks", len(chunk))
+                    if writer is not None and not writer.append(chunk):
+                        writer = None
+                    yield chunk
+            # Only reached when the consumer read every chunk
+            if writer is not None:
+                writer.commit()
+                writer = None
+        finally:
+            if writer is not None:
+                writer.abort()
+
+    @timed("csv.scan_na")
+    def scan_na_columns(
+        self,
+        filename: str,
+        columns: Iterable[str],
+        chunk_size: int = SCAN_CHUNK_SIZE,
+        parallel: bool = False,
+    ) -> Set[str]:
+        """
+        Returns the subset of columns containing at least one NA.
+        Only the requested columns are parsed, the file is read in chunks
+        and the scan stops as soon as every column has shown a NA.
+        Columns missing from the file are ignored.
+        Served from the columnar cache instead when it already holds the columns.
+        With parallel=True and scan_workers > 1, byte ranges of the file
+        are scanned by worker processes.
+        """
+        file_path = self.storage_path / filename
+        pending = set(columns) & set(self.get_columns(file_path))
+        columns_with_na = set()
+        if not pending:
+            return columns_with_na
+
+        if self.cache is not None:
+            cached = self.cache.na_columns(self.content_key(filename), pending)
+            if cached is not None:
+                return cached
+
+        # Byte ranges of a compressed file cannot be parsed independently
+        if parallel and self.scan_workers > 1 and not compression_of(file_path):
+            return self._parallel_scan_na_columns(file_path, pending)
+
+        with self._read_csv(
+            file_path, usecols=list(pending), chunksize=chunk_size
+        ) as reader:
+            for chunk in reader:
+                ROWS_SCANNED.inc("na_scan", len(chunk))
+                columns_with_na |= {
+                    col
+                    for col in chunk.columns
+                    if col not in columns_with_na and chunk[col].isna().any()
+                }
+                if columns_with_na == pending:
+                    break
+
+        return columns_with_na
+
+    def can_scan_ranges(
+        self, filename: str, columns: Iterable[str], scans: list
+    ) -> bool:
+        """
+        Whether scan_ranges can serve these columns and scans: worker
+        processes are enabled, the file is stored uncompressed, the columnar
+        cache does not already hold the columns and the scans pickle.
+        """
+        if self.scan_workers <= 1 or compression_of(self.storage_path / filename):
+            return False
+        if self.cache is not None and self.cache.has(
+            self.content_key(filename), columns
+        ):
+            return False
+        return _picklable(scans)
+
+    @timed("csv.scan_ranges")
+    def scan_ranges(
+        self,
+        filename: str,
+        na_columns: Iterable[str],
+        scans: list,
+        progress: Callable[[int], None] | None = None,
+    ) -> Set[str]:
+        """
+        Scans record-aligned byte ranges of the file in worker processes.
+        Every range gets a copy of the scans, fed its values, and the copies
+        are merged back into scans in file order. Returns the na_columns
+        holding at least one NA. progress is called with the row count of
+        every range. Columns missing from the file are ignored.
+        """
+        file_path = self.storage_path / filename
+        na_columns = set(na_columns)
+        wanted = na_columns.union(*(scan.columns for scan in scans))
+        columns = [col for col in self.get_columns(file_path) if col in wanted]
+        if not columns:
+            return set()
+
+        size = file_path.stat().st_size
+        parts = max(self.scan_workers, -(-size // SCAN_RANGE_BYTES))
+        header_end, ranges = self.split_ranges(file_path, parts)
+        delimiter = self.get_header(file_path).delimiter
+        # Pickled once up front, scans change as ranges are merged
+        payload = pickle.dumps(scans)
+
+        pool = _get_scan_pool(self.scan_workers)
+        futures = [
+            pool.submit(
+                _scan_range,
+                file_path,
+                header_end,
+                start,
+                end,
+                columns,
+                delimiter,
+                payload,
+            )
+            for start, end in ranges
+        ]
+        BYTES_READ.inc("range_scan", sum(end - start for start, end in ranges))
+        columns_with_na = set()
+        row_offset = 0
+        try:
+            # In file order, so row numbers can be offset
+            for future in futures:
+                rows, counts, range_scans = future.result()
+                ROWS_SCANNED.inc("range_scan", rows)
+                columns_with_na |= {col for col in na_columns if counts.get(col)}
+                for scan, range_scan in zip(scans, range_scans):
+                    scan.merge(range_scan, row_offset)
+                row_offset += rows
+                if progress is not None:
+                    progress(rows)
+        finally:
+            for future in futures:
+                future.cancel()
+        return columns_with_na
+
+    def split_ranges(
+        self, file_path: Path, parts: int
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Splits the data records of a file into about `parts` byte ranges
+        aligned to record boundaries (quoted newlines respected).
+        Returns the end offset of the header record and the ranges.
+        """
+        size = file_path.stat().st_size
+        with open(file_path, "rb") as file_obj:
+            header_end = find_record_boundaries(file_obj, [0])
+            if not header_end or header_end[0] >= size:
+                return size, []
+            header_end = header_end[0]
+            step = (size - header_end) / parts
+            targets = [int(header_end + step * i) for i in range(1, parts)]
+            boundaries = find_record_boundaries(file_obj, targets)
+
+        starts = [header_end] + [b for b in boundaries if header_end < b < size]
+        ends = starts[1:] + [size]
+        return header_end, list(zip(starts, ends))
+
+    def _parallel_scan_na_columns(self, file_path: Path, columns: Set[str]) -> Set[str]:
+        size = file_path.stat().st_size
+        parts = max(self.scan_workers, -(-size // SCAN_RANGE_BYTES))
+        header_end, ranges = self.split_ranges(file_path, parts)
+        delimiter = self.get_header(file_path).delimiter
+
+        pool = _get_scan_pool(self.scan_workers)
+        futures = {
+            pool.submit(
+                _scan_range,
+                file_path,
+                header_end,
+                start,
+                end,
+                sorted(columns),
+                delimiter,
+            )
+            for start, end in ranges
+        }
+        BYTES_READ.inc("na_scan", sum(end - start for start, end in ranges))
+        columns_with_na = set()
+        try:
+            while futures and columns_with_na != columns:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rows, counts, _ = future.result()
+                    ROWS_SCANNED.inc("na_scan", rows)
+                    columns_with_na |= {col for col, count in counts.items() if count}
+        finally:
+            # Every column already has a NA, the remaining ranges can't change that
+            for future in futures:
+                future.cancel()
+        return columns_with_na
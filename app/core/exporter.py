@@ -0,0 +1,136 @@
+import logging
+from typing import Dict, Iterator, List
+import pandas as pd
+from .csv_service import CSVService, SCAN_CHUNK_SIZE
+from .metrics import timed
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _DrainableSink:
+    """
+    File-like target for ParquetWriter whose written bytes are taken out
+    after every row group, so the whole file is never held in memory.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+class MappedExporter:
+    """
+    Applies a mapping to a stored upload: source columns are projected and
+    renamed to their target fields, chunk by chunk, so memory stays bounded
+    by the chunk size whatever the file size.
+    """
+
+    def __init__(
+        self,
+        csv_service: CSVService,
+        filename: str,
+        mapping: Dict[str, str | None],
+        chunk_size: int = SCAN_CHUNK_SIZE,
+    ):
+        self.csv_service = csv_service
+        self.filename = filename
+        # Targets in mapping order, unmapped ones are left out
+        self.mapping = {target: source for target, source in mapping.items() if source}
+        self.chunk_size = chunk_size
+
+    def missing_columns(self) -> List[str]:
+        """
+        Mapped source columns the file does not have.
+        """
+        columns = set(
+            self.csv_service.get_columns(self.csv_service.storage_path / self.filename)
+        )
+        return sorted(
+            {source for source in self.mapping.values() if source not in columns}
+        )
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """
+        Mapped chunks with target field names, values kept as raw strings.
+        Only empty fields become NA, an export never changes values.
+        """
+        for chunk in self.csv_service.iter_chunks(
+            self.filename, set(self.mapping.values()), self.chunk_size, na_tokens=False
+        ):
+            yield pd.DataFrame(
+                {target: chunk[source] for target, source in self.mapping.items()}
+            )
+
+    def iter_csv(self) -> Iterator[bytes]:
+        yield (",".join(_csv_quote(name) for name in self.mapping) + "\n").encode(
+            "utf-8"
+        )
+        for frame in self.iter_frames():
+            yield frame.to_csv(index=False, header=False).encode("utf-8")
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        for frame in self.iter_frames():
+            if len(frame):
+                yield frame.to_json(orient="records", lines=True).encode("utf-8")
+
+    def iter_parquet(self) -> Iterator[bytes]:
+        """
+        One row group per chunk. Every column is a nullable string.
+        """
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow")
+        schema = pa.schema([(target, pa.string()) for target in self.mapping])
+        sink = _DrainableSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for frame in self.iter_frames():
+                writer.write_table(
+                    pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+                )
+                yield sink.drain()
+        yield sink.drain()
+
+    def iter_format(self, export_format: str) -> Iterator[bytes]:
+        iterators = {
+            "csv": self.iter_csv,
+            "ndjson": self.iter_ndjson,
+            "parquet": self.iter_parquet,
+        }
+        with timed(f"export.{export_format}"):
+            yield from iterators[export_format]()
+
+
+def _csv_quote(value: str) -> str:
+    if any(char in value for char in ',"\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def parquet_available() -> bool:
+    return pa is not None
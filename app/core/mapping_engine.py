@@ -2,6 +2,8 @@ import logging
 from pydantic import BaseModel
 from typing import Dict, List, Type
 from .mapping_strategies.base import BaseMappingStrategy
+from .metrics import timed
+from .schemas.registry import compile_schema
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,6 +13,8 @@ class MappingEngine:
 
     def __init__(self, schema: Type[BaseModel]):
         self.schema = schema
+        self.compiled = compile_schema(schema)
+        self.fields = self.compiled.fields
 
     def run(
         self,
@@ -22,10 +26,11 @@ class MappingEngine:
         Mapping contains mapped result after apply previously saved mapping
         and selected mapping strategy
         """
-        result = {target: None for target in self.schema.model_fields}
+        result = {target: None for target in self.fields}
 
         if mapping_strategy:
-            result = mapping_strategy.map(result, source_columns)
+            with timed(f"mapping.{type(mapping_strategy).__name__}"):
+                result = mapping_strategy.map(result, source_columns)
 
         if saved_mapping:
             updates = {
@@ -36,3 +41,34 @@ class MappingEngine:
             result.update(updates)
 
         return result
+
+    def run_batch(
+        self,
+        headers: List[List[str]],
+        saved_mapping: Dict[str, str | None] | None = None,
+        mapping_strategy: BaseMappingStrategy | None = None,
+    ) -> List[Dict[str, str | None]]:
+        """
+        Same result as run for every header, in order. Identical headers
+        are mapped once and the strategy gets all distinct headers together.
+        """
+        unique = list(dict.fromkeys(tuple(header) for header in headers))
+        results = [{target: None for target in self.fields} for _ in unique]
+
+        if mapping_strategy:
+            with timed(f"mapping.{type(mapping_strategy).__name__}.batch"):
+                results = mapping_strategy.map_batch(
+                    results, [list(header) for header in unique]
+                )
+
+        if saved_mapping:
+            updates = {
+                target: source
+                for target, source in saved_mapping.items()
+                if target in self.fields
+            }
+            for result in results:
+                result.update(updates)
+
+        by_header = dict(zip(unique, results))
+        return [dict(by_header[tuple(header)]) for header in headers]
@@ -0,0 +1,156 @@
+import threading
+from typing import Dict, Iterable, List
+import numpy as np
+from pydantic import BaseModel
+from .mapping_strategies.ngram_scorer import normalize_name
+
+# Columns used by more than this share of mappings are not used to find
+# candidates, only to score them, unless mappings sharing only those columns
+# could still make the top of the ranking
+COMMON_COLUMN_SHARE = 0.05
+
+
+class MappingCandidate(BaseModel):
+    name: str
+    # Dice coefficient between the header and the mapping's source columns
+    score: float
+    matched_columns: int
+
+
+class MappingIndex:
+    """
+    Inverted index from normalised source column names to the saved mappings
+    using them. Ranking a header only touches the postings of its own columns,
+    never all mappings, and usually only the rarer ones are enumerated.
+    """
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        # numpy views of the above, rebuilt lazily after additions
+        self._posting_arrays: Dict[str, np.ndarray] = {}
+        self._memberships: Dict[str, np.ndarray] = {}
+        self._sizes_array: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, mapping: Dict[str, str | None]):
+        sources = {normalize_name(source) for source in mapping.values() if source}
+        sources.discard("")
+        with self._lock:
+            if name in self._ids:
+                return
+            mapping_id = len(self._names)
+            self._ids[name] = mapping_id
+            self._names.append(name)
+            self._sizes.append(len(sources))
+            self._sizes_array = None
+            # Membership vectors are sized by the number of mappings
+            self._memberships.clear()
+            for source in sources:
+                self._postings.setdefault(source, []).append(mapping_id)
+                self._posting_arrays.pop(source, None)
+
+    def add_all(self, mappings: Iterable[tuple]):
+        for name, mapping in mappings:
+            self.add(name, mapping)
+
+    def rank(self, source_columns: List[str], limit: int = 3) -> List[MappingCandidate]:
+        """
+        Best saved mappings for a header, by overlap of their source columns.
+        Mappings sharing no column are never returned.
+        """
+        header = {normalize_name(col) for col in source_columns}
+        header.discard("")
+        if limit <= 0:
+            return []
+        with self._lock:
+            columns = [col for col in header if col in self._postings]
+            if not columns:
+                return []
+            total = len(self._names)
+            common = [
+                col
+                for col in columns
+                if len(self._postings[col]) > COMMON_COLUMN_SHARE * total
+            ]
+            rare = [self._posting_array(col) for col in columns if col not in common]
+            candidates = None
+            if rare:
+                # Candidates come from the rare columns, columns used by
+                # most mappings just add to their counts
+                candidates, counts = np.unique(np.concatenate(rare), return_counts=True)
+                for col in common:
+                    counts += self._membership(col)[candidates]
+                scores = self._scores(len(header), candidates, counts)
+                # Best score of a mapping sharing only common columns, it has
+                # at least as many source columns as it shares
+                bound = round(2 * len(common) / (len(header) + len(common)), 4)
+                kth_best = (
+                    np.partition(scores, -limit)[-limit] if len(scores) >= limit else 0
+                )
+                if common and kth_best <= bound:
+                    candidates = None
+            if candidates is None:
+                # Those mappings could rank, so every posting is counted
+                counts = np.bincount(
+                    np.concatenate([self._posting_array(col) for col in columns]),
+                    minlength=total,
+                )
+                candidates = np.flatnonzero(counts)
+                counts = counts[candidates]
+                scores = self._scores(len(header), candidates, counts)
+            names = self._names
+
+        if len(candidates) > limit:
+            # Ties with the last place are kept, names decide between them
+            top = np.flatnonzero(scores >= np.partition(scores, -limit)[-limit])
+            candidates, counts, scores = candidates[top], counts[top], scores[top]
+        order = sorted(
+            range(len(candidates)),
+            key=lambda i: (-scores[i], names[candidates[i]]),
+        )[:limit]
+        return [
+            MappingCandidate(
+                name=names[candidates[i]],
+                score=float(scores[i]),
+                matched_columns=int(counts[i]),
+            )
+            for i in order
+        ]
+
+    def _scores(
+        self, header_size: int, candidates: np.ndarray, counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        Dice coefficients, rounded as reported so ties compare equal.
+        """
+        sizes = self._size_array()[candidates]
+        return np.round(2 * counts / (header_size + sizes), 4)
+
+    def _posting_array(self, source: str) -> np.ndarray:
+        array = self._posting_arrays.get(source)
+        if array is None:
+            array = np.array(self._postings[source], dtype=np.int64)
+            self._posting_arrays[source] = array
+        return array
+
+    def _membership(self, source: str) -> np.ndarray:
+        """
+        Boolean vector over all mappings, for columns too common to enumerate.
+        """
+        membership = self._memberships.get(source)
+        if membership is None:
+            membership = np.zeros(len(self._names), dtype=np.int64)
+            membership[self._posting_array(source)] = 1
+            self._memberships[source] = membership
+        return membership
+
+    def _size_array(self) -> np.ndarray:
+        if self._sizes_array is None:
+            self._sizes_array = np.array(self._sizes, dtype=np.float64)
+        return self._sizes_array
@@ -8,3 +8,15 @@ class BaseMappingStrategy(ABC):
     def map(
         self, mapping: Dict[str, str | None], source_columns: List[str]
     ) -> Dict[str, str | None]: ...
+
+    def map_batch(
+        self, mappings: List[Dict[str, str | None]], headers: List[List[str]]
+    ) -> List[Dict[str, str | None]]:
+        """
+        Maps many headers at once. Strategies with shared per-call work
+        override this to do it once for the whole batch.
+        """
+        return [
+            self.map(mapping, source_columns)
+            for mapping, source_columns in zip(mappings, headers)
+        ]
@@ -1,23 +1,65 @@
-from difflib import get_close_matches
+from functools import lru_cache
 from .base import BaseMappingStrategy
-from typing import Dict, List
+from .ngram_scorer import NgramScorer
+from ..schemas.registry import CompiledSchema
+from typing import Dict, List, Tuple
+
+CUTOFF = 0.5
+
+
+@lru_cache(maxsize=64)
+def get_scorer(targets: Tuple[str, ...]) -> NgramScorer:
+    """
+    Scorers are keyed by their targets so the target-side vectors
+    of a schema are built once and shared across requests.
+    """
+    return NgramScorer(list(targets))
 
 
 class FuzzyMatchMappingStrategy(BaseMappingStrategy):
+    """
+    Given the compiled target schema, mappings with no field mapped yet are
+    scored with its precompiled scorer.
+    """
+
+    def __init__(self, compiled: CompiledSchema | None = None):
+        self.compiled = compiled
 
     def map(
         self, mapping: Dict[str, str | None], source_columns: List[str]
     ) -> Dict[str, str | None]:
-        for target, mapped_source in mapping.items():
-            if mapped_source is None:
-                mapping[target] = self.match(target, source_columns)
+        unmapped = tuple(target for target, source in mapping.items() if source is None)
+        if unmapped:
+            mapping.update(self._scorer(unmapped).best_matches(source_columns, CUTOFF))
         return mapping
 
-    @staticmethod
-    def match(target: str, source_columns: List[str]) -> str | None:
-        matches = get_close_matches(target, source_columns, n=1, cutoff=0.5)
+    def map_batch(
+        self, mappings: List[Dict[str, str | None]], headers: List[List[str]]
+    ) -> List[Dict[str, str | None]]:
+        """
+        Headers needing the same targets are scored together in one pass.
+        """
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, mapping in enumerate(mappings):
+            unmapped = tuple(
+                target for target, source in mapping.items() if source is None
+            )
+            if unmapped:
+                groups.setdefault(unmapped, []).append(i)
+
+        for unmapped, indices in groups.items():
+            matches = self._scorer(unmapped).best_matches_batch(
+                [headers[i] for i in indices], CUTOFF
+            )
+            for i, match in zip(indices, matches):
+                mappings[i].update(match)
+        return mappings
 
-        if matches:
-            return matches[0]
+    def _scorer(self, targets: Tuple[str, ...]) -> NgramScorer:
+        if self.compiled is not None and list(targets) == self.compiled.fields:
+            return self.compiled.scorer
+        return get_scorer(targets)
 
-        return None
+    @staticmethod
+    def match(target: str, source_columns: List[str]) -> str | None:
+        return get_scorer((target,)).best_matches(source_columns, CUTOFF)[target]
@@ -0,0 +1,120 @@
+import re
+import numpy as np
+from typing import Dict, List
+
+# Any letter or digit in any script is kept, headers are not only Latin
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Casefolds and drops separators so 'User_Name' and 'username' compare equal.
+    """
+    return _NON_ALNUM.sub("", name.casefold())
+
+
+def name_ngrams(name: str, n: int = 2) -> set[str]:
+    """
+    Character n-grams of the normalised name, padded so short names
+    and word boundaries still contribute.
+    """
+    normalized = normalize_name(name)
+    if not normalized:
+        return set()
+    padded = f" {normalized} "
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class NgramScorer:
+    """
+    Scores every target against every source column in one batched pass.
+    Names become binary character n-gram vectors and the pairwise
+    Dice coefficients come out of a single matrix product.
+    """
+
+    def __init__(self, targets: List[str], n: int = 2):
+        self.targets = list(targets)
+        self.n = n
+        # Target side is computed once and reused for every scored header
+        target_grams = [name_ngrams(target, n) for target in self.targets]
+        self._vocabulary: Dict[str, int] = {}
+        for grams in target_grams:
+            for gram in grams:
+                self._vocabulary.setdefault(gram, len(self._vocabulary))
+        self._target_matrix = self._vectorize(target_grams, self._vocabulary)
+        self._target_sizes = np.array(
+            [len(grams) for grams in target_grams], dtype=np.float32
+        )
+
+    def score(self, source_columns: List[str]) -> np.ndarray:
+        """
+        Returns a (targets x source_columns) matrix of similarities in [0, 1].
+        """
+        source_grams = [name_ngrams(col, self.n) for col in source_columns]
+        # Grams unknown to the targets can only add to the source size
+        source_matrix = self._vectorize(source_grams, self._vocabulary)
+        source_sizes = np.array(
+            [len(grams) for grams in source_grams], dtype=np.float32
+        )
+
+        overlap = self._target_matrix @ source_matrix.T
+        sizes = self._target_sizes[:, None] + source_sizes[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(sizes > 0, 2 * overlap / sizes, 0.0)
+        return scores
+
+    def best_matches(
+        self, source_columns: List[str], cutoff: float = 0.5
+    ) -> Dict[str, str | None]:
+        """
+        Best scoring source column per target, None when nothing reaches cutoff.
+        """
+        if not self.targets or not source_columns:
+            return {target: None for target in self.targets}
+
+        scores = self.score(source_columns)
+        best = scores.argmax(axis=1)
+        return {
+            target: (source_columns[best[i]] if scores[i, best[i]] >= cutoff else None)
+            for i, target in enumerate(self.targets)
+        }
+
+    def best_matches_batch(
+        self, headers: List[List[str]], cutoff: float = 0.5
+    ) -> List[Dict[str, str | None]]:
+        """
+        best_matches for many headers, with every distinct column name
+        across them scored in a single matrix product.
+        """
+        names = list(dict.fromkeys(col for header in headers for col in header))
+        if not self.targets or not names:
+            return [{target: None for target in self.targets} for _ in headers]
+
+        positions = {name: i for i, name in enumerate(names)}
+        scores = self.score(names)
+        results = []
+        for header in headers:
+            if not header:
+                results.append({target: None for target in self.targets})
+                continue
+            header_scores = scores[:, [positions[col] for col in header]]
+            best = header_scores.argmax(axis=1)
+            results.append(
+                {
+                    target: (
+                        header[best[i]] if header_scores[i, best[i]] >= cutoff else None
+                    )
+                    for i, target in enumerate(self.targets)
+                }
+            )
+        return results
+
+    @staticmethod
+    def _vectorize(
+        grams_list: List[set[str]], vocabulary: Dict[str, int]
+    ) -> np.ndarray:
+        matrix = np.zeros((len(grams_list), len(vocabulary)), dtype=np.float32)
+        for row, grams in enumerate(grams_list):
+            indices = [vocabulary[gram] for gram in grams if gram in vocabulary]
+            matrix[row, indices] = 1.0
+        return matrix
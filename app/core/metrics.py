@@ -0,0 +1,152 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Latency buckets in seconds, from sub-millisecond header reads to long scans
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """
+    Monotonic counter with a single label, rendered in Prometheus text format.
+    """
+
+    def __init__(self, name: str, description: str, label: str = "stage"):
+        self.name = name
+        self.description = description
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: float = 1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value: str) -> float:
+        return self._values.get(label_value, 0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for label_value, value in sorted(self._values.items()):
+                lines.append(
+                    f'{self.name}{{{self.label}="{_escape(label_value)}"}} {value}'
+                )
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with a single label, as Prometheus expects.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label: str = "stage",
+        buckets=DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = tuple(buckets)
+        # Per label value: bucket counts (last one is +Inf), sum, count
+        self._series: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        with self._lock:
+            series = self._series.setdefault(
+                label_value, [[0] * (len(self.buckets) + 1), 0.0, 0]
+            )
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, label_value: str) -> int:
+        series = self._series.get(label_value)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for label_value, (counts, total, count) in sorted(self._series.items()):
+                label = f'{self.label}="{_escape(label_value)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{self.name}_sum{{{label}}} {total}")
+                lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "column_mapper_stage_seconds", "Latency of internal processing stages"
+)
+REQUEST_SECONDS = Histogram(
+    "column_mapper_request_seconds", "Latency of HTTP requests", label="route"
+)
+BYTES_READ = Counter("column_mapper_bytes_read_total", "Bytes read from storage")
+BYTES_WRITTEN = Counter("column_mapper_bytes_written_total", "Bytes written to storage")
+ROWS_SCANNED = Counter("column_mapper_rows_scanned_total", "CSV data rows parsed")
+BYTES_RECLAIMED = Counter(
+    "column_mapper_storage_reclaimed_bytes_total",
+    "Bytes freed by storage retention",
+    label="reason",
+)
+
+REGISTRY = [
+    STAGE_SECONDS,
+    REQUEST_SECONDS,
+    BYTES_READ,
+    BYTES_WRITTEN,
+    ROWS_SCANNED,
+    BYTES_RECLAIMED,
+]
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Records the duration of the block (or decorated function) under stage.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(stage, time.perf_counter() - start)
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
@@ -0,0 +1,85 @@
+import collections
+import logging
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Counter
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two stack samples
+SAMPLE_INTERVAL = 0.005
+# Innermost frames of threads parked waiting for work, left out of profiles
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("selectors.py", "select"),
+}
+
+
+class StackSampler:
+    """
+    Sampling profiler for the duration of a request. Unlike cProfile, which
+    only sees the thread it was enabled in, it samples every thread, so work
+    handed to the threadpool or the matching executor shows up too.
+    Concurrent requests land in the same samples, so profile under light load.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def dump(self, directory: Path, name: str) -> Path:
+        """
+        Writes collapsed stacks ('outer;inner count' per line), the input
+        format of flamegraph.pl and speedscope.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = (
+            directory
+            / f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}.folded"
+        )
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        )
+        logger.info(f"Wrote request profile to {path}")
+        return path
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                code = frame.f_code
+                if (
+                    thread_id == own_id
+                    or (Path(code.co_filename).name, code.co_name) in IDLE_FRAMES
+                ):
+                    continue
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+            )
+            frame = frame.f_back
+        return ";".join(reversed(names))
@@ -1,7 +1,32 @@
+import base64
 import json
 import sqlite3
+import string
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Literal
+from pydantic import BaseModel
+from .mapping_index import MappingCandidate, MappingIndex
+from .metrics import timed
+
+# Page size bounds for list_mappings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Tables of the app's own database
+APP_TABLES = ("mappings", "suggestions")
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class MappingSummary(BaseModel):
+    name: str
+    created_at: str
+
+
+class MappingPage(BaseModel):
+    mappings: List[MappingSummary]
+    # Pass back as cursor to get the next page, None on the last page
+    next_cursor: str | None = None
 
 
 class BaseRepository(ABC):
@@ -14,41 +39,250 @@ class BaseRepository(ABC):
     def get_mapping(self, name: str) -> Dict[str, str] | None:
         pass
 
+    @abstractmethod
+    def get_suggestion(self, key: str) -> Dict[str, str | None] | None:
+        pass
+
+    @abstractmethod
+    def save_suggestion(
+        self, key: str, mapping_name: str | None, suggestion: Dict[str, str | None]
+    ):
+        pass
+
 
 class SQLiteRepository(BaseRepository):
+    """
+    Meant to be long-lived: each thread reuses its own connection,
+    the database runs in WAL mode so readers don't block behind writers,
+    and saved mappings are cached in-process until save_mapping changes them.
+    """
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._mapping_cache: Dict[str, Dict[str, str]] = {}
+        # Built from the table on first use, then kept current by save_mapping
+        self._mapping_index: MappingIndex | None = None
         self._init_db()
 
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Closed from whichever thread calls close(), hence check_same_thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout = 5000")
+            # Durable enough under WAL and avoids an fsync per commit
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode = WAL")
+        with conn:
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS mappings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT UNIQUE,
                     mapping_json TEXT NOT NULL,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
-                """
-            )
+                """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS suggestions (
+                    key TEXT PRIMARY KEY,
+                    mapping_name TEXT,
+                    suggestion_json TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_suggestions_mapping_name
+                ON suggestions (mapping_name)
+                """)
+            # Serve list_mappings' prefix search and both sort orders
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mappings_name_nocase
+                ON mappings (name COLLATE NOCASE, id)
+                """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mappings_created_at
+                ON mappings (created_at, id)
+                """)
 
+    @timed("db.save_mapping")
     def save_mapping(self, name: str, mapping: Dict[str, str]):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute(
                 "INSERT INTO mappings (name, mapping_json) VALUES (?, ?)",
                 (name, json.dumps(mapping)),
             )
+            # Suggestions computed against the previous state of this mapping are stale
+            conn.execute("DELETE FROM suggestions WHERE mapping_name = ?", (name,))
+        with self._lock:
+            self._mapping_cache.pop(name, None)
+            mapping_index = self._mapping_index
+        if mapping_index is not None:
+            mapping_index.add(name, mapping)
 
+    @timed("db.get_mapping")
     def get_mapping(self, name: str) -> Dict[str, str] | None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            cached = self._mapping_cache.get(name)
+        if cached is not None:
+            return dict(cached)
+
+        with self._connection() as conn:
             row = conn.execute(
                 "SELECT mapping_json FROM mappings WHERE name = ?", (name,)
             ).fetchone()
+        if not row:
+            return None
+
+        mapping = json.loads(row[0])
+        with self._lock:
+            self._mapping_cache[name] = mapping
+        return dict(mapping)
+
+    @timed("db.list_mappings")
+    def list_mappings(
+        self,
+        prefix: str | None = None,
+        sort: Literal["name", "created_at"] = "name",
+        descending: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> MappingPage:
+        """
+        One page of saved mappings, optionally those whose name starts with
+        prefix (ASCII case-insensitive). Keyset pagination over the indexes:
+        a page costs the same however deep it is.
+        Raises ValueError for a cursor not produced by this method.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        sort_column = "name COLLATE NOCASE" if sort == "name" else "created_at"
+        direction = "DESC" if descending else "ASC"
+        conditions, params = [], []
+        if prefix:
+            # NOCASE folds ASCII letters only, and the bounds must be folded too
+            prefix = prefix.translate(_ASCII_LOWER)
+            conditions.append("name COLLATE NOCASE >= ?")
+            params.append(prefix)
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None:
+                conditions.append("name COLLATE NOCASE < ?")
+                params.append(upper)
+        if cursor:
+            conditions.append(
+                f"({sort_column}, id) {'<' if descending else '>'} (?, ?)"
+            )
+            params.extend(_decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT name, created_at, id FROM mappings {where} "
+                f"ORDER BY {sort_column} {direction}, id {direction} LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            name, created_at, row_id = rows[-1]
+            next_cursor = _encode_cursor(
+                [name if sort == "name" else created_at, row_id]
+            )
+        return MappingPage(
+            mappings=[
+                MappingSummary(name=name, created_at=created_at)
+                for name, created_at, _ in rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    @timed("db.recommend_mappings")
+    def recommend_mappings(
+        self, source_columns: List[str], limit: int = 3
+    ) -> List[MappingCandidate]:
+        """
+        Saved mappings whose source columns best overlap the given header.
+        """
+        return self.load_mapping_index().rank(source_columns, limit)
+
+    def load_mapping_index(self) -> MappingIndex:
+        """
+        Returns the index of saved mappings, reading the table the first time.
+        """
+        conn = self._connection()
+        with self._lock:
+            if self._mapping_index is not None:
+                return self._mapping_index
+            # Built under the lock so no save_mapping slips between load and publish
+            mapping_index = MappingIndex()
+            rows = conn.execute(
+                "SELECT name, mapping_json FROM mappings ORDER BY id"
+            ).fetchall()
+            mapping_index.add_all((name, json.loads(data)) for name, data in rows)
+            self._mapping_index = mapping_index
+            return mapping_index
+
+    @timed("db.get_suggestion")
+    def get_suggestion(self, key: str) -> Dict[str, str | None] | None:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT suggestion_json FROM suggestions WHERE key = ?", (key,)
+            ).fetchone()
             return json.loads(row[0]) if row else None
 
-    def list_mappings(self) -> list[str] | None:
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute("SELECT name FROM mappings").fetchall()
-            return rows
+    @timed("db.save_suggestion")
+    def save_suggestion(
+        self, key: str, mapping_name: str | None, suggestion: Dict[str, str | None]
+    ):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, mapping_name, suggestion_json)"
+                " VALUES (?, ?, ?)",
+                (key, mapping_name, json.dumps(suggestion)),
+            )
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Smallest string greater than every string starting with prefix.
+    """
+    while prefix and prefix[-1] == chr(0x10FFFF):
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _encode_cursor(position: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode()
+
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if (
+        not isinstance(position, list)
+        or len(position) != 2
+        or not isinstance(position[0], str)
+        or not isinstance(position[1], int)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
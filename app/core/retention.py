@@ -0,0 +1,364 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+from pydantic import BaseModel
+from .csv_service import OBJECTS_DIR, CSVService, objects_lock, sidecar_paths
+from .metrics import BYTES_RECLAIMED, timed
+from .upload_sessions import CHUNKS_DIR, DATA_FILE, UPLOADS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two retention passes
+RETENTION_INTERVAL = 60
+# Objects touched this recently may be being linked by an upload in another
+# process, so they are never deleted even when nothing links to them yet
+OBJECT_GRACE_SECONDS = 60
+SIDECAR_SUFFIXES = (".profile.json", ".sample")
+# Scratch files of uploads that stopped writing this long ago are abandoned
+STALE_TMP_SECONDS = 3600
+
+
+class RetentionStats(BaseModel):
+    runs: int = 0
+    last_run_at: float | None = None
+    last_run_seconds: float = 0
+    # Usage as of the end of the last run
+    bytes_used: int = 0
+    uploads: int = 0
+    # Totals since the process started
+    uploads_evicted: int = 0
+    objects_deleted: int = 0
+    sessions_expired: int = 0
+    bytes_reclaimed: int = 0
+    # Evictions postponed because the upload was in use
+    pinned_skipped: int = 0
+
+
+class UploadPins:
+    """
+    Uploads in use by a request, retention never evicts them.
+    Counted, so overlapping requests on the same upload are fine.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def pin(self, filename: str):
+        self.acquire(filename)
+        try:
+            yield
+        finally:
+            self.release(filename)
+
+    def acquire(self, filename: str):
+        """
+        Pins until the matching release, for work that outlives the request.
+        """
+        with self._lock:
+            self._counts[filename] = self._counts.get(filename, 0) + 1
+
+    def release(self, filename: str):
+        with self._lock:
+            self._counts[filename] -= 1
+            if not self._counts[filename]:
+                del self._counts[filename]
+
+    def hold(self, filename: str, chunks: Iterator) -> Iterator:
+        """
+        Pins the upload now and keeps it pinned while a streamed response is
+        being produced, until chunks run out or the stream is closed or dropped.
+        """
+        return _PinnedIterator(self, filename, chunks)
+
+    def is_pinned(self, filename: str) -> bool:
+        return filename in self._counts
+
+    def run_unless_pinned(self, filename: str, action: Callable[[], None]) -> bool:
+        """
+        Runs action unless the upload is pinned, without letting
+        a request pin it in between. Returns whether it ran.
+        """
+        with self._lock:
+            if filename in self._counts:
+                return False
+            action()
+            return True
+
+
+class _PinnedIterator:
+    """
+    Releases its pin once, however the stream ends. A response whose body
+    never starts is only dropped, so release happens there too.
+    """
+
+    def __init__(self, pins: UploadPins, filename: str, chunks: Iterator):
+        self._pins = pins
+        self._filename = filename
+        self._chunks = iter(chunks)
+        self._pinned = True
+        pins.acquire(filename)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._pinned:
+            self._pinned = False
+            self._pins.release(self._filename)
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+
+    def __del__(self):
+        self.close()
+
+
+class _Upload:
+    def __init__(self, name: str, accessed: float, object_name: str | None, size: int):
+        self.name = name
+        self.accessed = accessed
+        # None for files placed in storage directly rather than uploaded
+        self.object_name = object_name
+        self.size = size
+
+
+class StorageRetention:
+    """
+    Keeps the storage directory within a byte quota and a maximum age.
+    Uploads idle for longer than max_age are evicted, then the least recently
+    accessed ones until the quota is met. An object is deleted once no upload
+    links to it. Runs on a background thread, requests only touch and pin.
+    """
+
+    def __init__(
+        self,
+        csv_service: CSVService,
+        max_bytes: int = 0,
+        max_age: float = 0,
+        interval: float = RETENTION_INTERVAL,
+        pins: UploadPins | None = None,
+    ):
+        """
+        max_bytes and max_age (seconds since last access) of 0 disable that limit.
+        """
+        self.csv_service = csv_service
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.interval = interval
+        self.pins = pins or UploadPins()
+        self._stats = RetentionStats()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def stats(self) -> RetentionStats:
+        with self._stats_lock:
+            return self._stats.model_copy()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="storage-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.collect()
+            except Exception:
+                logger.exception("Storage retention pass failed")
+            if self._stop.wait(self.interval):
+                return
+
+    @timed("storage.retention")
+    def collect(self, now: float | None = None) -> RetentionStats:
+        """
+        One retention pass, returns the updated statistics.
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        uploads, links, object_sizes = self._scan()
+        used = sum(object_sizes.values()) + sum(
+            upload.size for upload in uploads if upload.object_name is None
+        )
+        run = RetentionStats()
+
+        def evict(upload: _Upload, reason: str) -> int:
+            """
+            Removes one upload, returns the bytes freed.
+            """
+            path = self.csv_service.storage_path / upload.name
+            if not self.pins.run_unless_pinned(upload.name, path.unlink):
+                run.pinned_skipped += 1
+                return 0
+            run.uploads_evicted += 1
+            if upload.object_name is None:
+                for sidecar in sidecar_paths(path):
+                    sidecar.unlink(missing_ok=True)
+                freed = upload.size
+            else:
+                links[upload.object_name] -= 1
+                freed = 0
+                if not links[upload.object_name]:
+                    freed = self._delete_object(upload.object_name, now)
+                    run.objects_deleted += bool(freed)
+            run.bytes_reclaimed += freed
+            BYTES_RECLAIMED.inc(reason, freed)
+            return freed
+
+        remaining = []
+        for upload in uploads:
+            if self.max_age and now - upload.accessed > self.max_age:
+                used -= evict(upload, "age")
+            else:
+                remaining.append(upload)
+
+        if self.max_bytes:
+            for upload in sorted(remaining, key=lambda upload: upload.accessed):
+                if used <= self.max_bytes:
+                    break
+                used -= evict(upload, "quota")
+
+        # Left behind by a crash, or by an upload that was evicted meanwhile
+        for object_name, count in links.items():
+            if count == 0 and object_name in object_sizes:
+                freed = self._delete_object(object_name, now)
+                run.objects_deleted += bool(freed)
+                run.bytes_reclaimed += freed
+                BYTES_RECLAIMED.inc("orphan", freed)
+                used -= freed
+        self._remove_stale_tmp_files(now)
+        if self.max_age:
+            self._expire_sessions(now, run)
+
+        with self._stats_lock:
+            stats = self._stats
+            stats.runs += 1
+            stats.last_run_at = now
+            stats.last_run_seconds = time.perf_counter() - started
+            stats.bytes_used = max(used, 0)
+            stats.uploads = len(uploads) - run.uploads_evicted
+            stats.uploads_evicted += run.uploads_evicted
+            stats.objects_deleted += run.objects_deleted
+            stats.sessions_expired += run.sessions_expired
+            stats.pinned_skipped += run.pinned_skipped
+            stats.bytes_reclaimed += run.bytes_reclaimed
+            return stats.model_copy()
+
+    def _scan(self):
+        """
+        Uploads with their last access, links per object and object sizes
+        (sidecars included), from one listing of each directory.
+        """
+        object_sizes: Dict[str, int] = {}
+        objects_path = self.csv_service.objects_path
+        for entry in os.scandir(objects_path):
+            if entry.name.startswith(".") or entry.name.endswith(SIDECAR_SUFFIXES):
+                continue
+            size = entry.stat().st_size
+            for sidecar in sidecar_paths(Path(entry.path)):
+                try:
+                    size += sidecar.stat().st_size
+                except FileNotFoundError:
+                    pass
+            object_sizes[entry.name] = size
+
+        uploads: List[_Upload] = []
+        links = {name: 0 for name in object_sizes}
+        for entry in os.scandir(self.csv_service.storage_path):
+            if entry.name.startswith(".") or entry.name.endswith(SIDECAR_SUFFIXES):
+                continue
+            if entry.is_symlink():
+                target = os.readlink(entry.path)
+                object_name = os.path.basename(target)
+                if os.path.dirname(target) != OBJECTS_DIR:
+                    continue
+                accessed = entry.stat(follow_symlinks=False).st_mtime
+                uploads.append(_Upload(entry.name, accessed, object_name, 0))
+                links[object_name] = links.get(object_name, 0) + 1
+            elif entry.is_file():
+                stat = entry.stat()
+                uploads.append(_Upload(entry.name, stat.st_mtime, None, stat.st_size))
+        return uploads, links, object_sizes
+
+    def _delete_object(self, object_name: str, now: float) -> int:
+        """
+        Deletes an object nothing links to, returns the bytes freed.
+        """
+        object_path = self.csv_service.objects_path / object_name
+        with objects_lock:
+            try:
+                stat = object_path.stat()
+            except FileNotFoundError:
+                return 0
+            # Reused by an upload since the scan, it is being linked again
+            if now - stat.st_mtime < OBJECT_GRACE_SECONDS:
+                return 0
+            freed = stat.st_size
+            object_path.unlink()
+            for sidecar in sidecar_paths(object_path):
+                try:
+                    freed += sidecar.stat().st_size
+                    sidecar.unlink()
+                except FileNotFoundError:
+                    pass
+        if self.csv_service.cache is not None:
+            self.csv_service.cache.discard(object_name.split(".")[0])
+        return freed
+
+    def _remove_stale_tmp_files(self, now: float):
+        for entry in os.scandir(self.csv_service.objects_path):
+            if entry.name.startswith(".tmp-"):
+                try:
+                    if now - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def _expire_sessions(self, now: float, run: RetentionStats):
+        """
+        Drops resumable upload sessions without a chunk for max_age seconds.
+        """
+        sessions_path = self.csv_service.storage_path / UPLOADS_DIR
+        if not sessions_path.is_dir():
+            return
+        for entry in os.scandir(sessions_path):
+            # Sessions being created or finalised
+            if entry.name.startswith("."):
+                continue
+            path = Path(entry.path)
+            try:
+                active = max(path.stat().st_mtime, (path / CHUNKS_DIR).stat().st_mtime)
+                if now - active <= self.max_age:
+                    continue
+                freed = (path / DATA_FILE).stat().st_blocks * 512
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            BYTES_RECLAIMED.inc("session", freed)
+            run.sessions_expired += 1
+            run.bytes_reclaimed += freed
@@ -0,0 +1,79 @@
+import math
+import random
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# z for a two-sided 95% confidence interval
+Z_95 = 1.959964
+
+
+class ReservoirSampler(Generic[T]):
+    """
+    Uniform sample of at most `size` items from a stream of unknown length.
+    Uses Algorithm L: after the reservoir is full, the number of items to skip
+    until the next replacement is drawn directly, so a batch costs one
+    random draw per replacement instead of one per item.
+    """
+
+    def __init__(self, size: int, seed: int | None = None):
+        self.size = size
+        self.seen = 0
+        self.items: List[T] = []
+        self._random = random.Random(seed)
+        self._weight = 1.0
+        # Stream index of the next item to go into the full reservoir
+        self._next = size - 1
+
+    def offer(self, batch: Sequence[T]):
+        if self.size <= 0:
+            self.seen += len(batch)
+            return
+        start = self.seen
+        self.seen += len(batch)
+        if len(self.items) < self.size:
+            taken = batch[: self.size - len(self.items)]
+            self.items.extend(taken)
+            if len(self.items) == self.size:
+                self._weight = math.exp(math.log(self._uniform()) / self.size)
+                self._advance()
+        while self._next < self.seen:
+            self.items[self._random.randrange(self.size)] = batch[self._next - start]
+            self._weight *= math.exp(math.log(self._uniform()) / self.size)
+            self._advance()
+
+    def _advance(self):
+        # Skip count is geometric with success probability 1 - weight
+        self._next += (
+            math.floor(math.log(self._uniform()) / math.log(1 - self._weight)) + 1
+        )
+
+    def _uniform(self) -> float:
+        # In (0, 1), so logarithms stay finite
+        while True:
+            value = self._random.random()
+            if value > 0:
+                return value
+
+
+def wilson_interval(
+    successes: int, n: int, population: int | None = None, z: float = Z_95
+) -> Tuple[float, float]:
+    """
+    Wilson score interval for a proportion estimated from n samples.
+    With the population size known, the width shrinks by the finite
+    population correction, down to nothing when the sample is everything.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    if population is not None:
+        if n >= population:
+            return p, p
+        half_width *= math.sqrt((population - n) / (population - 1))
+    low = 0.0 if successes == 0 else max(0.0, center - half_width)
+    high = 1.0 if successes == n else min(1.0, center + half_width)
+    return low, high
@@ -0,0 +1,105 @@
+import re
+import types
+import pandas as pd
+from typing import Callable, List, Union, get_args, get_origin
+from pydantic import EmailStr
+from pydantic.fields import FieldInfo
+
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+INT_PATTERN = r"\s*[+-]?\d+(\.0*)?\s*"
+BOOL_VALUES = {"0", "off", "f", "false", "n", "no", "1", "on", "t", "true", "y", "yes"}
+
+
+class FieldCheck:
+    """
+    One vectorized rule: maps a Series of raw non-NA strings
+    to a boolean mask of the values breaking it.
+    """
+
+    def __init__(self, description: str, invalid: Callable[[pd.Series], pd.Series]):
+        self.description = description
+        self.invalid = invalid
+
+
+def unwrap_optional(annotation):
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _pattern_check(pattern: str, description: str) -> FieldCheck:
+    compiled = re.compile(pattern)
+    return FieldCheck(description, lambda values: ~values.str.fullmatch(compiled))
+
+
+def _numeric(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values.str.strip(), errors="coerce")
+
+
+def compile_field_checks(field: FieldInfo) -> List[FieldCheck]:
+    """
+    Turns a pydantic field's type and constraints into column-level checks.
+    Types without a vectorized equivalent get no checks.
+    """
+    annotation = unwrap_optional(field.annotation)
+    checks = []
+
+    if annotation is EmailStr:
+        checks.append(_pattern_check(EMAIL_PATTERN, "not a valid email"))
+    elif annotation is bool:
+        checks.append(
+            FieldCheck(
+                "not a boolean",
+                lambda values: ~values.str.strip().str.lower().isin(BOOL_VALUES),
+            )
+        )
+    elif annotation is int:
+        checks.append(_pattern_check(INT_PATTERN, "not an integer"))
+    elif annotation is float:
+        checks.append(
+            FieldCheck("not a number", lambda values: _numeric(values).isna())
+        )
+
+    for constraint in field.metadata:
+        if getattr(constraint, "min_length", None) is not None:
+            min_length = constraint.min_length
+            checks.append(
+                FieldCheck(
+                    f"shorter than {min_length}",
+                    lambda values, n=min_length: values.str.len() < n,
+                )
+            )
+        if getattr(constraint, "max_length", None) is not None:
+            max_length = constraint.max_length
+            checks.append(
+                FieldCheck(
+                    f"longer than {max_length}",
+                    lambda values, n=max_length: values.str.len() > n,
+                )
+            )
+        if getattr(constraint, "pattern", None) is not None:
+            pattern = re.compile(constraint.pattern)
+            checks.append(
+                FieldCheck(
+                    f"not matching {constraint.pattern}",
+                    lambda values, p=pattern: ~values.str.contains(p),
+                )
+            )
+        for bound, description, compare in (
+            ("gt", "not greater than", lambda num, n: num <= n),
+            ("ge", "less than", lambda num, n: num < n),
+            ("lt", "not less than", lambda num, n: num >= n),
+            ("le", "greater than", lambda num, n: num > n),
+        ):
+            limit = getattr(constraint, bound, None)
+            if limit is not None:
+                checks.append(
+                    FieldCheck(
+                        f"{description} {limit}",
+                        lambda values, n=limit, cmp=compare: cmp(_numeric(values), n),
+                    )
+                )
+
+    return checks
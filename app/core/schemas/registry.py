@@ -0,0 +1,86 @@
+import re
+import threading
+from typing import Dict, FrozenSet, List
+from pydantic import BaseModel
+from .field_checks import FieldCheck, compile_field_checks
+from .user_info import UserInfo
+from ..mapping_strategies.ngram_scorer import NgramScorer
+
+DEFAULT_SCHEMA = "user_info"
+
+
+class CompiledSchema:
+    """
+    Everything derived from a target schema, computed once when the schema
+    is registered and shared by the engine, strategies and validators.
+    """
+
+    def __init__(self, name: str, schema_class: type[BaseModel]):
+        self.name = name
+        self.schema_class = schema_class
+        self.fields: List[str] = list(schema_class.model_fields)
+        self.required_fields: FrozenSet[str] = frozenset(
+            field
+            for field, info in schema_class.model_fields.items()
+            if info.is_required()
+        )
+        self.field_checks: Dict[str, List[FieldCheck]] = {
+            field: checks
+            for field, info in schema_class.model_fields.items()
+            if (checks := compile_field_checks(info))
+        }
+        # The scorer fuzzy matching uses while no field is mapped yet
+        self.scorer = NgramScorer(self.fields)
+
+
+def schema_name_for(schema_class: type[BaseModel]) -> str:
+    """
+    UserInfo -> user_info
+    """
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", schema_class.__name__).lower()
+
+
+class SchemaRegistry:
+    """
+    Target schemas selectable by name. Classes that were never registered
+    are compiled on first use too, so callers can always go through here.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, CompiledSchema] = {}
+        self._by_class: Dict[type, CompiledSchema] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, schema_class: type[BaseModel], name: str | None = None
+    ) -> CompiledSchema:
+        compiled = CompiledSchema(name or schema_name_for(schema_class), schema_class)
+        with self._lock:
+            self._by_name[compiled.name] = compiled
+            self._by_class[schema_class] = compiled
+        return compiled
+
+    def get(self, name: str) -> CompiledSchema:
+        """
+        Raises KeyError for unknown names.
+        """
+        return self._by_name[name]
+
+    def names(self) -> List[str]:
+        return sorted(self._by_name)
+
+    def compiled(self, schema_class: type[BaseModel]) -> CompiledSchema:
+        compiled = self._by_class.get(schema_class)
+        if compiled is None:
+            compiled = CompiledSchema(schema_name_for(schema_class), schema_class)
+            with self._lock:
+                compiled = self._by_class.setdefault(schema_class, compiled)
+        return compiled
+
+
+schema_registry = SchemaRegistry()
+schema_registry.register(UserInfo)
+
+
+def compile_schema(schema_class: type[BaseModel]) -> CompiledSchema:
+    return schema_registry.compiled(schema_class)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pydantic import BaseModel
+from typing import Dict, List, Set, Type
+from .mapping_strategies.base import BaseMappingStrategy
+from .repository import BaseRepository
+
+# Bump whenever scoring or name normalisation changes what gets suggested,
+# so suggestions persisted by earlier versions are no longer served
+SUGGESTION_VERSION = 1
+
+
+def suggestion_key(
+    schema: Type[BaseModel],
+    source_columns: List[str],
+    mapping_name: str | None,
+    mapping_strategy: BaseMappingStrategy | None,
+) -> str:
+    """
+    Hash of everything a suggested mapping depends on.
+    Schema fields are part of the key so editing a schema never serves stale entries.
+    """
+    signature = [
+        SUGGESTION_VERSION,
+        f"{schema.__module__}.{schema.__qualname__}",
+        list(schema.model_fields),
+        list(source_columns),
+        mapping_name,
+        type(mapping_strategy).__qualname__ if mapping_strategy else None,
+    ]
+    return hashlib.sha256(json.dumps(signature).encode("utf-8")).hexdigest()
+
+
+class LRUSuggestionStore:
+    """
+    Thread-safe in-memory tier, keeps the most recently used suggestions.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Dict[str, str | None]] = OrderedDict()
+        self._keys_by_mapping: Dict[str | None, Set[str]] = {}
+        self._mapping_by_key: Dict[str, str | None] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Dict[str, str | None] | None:
+        with self._lock:
+            suggestion = self._entries.get(key)
+            if suggestion is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(suggestion)
+
+    def put(
+        self, key: str, mapping_name: str | None, suggestion: Dict[str, str | None]
+    ):
+        with self._lock:
+            self._entries[key] = dict(suggestion)
+            self._entries.move_to_end(key)
+            self._mapping_by_key[key] = mapping_name
+            self._keys_by_mapping.setdefault(mapping_name, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._forget(oldest)
+
+    def invalidate_mapping(self, mapping_name: str):
+        with self._lock:
+            for key in self._keys_by_mapping.pop(mapping_name, set()):
+                self._entries.pop(key, None)
+                self._mapping_by_key.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _forget(self, key: str):
+        mapping_name = self._mapping_by_key.pop(key, None)
+        keys = self._keys_by_mapping.get(mapping_name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_mapping[mapping_name]
+
+
+class SuggestionCache:
+    """
+    Memoizes suggested mappings by header signature.
+    Saving a mapping invalidates the suggestions made with it, so later
+    suggestions see the saved version.
+    Lookups go to the in-memory tier first, then to the repository when given,
+    whose hits are promoted back into memory.
+    """
+
+    def __init__(
+        self, memory: LRUSuggestionStore, repository: BaseRepository | None = None
+    ):
+        self.memory = memory
+        self.repository = repository
+
+    def get(self, key: str, mapping_name: str | None) -> Dict[str, str | None] | None:
+        suggestion = self.memory.get(key)
+        if suggestion is not None or self.repository is None:
+            return suggestion
+
+        suggestion = self.repository.get_suggestion(key)
+        if suggestion is not None:
+            self.memory.put(key, mapping_name, suggestion)
+        return suggestion
+
+    def put(
+        self, key: str, mapping_name: str | None, suggestion: Dict[str, str | None]
+    ):
+        self.memory.put(key, mapping_name, suggestion)
+        if self.repository is not None:
+            self.repository.save_suggestion(key, mapping_name, suggestion)
+
+    def invalidate_mapping(self, mapping_name: str):
+        self.memory.invalidate_mapping(mapping_name)
@@ -0,0 +1,251 @@
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+import logging
+from pathlib import Path
+from typing import Dict, List
+from pydantic import BaseModel
+from .compression import decompress_prefix
+from .csv_records import HEADER_MAX_BYTES, CSVHeader, header_from_prefix
+from .metrics import BYTES_WRITTEN, timed
+
+logger = logging.getLogger(__name__)
+
+# Resumable uploads in progress live here, under the storage directory
+UPLOADS_DIR = ".uploads"
+# Chunk size used when the client does not pick one, and the accepted range
+SESSION_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+SESSION_FILE = "session.json"
+HEADER_FILE = "header.json"
+SUGGESTION_FILE = "suggestion.json"
+DATA_FILE = "data.part"
+CHUNKS_DIR = "chunks"
+
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class UploadSessionInfo(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    chunk_size: int
+    has_header: bool = True
+    apply_mapping_name: str | None = None
+    schema_name: str
+    created_at: float
+
+    @property
+    def chunk_count(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    def chunk_length(self, index: int) -> int:
+        if index == self.chunk_count - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+
+
+class ChunkWriter:
+    """
+    Writes one chunk straight to its offset in the session's data file.
+    The chunk only counts as received once close() has seen all its bytes,
+    so an interrupted chunk is simply sent again.
+    """
+
+    def __init__(self, session: "UploadSession", index: int):
+        self.session = session
+        self.index = index
+        self.offset = index * session.info.chunk_size
+        self.length = session.info.chunk_length(index)
+        self.written = 0
+        # First bytes of chunk 0 are kept to parse the header from,
+        # after decompressing them for compressed uploads
+        self.prefix = bytearray()
+        self._fd = os.open(session.data_path, os.O_WRONLY)
+
+    @timed("upload.write_chunk")
+    def write(self, data: bytes):
+        if self.written + len(data) > self.length:
+            raise ValueError(f"Chunk {self.index} is longer than {self.length} bytes")
+        # Positional writes, so chunks can be written concurrently
+        os.pwrite(self._fd, data, self.offset + self.written)
+        self.written += len(data)
+        BYTES_WRITTEN.inc("upload", len(data))
+        if self.index == 0 and len(self.prefix) < HEADER_MAX_BYTES:
+            self.prefix += data[: HEADER_MAX_BYTES - len(self.prefix)]
+
+    def close(self) -> CSVHeader | None:
+        """
+        Marks the chunk as received. For chunk 0, returns the header
+        when the chunk holds the complete first record.
+        Raises ValueError when the chunk is short.
+        """
+        os.close(self._fd)
+        if self.written != self.length:
+            raise ValueError(
+                f"Chunk {self.index} has {self.written} bytes, expected {self.length}"
+            )
+        (self.session.chunks_path / str(self.index)).touch()
+        if self.index != 0:
+            return None
+        header = header_from_prefix(
+            decompress_prefix(bytes(self.prefix), HEADER_MAX_BYTES),
+            self.session.info.has_header,
+        )
+        if header is not None:
+            self.session.set_header(header)
+        return header
+
+    def abort(self):
+        os.close(self._fd)
+
+
+class UploadSession:
+    """
+    One resumable upload: a preallocated data file that chunks are written
+    into at their final offsets, and one marker file per received chunk.
+    All state is on disk, so sessions survive restarts and are shared by
+    worker processes.
+    """
+
+    def __init__(self, path: Path, info: UploadSessionInfo):
+        self.path = path
+        self.info = info
+        self.data_path = path / DATA_FILE
+        self.chunks_path = path / CHUNKS_DIR
+
+    def received_chunks(self) -> List[int]:
+        return sorted(int(marker.name) for marker in self.chunks_path.iterdir())
+
+    def missing_chunks(self) -> List[int]:
+        received = set(self.received_chunks())
+        return [i for i in range(self.info.chunk_count) if i not in received]
+
+    @property
+    def header(self) -> CSVHeader | None:
+        try:
+            return CSVHeader.model_validate_json((self.path / HEADER_FILE).read_text())
+        except FileNotFoundError:
+            return None
+
+    def set_header(self, header: CSVHeader):
+        self._write(HEADER_FILE, header.model_dump_json())
+
+    @property
+    def suggestion(self) -> Dict[str, str | None] | None:
+        """
+        Mapping suggested from the header, kept with the session so it goes
+        away with it however the session ends.
+        """
+        try:
+            return json.loads((self.path / SUGGESTION_FILE).read_text())
+        except FileNotFoundError:
+            return None
+
+    def set_suggestion(self, suggestion: Dict[str, str | None]):
+        """
+        Raises FileNotFoundError once the session is gone.
+        """
+        self._write(SUGGESTION_FILE, json.dumps(suggestion))
+
+    def _write(self, name: str, content: str):
+        tmp_path = self.path / f".{name}.{uuid.uuid4().hex}"
+        tmp_path.write_text(content)
+        os.replace(tmp_path, self.path / name)
+
+    def open_chunk(self, index: int) -> ChunkWriter:
+        """
+        Raises IndexError for chunk numbers outside the upload.
+        """
+        if not 0 <= index < self.info.chunk_count:
+            raise IndexError(
+                f"Chunk {index} out of range, upload has {self.info.chunk_count}"
+            )
+        return ChunkWriter(self, index)
+
+
+class UploadSessionStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(exist_ok=True, parents=True)
+
+    def create(
+        self,
+        filename: str,
+        size: int,
+        schema_name: str,
+        chunk_size: int = SESSION_CHUNK_SIZE,
+        has_header: bool = True,
+        apply_mapping_name: str | None = None,
+    ) -> UploadSession:
+        """
+        Raises ValueError for a negative size or a chunk size out of range.
+        """
+        if size < 0:
+            raise ValueError("Upload size must not be negative")
+        if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(
+                f"Chunk size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE}"
+            )
+        info = UploadSessionInfo(
+            upload_id=uuid.uuid4().hex,
+            filename=os.path.basename(filename),
+            size=size,
+            chunk_size=chunk_size,
+            has_header=has_header,
+            apply_mapping_name=apply_mapping_name,
+            schema_name=schema_name,
+            created_at=time.time(),
+        )
+        # Built in a scratch directory so a session is never seen half created
+        tmp_path = self.root / f".tmp-{info.upload_id}"
+        (tmp_path / CHUNKS_DIR).mkdir(parents=True)
+        with open(tmp_path / DATA_FILE, "wb") as data_file:
+            # Sparse on most filesystems, blocks are allocated as chunks land
+            data_file.truncate(size)
+        (tmp_path / SESSION_FILE).write_text(info.model_dump_json())
+        os.rename(tmp_path, self.root / info.upload_id)
+        return UploadSession(self.root / info.upload_id, info)
+
+    def get(self, upload_id: str) -> UploadSession:
+        """
+        Raises KeyError for unknown (or already finalised) uploads.
+        """
+        if not _UPLOAD_ID.fullmatch(upload_id):
+            raise KeyError(upload_id)
+        path = self.root / upload_id
+        try:
+            info = UploadSessionInfo.model_validate_json(
+                (path / SESSION_FILE).read_text()
+            )
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        return UploadSession(path, info)
+
+    def delete(self, upload_id: str):
+        shutil.rmtree(self.get(upload_id).path, ignore_errors=True)
+
+    def take_data(self, upload_id: str) -> Path:
+        """
+        Claims the assembled data file of a complete upload and drops the
+        session. The file stays under the storage directory so it can be
+        moved into place. Raises ValueError while chunks are missing and
+        KeyError once another request has claimed it.
+        """
+        session = self.get(upload_id)
+        missing = session.missing_chunks()
+        if missing:
+            raise ValueError(f"Missing chunks {missing[:10]}")
+        claimed = self.root / f".complete-{upload_id}"
+        try:
+            # Atomic, only one concurrent finalise wins
+            os.rename(session.data_path, claimed)
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        shutil.rmtree(session.path, ignore_errors=True)
+        return claimed
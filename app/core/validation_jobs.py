@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+# Validation ran to the end, with or without validation errors
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# Validation could not run, e.g. the file vanished or could not be parsed
+ERROR = "error"
+FINISHED = (SUCCEEDED, FAILED, ERROR)
+
+PENDING = "pending"
+PASSED = "passed"
+
+
+def job_key(
+    content_key: str, mapping: Dict[str, str | None], schema_class: type[BaseModel]
+) -> str:
+    """
+    Hash of everything a validation result depends on. Stored uploads never
+    change, so the same content, mapping and schema always validate the same.
+    """
+    signature = [
+        content_key,
+        sorted(mapping.items()),
+        f"{schema_class.__module__}.{schema_class.__qualname__}",
+        list(schema_class.model_fields),
+    ]
+    return hashlib.sha256(json.dumps(signature).encode("utf-8")).hexdigest()
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ValidatorStatus(BaseModel):
+    category: str
+    status: str = PENDING
+    error: str | None = None
+
+
+class JobSnapshot(BaseModel):
+    job_id: str
+    filename: str
+    status: str = QUEUED
+    rows_scanned: int = 0
+    # From the upload profile, None when unknown
+    total_rows: int | None = None
+    validators: List[ValidatorStatus] = []
+    errors: Dict[str, str] = {}
+    error: str | None = None
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    # Bumped on every change, so watchers can tell when to send an update
+    version: int = 0
+
+
+class ValidationJob:
+    """
+    Progress and outcome of one background validation. Updated by the worker
+    thread, read by any number of pollers and event streams.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        filename: str,
+        categories: List[str],
+        total_rows: int | None = None,
+    ):
+        self.key = key
+        self._state = JobSnapshot(
+            job_id=uuid.uuid4().hex,
+            filename=filename,
+            total_rows=total_rows,
+            validators=[ValidatorStatus(category=c) for c in categories],
+            created_at=time.time(),
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def job_id(self) -> str:
+        return self._state.job_id
+
+    @property
+    def finished(self) -> bool:
+        return self._state.status in FINISHED
+
+    def snapshot(self) -> JobSnapshot:
+        with self._lock:
+            return self._state.model_copy(deep=True)
+
+    def add_rows(self, rows: int):
+        with self._lock:
+            self._state.rows_scanned += rows
+            self._state.version += 1
+
+    def validated(self, category: str, error: str | None):
+        with self._lock:
+            for validator in self._state.validators:
+                if validator.category == category:
+                    validator.status = FAILED if error else PASSED
+                    validator.error = error
+            self._state.version += 1
+
+    def _start(self):
+        with self._lock:
+            self._state.status = RUNNING
+            self._state.started_at = time.time()
+            for validator in self._state.validators:
+                validator.status = RUNNING
+            self._state.version += 1
+
+    def _finish(self, errors: Dict[str, str] | None, error: str | None = None):
+        with self._lock:
+            if error is not None:
+                self._state.status = ERROR
+                self._state.error = error
+            else:
+                self._state.status = FAILED if errors else SUCCEEDED
+                self._state.errors = errors
+            self._state.finished_at = time.time()
+            self._state.version += 1
+
+
+class ValidationJobManager:
+    """
+    Runs validations on a bounded local thread pool, no broker involved.
+    Submissions with the same key (same content, mapping and schema) share
+    one job while it is queued or running, and reuse its result afterwards
+    since stored uploads never change. Jobs that hit an error are not reused,
+    so submitting again retries them.
+    """
+
+    def __init__(
+        self, workers: int = 2, max_pending: int = 100, max_finished: int = 1000
+    ):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="validation"
+        )
+        self._jobs: Dict[str, ValidationJob] = {}
+        self._by_key: Dict[str, ValidationJob] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        key: str,
+        filename: str,
+        categories: List[str],
+        work: Callable[[ValidationJob], Dict[str, str]],
+        total_rows: int | None = None,
+    ) -> tuple[ValidationJob, bool]:
+        """
+        Returns the job for key and whether it was created by this call.
+        work runs on a worker thread and returns the errors by category.
+        Raises QueueFull when max_pending jobs are already waiting or running.
+        """
+        with self._lock:
+            existing = self._by_key.get(key)
+            if existing is not None:
+                return existing, False
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} validations already pending")
+            job = ValidationJob(key, filename, categories, total_rows)
+            self._jobs[job.job_id] = job
+            self._by_key[key] = job
+            self._pending += 1
+        self._executor.submit(self._run, job, work)
+        return job, True
+
+    def get(self, job_id: str) -> ValidationJob:
+        """
+        Raises KeyError for unknown or expired jobs.
+        """
+        return self._jobs[job_id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ValidationJob, work: Callable[[ValidationJob], Dict]):
+        job._start()
+        errors, error = None, None
+        try:
+            errors = work(job)
+        except Exception as e:
+            logger.exception(f"Validation job {job.job_id} failed")
+            error = str(e)
+        # Finished under the lock, so a job seen as finished is already
+        # reusable, or retried on the next submission after an error
+        with self._lock:
+            self._pending -= 1
+            if error is not None:
+                self._by_key.pop(job.key, None)
+            job._finish(errors, error)
+            self._finished[job.job_id] = None
+            # Forget the oldest finished jobs
+            while len(self._finished) > self.max_finished:
+                old_id, _ = self._finished.popitem(last=False)
+                old = self._jobs.pop(old_id)
+                if self._by_key.get(old.key) is old:
+                    del self._by_key[old.key]
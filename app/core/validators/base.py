@@ -1,12 +1,92 @@
 from abc import ABC, abstractmethod
-from typing import Dict
-from pydantic import BaseModel
+from typing import Dict, Set
+import pandas as pd
+from pydantic import BaseModel, ConfigDict
+
+
+class ScanRequirements(BaseModel):
+    """
+    What a validator needs from the uploaded file.
+    columns: columns that must be checked against the file header.
+    na_columns: columns whose NA presence must be known.
+    """
+
+    columns: Set[str] = set()
+    na_columns: Set[str] = set()
+
+
+class ValueScan(ABC):
+    """
+    What a validator learns from the raw values of some columns, built fresh
+    for every scan. When the file is split into byte ranges scanned by worker
+    processes, each range gets a pickled copy and the copies are merged back
+    in file order, so a scan must pickle and keep nothing it cannot merge.
+    """
+
+    @property
+    @abstractmethod
+    def columns(self) -> Set[str]:
+        """
+        Columns whose values are fed to consume().
+        """
+
+    @abstractmethod
+    def consume(self, chunk: pd.DataFrame):
+        """
+        Receives chunks holding raw strings (NAs as NaN) for at least the
+        declared columns that the file has, indexed by data row number.
+        """
+
+    @abstractmethod
+    def merge(self, other: "ValueScan", row_offset: int):
+        """
+        Adds the results of a later byte range, whose row numbers start
+        from 0 rather than row_offset.
+        """
+
+
+class ScanResult(BaseModel):
+    """
+    Statistics computed by the shared scan, handed to every validator.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    columns_with_na: Set[str] = set()
+    # Of the required columns, those the file header does not have
+    missing_columns: Set[str] = set()
+    # Value scans by validation category
+    values: Dict[str, ValueScan] = {}
 
 
 class BaseValidator(ABC):
 
+    def requirements(
+        self, mapping: Dict[str, str | None], schema_class: type[BaseModel]
+    ) -> ScanRequirements:
+        """
+        Declares the file data needed, called once before the shared scan.
+        Validators that only look at the mapping need nothing.
+        """
+        return ScanRequirements()
+
+    def value_scan(
+        self, mapping: Dict[str, str | None], schema_class: type[BaseModel]
+    ) -> ValueScan | None:
+        """
+        A fresh scan of the column values this validator checks, its results
+        reach validate() in scan.values under the validation category.
+        Validators that do not look at values need none.
+        """
+        return None
+
     @abstractmethod
-    def validate(self, mapping: Dict[str, str | None], schema_class: type[BaseModel]):
+    def validate(
+        self,
+        mapping: Dict[str, str | None],
+        schema_class: type[BaseModel],
+        scan: ScanResult | None = None,
+    ):
         pass
 
     @abstractmethod
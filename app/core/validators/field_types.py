@@ -0,0 +1,124 @@
+import pandas as pd
+from typing import Dict, List, Set
+from pydantic import BaseModel
+from .base import BaseValidator, ValueScan
+from .exceptions import ValidationException
+from .planner import ValidationPlanner
+from ..csv_service import CSVService
+from ..schemas.registry import compile_schema
+
+# How many offending row indices are reported per field
+MAX_REPORTED_ROWS = 5
+
+
+class FieldTypeScan(ValueScan):
+    """
+    Invalid value counts, failed checks and first offending rows per mapped
+    field that has checks. Checks are looked up from the schema rather than
+    kept, so the scan pickles whenever the schema class does.
+    """
+
+    def __init__(
+        self,
+        mapping: Dict[str, str | None],
+        schema_class: type[BaseModel],
+        max_reported_rows: int = MAX_REPORTED_ROWS,
+    ):
+        self.schema_class = schema_class
+        self.max_reported_rows = max_reported_rows
+        self.fields: Dict[str, str] = {
+            field: mapping[field]
+            for field in compile_schema(schema_class).field_checks
+            if mapping.get(field)
+        }
+        self.counts: Dict[str, int] = {field: 0 for field in self.fields}
+        self.rows: Dict[str, List[int]] = {field: [] for field in self.fields}
+        self.reasons: Dict[str, Set[str]] = {field: set() for field in self.fields}
+
+    @property
+    def columns(self) -> Set[str]:
+        return set(self.fields.values())
+
+    def consume(self, chunk: pd.DataFrame):
+        field_checks = compile_schema(self.schema_class).field_checks
+        for field, column in self.fields.items():
+            if column not in chunk.columns:
+                continue
+            values = chunk[column].dropna()
+            invalid = pd.Series(False, index=values.index)
+            for check in field_checks[field]:
+                failed = check.invalid(values).fillna(True).astype(bool)
+                if failed.any():
+                    self.reasons[field].add(check.description)
+                invalid |= failed
+            self.counts[field] += int(invalid.sum())
+            self._report(field, values.index[invalid].tolist())
+
+    def merge(self, other: "FieldTypeScan", row_offset: int):
+        for field in self.fields:
+            self.counts[field] += other.counts[field]
+            self.reasons[field] |= other.reasons[field]
+            self._report(field, [row + row_offset for row in other.rows[field]])
+
+    @property
+    def invalid_counts(self) -> Dict[str, int]:
+        """
+        Invalid values per checked field in the chunks consumed so far.
+        """
+        return dict(self.counts)
+
+    @property
+    def failed_checks(self) -> Dict[str, List[str]]:
+        """
+        Descriptions of the checks that failed, per checked field.
+        """
+        return {field: sorted(reasons) for field, reasons in self.reasons.items()}
+
+    def _report(self, field: str, rows: List[int]):
+        missing = self.max_reported_rows - len(self.rows[field])
+        if missing > 0:
+            self.rows[field] += rows[:missing]
+
+
+class FieldTypeValidator(BaseValidator):
+
+    def __init__(
+        self,
+        filename: str,
+        csv_service: CSVService,
+        max_reported_rows: int = MAX_REPORTED_ROWS,
+    ):
+        self.filename = filename
+        self.csv_service = csv_service
+        self.max_reported_rows = max_reported_rows
+
+    def value_scan(self, mapping, schema_class: type[BaseModel]) -> FieldTypeScan:
+        """
+        Needs the raw values of mapped fields that have checks.
+        """
+        return FieldTypeScan(mapping, schema_class, self.max_reported_rows)
+
+    def validate(self, mapping, schema_class: type[BaseModel], scan=None):
+        """
+        Checks mapped values conform to the field types of the schema,
+        column by column instead of building a model per row.
+        NAs are left to MissingValueColumnsValidator.
+        """
+        if scan is None:
+            scan = ValidationPlanner(self.filename, self.csv_service).scan(
+                [self], mapping, schema_class
+            )
+        values = scan.values[self.validation_category()]
+
+        errors = [
+            f"{field} ({column}): {values.counts[field]} invalid value(s), "
+            f"{' / '.join(sorted(values.reasons[field]))}, "
+            f"first rows {values.rows[field]}"
+            for field, column in values.fields.items()
+            if values.counts[field]
+        ]
+        if errors:
+            raise ValidationException("; ".join(errors))
+
+    def validation_category(self) -> str:
+        return "Field types"
@@ -0,0 +1,37 @@
+from .base import BaseValidator, ScanRequirements
+from .exceptions import ValidationException
+from .planner import ValidationPlanner
+from ..csv_service import CSVService
+
+
+class MappedColumnsValidator(BaseValidator):
+
+    def __init__(self, filename: str, csv_service: CSVService):
+        self.filename = filename
+        self.csv_service = csv_service
+
+    def requirements(self, mapping, schema_class):
+        """
+        Needs every mapped source column to be checked against the file header.
+        """
+        return ScanRequirements(
+            columns={source for source in mapping.values() if source}
+        )
+
+    def validate(self, mapping, schema_class, scan=None):
+        """
+        Checks the mapped source columns exist in the csv
+        """
+        if scan is None:
+            scan = ValidationPlanner(self.filename, self.csv_service).scan(
+                [self], mapping, schema_class
+            )
+        missing = (
+            scan.missing_columns & self.requirements(mapping, schema_class).columns
+        )
+
+        if missing:
+            raise ValidationException(f"Not in file: {', '.join(sorted(missing))}")
+
+    def validation_category(self) -> str:
+        return "Mapped columns"
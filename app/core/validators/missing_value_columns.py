@@ -1,43 +1,48 @@
-import pandas as pd
-from .base import BaseValidator
+from .base import BaseValidator, ScanRequirements
 from .exceptions import ValidationException
+from ..schemas.registry import compile_schema
+from .planner import ValidationPlanner
 from ..csv_service import CSVService
 
 
 class MissingValueColumnsValidator(BaseValidator):
 
-    def __init__(self, filename: str, csv_service: CSVService):
+    def __init__(self, filename: str, csv_service: CSVService, parallel: bool = False):
+        """
+        parallel opts into the multi-process scan when no upload profile exists.
+        """
         self.filename = filename
         self.csv_service = csv_service
+        self.parallel = parallel
 
-    def validate(self, mapping, schema_class):
+    def requirements(self, mapping, schema_class):
+        """
+        Needs NA presence for the columns mapped to required fields.
+        """
+        # Fields without a default value, precomputed per schema
+        required_fields = compile_schema(schema_class).required_fields
+        return ScanRequirements(
+            na_columns={
+                mapping[field] for field in required_fields if mapping.get(field)
+            }
+        )
+
+    def validate(self, mapping, schema_class, scan=None):
         """
         Checks if all required fields in the Pydantic schema
         are having non-null values in csv
         """
-        # Get all fields that don't have a default value (required fields)
-        required_fields = {
-            name
-            for name, field in schema_class.model_fields.items()
-            if field.is_required()
-        }
-        df = self.csv_service.get_file_df(self.filename)
-
-        columns_with_na = set()
-
-        for field in required_fields:
-            mapped_column = mapping.get(field)
-            if mapped_column and self._check_na_in_column(df, mapped_column):
-                columns_with_na.add(mapped_column)
+        if scan is None:
+            scan = ValidationPlanner(
+                self.filename, self.csv_service, self.parallel
+            ).scan([self], mapping, schema_class)
+        mapped_columns = self.requirements(mapping, schema_class).na_columns
+        columns_with_na = scan.columns_with_na & mapped_columns
 
         if columns_with_na:
             raise ValidationException(
                 f"NA(s) exist in: {', '.join(sorted(list(columns_with_na)))}"
             )
 
-    @staticmethod
-    def _check_na_in_column(df: pd.DataFrame, column: str) -> bool:
-        return df[column].isna().any()
-
     def validation_category(self) -> str:
         return "NA values"
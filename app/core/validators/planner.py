@@ -0,0 +1,122 @@
+import logging
+from typing import Callable, Dict, List
+from pydantic import BaseModel
+from .base import BaseValidator, ScanResult
+from .exceptions import ValidationException
+from ..metrics import timed
+from ..csv_service import CSVService
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationPlanner:
+    """
+    Runs a set of validators against one upload with a single pass over it.
+    The requirements of every validator are merged first, so adding
+    validators adds work per chunk, not reads of the file.
+    """
+
+    def __init__(self, filename: str, csv_service: CSVService, parallel: bool = False):
+        """
+        parallel lets the scan use worker processes over byte ranges.
+        """
+        self.filename = filename
+        self.csv_service = csv_service
+        self.parallel = parallel
+
+    @timed("validate.scan")
+    def scan(
+        self,
+        validators: List[BaseValidator],
+        mapping: Dict[str, str | None],
+        schema_class: type[BaseModel],
+        progress: Callable[[int], None] | None = None,
+    ) -> ScanResult:
+        """
+        progress, when given, is called with the row count of every chunk read.
+        """
+        requirements = [
+            validator.requirements(mapping, schema_class) for validator in validators
+        ]
+        columns = set().union(*(req.columns for req in requirements))
+        na_columns = set().union(*(req.na_columns for req in requirements))
+        scans = {}
+        for validator in validators:
+            value_scan = validator.value_scan(mapping, schema_class)
+            if value_scan is not None:
+                scans[validator.validation_category()] = value_scan
+        value_columns = set().union(*(scan.columns for scan in scans.values()))
+        result = ScanResult()
+        result.values = scans
+        if not columns and not na_columns and not value_columns:
+            return result
+        if columns:
+            # Raises for a missing or unparseable file rather than scanning nothing
+            header = self.csv_service.get_header(
+                self.csv_service.storage_path / self.filename
+            )
+            result.missing_columns = columns - set(header.columns)
+
+        # The upload profile already knows NA counts, no need to read those columns
+        profile = self.csv_service.get_profile(self.filename)
+        if profile is not None:
+            result.columns_with_na = profile.columns_with_na(na_columns)
+            na_columns = set()
+        if not value_columns:
+            if na_columns:
+                result.columns_with_na = self.csv_service.scan_na_columns(
+                    self.filename, na_columns, parallel=self.parallel
+                )
+            return result
+
+        logger.debug(
+            f"Scanning {self.filename}: {len(na_columns)} NA and "
+            f"{len(value_columns)} value column(s) for {len(scans)} validator(s)"
+        )
+        if self.parallel and self.csv_service.can_scan_ranges(
+            self.filename, na_columns | value_columns, list(scans.values())
+        ):
+            result.columns_with_na |= self.csv_service.scan_ranges(
+                self.filename, na_columns, list(scans.values()), progress
+            )
+            return result
+
+        for chunk in self.csv_service.iter_chunks(
+            self.filename, na_columns | value_columns
+        ):
+            result.columns_with_na |= {
+                col
+                for col in na_columns - result.columns_with_na
+                if col in chunk.columns and chunk[col].isna().any()
+            }
+            for value_scan in scans.values():
+                value_scan.consume(chunk)
+            if progress is not None:
+                progress(len(chunk))
+        return result
+
+    def run(
+        self,
+        validators: List[BaseValidator],
+        mapping: Dict[str, str | None],
+        schema_class: type[BaseModel],
+        progress: Callable[[int], None] | None = None,
+        on_validated: Callable[[str, str | None], None] | None = None,
+    ) -> Dict[str, str]:
+        """
+        Returns the error message of every failing validator by category.
+        on_validated, when given, is called with each category and its error
+        (None when it passed) as soon as that validator has finished.
+        """
+        scan = self.scan(validators, mapping, schema_class, progress)
+        errors = {}
+        for validator in validators:
+            category = validator.validation_category()
+            try:
+                with timed(f"validate.{type(validator).__name__}"):
+                    validator.validate(mapping, schema_class, scan)
+            except ValidationException as e:
+                errors[category] = str(e)
+            if on_validated is not None:
+                on_validated(category, errors.get(category))
+        return errors
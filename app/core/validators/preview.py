@@ -0,0 +1,105 @@
+from typing import Dict, List
+from pydantic import BaseModel
+from .field_types import FieldTypeValidator
+from ..csv_service import CSVService
+from ..metrics import timed
+from ..sampling import Z_95, wilson_interval
+from ..schemas.registry import compile_schema
+
+
+class RateEstimate(BaseModel):
+    rate: float
+    low: float
+    high: float
+    # Counted over the whole file rather than estimated from the sample
+    exact: bool = False
+
+
+class FieldPreview(BaseModel):
+    column: str
+    required: bool
+    na: RateEstimate
+    invalid: RateEstimate | None = None
+    failed_checks: List[str] = []
+
+
+class ValidationPreview(BaseModel):
+    row_count: int | None
+    sample_size: int
+    confidence: float = 0.95
+    missing_required: List[str]
+    # Mapped columns that are not in the file
+    unknown_columns: List[str]
+    fields: Dict[str, FieldPreview]
+
+
+class PreviewValidator:
+    """
+    Approximate counterpart of the /validate checks, run on the row sample
+    drawn at upload time instead of the whole file. NA rates come exact from
+    the upload profile when there is one, type violation rates are estimated
+    with 95% Wilson intervals. Meant for feedback while a mapping is edited,
+    the full scan stays the gate before a mapping is saved.
+    """
+
+    def __init__(self, filename: str, csv_service: CSVService):
+        self.filename = filename
+        self.csv_service = csv_service
+
+    @timed("validate.preview")
+    def run(self, mapping, schema_class) -> ValidationPreview:
+        compiled = compile_schema(schema_class)
+        sample = self.csv_service.get_sample(self.filename)
+        profile = self.csv_service.get_profile(self.filename)
+        row_count = profile.row_count if profile is not None else None
+        n = len(sample)
+
+        values = FieldTypeValidator(self.filename, self.csv_service).value_scan(
+            mapping, schema_class
+        )
+        values.consume(sample)
+        invalid_counts = values.invalid_counts
+        failed_checks = values.failed_checks
+
+        mapped = {field: column for field, column in mapping.items() if column}
+        fields = {}
+        for field, column in mapped.items():
+            if column not in sample.columns:
+                continue
+            fields[field] = FieldPreview(
+                column=column,
+                required=field in compiled.required_fields,
+                na=self._na_estimate(column, sample, profile, row_count),
+                invalid=(
+                    self._estimate(invalid_counts[field], n, row_count)
+                    if field in invalid_counts
+                    else None
+                ),
+                failed_checks=failed_checks.get(field, []),
+            )
+
+        return ValidationPreview(
+            row_count=row_count,
+            sample_size=n,
+            missing_required=sorted(compiled.required_fields - set(mapped)),
+            unknown_columns=sorted(
+                {column for column in mapped.values()} - set(sample.columns)
+            ),
+            fields=fields,
+        )
+
+    def _na_estimate(self, column, sample, profile, row_count) -> RateEstimate:
+        if profile is not None and column in profile.columns and row_count:
+            rate = profile.columns[column].null_count / row_count
+            return RateEstimate(rate=rate, low=rate, high=rate, exact=True)
+        return self._estimate(int(sample[column].isna().sum()), len(sample), row_count)
+
+    @staticmethod
+    def _estimate(count: int, n: int, row_count: int | None) -> RateEstimate:
+        low, high = wilson_interval(count, n, population=row_count, z=Z_95)
+        return RateEstimate(
+            rate=count / n if n else 0.0,
+            low=low,
+            high=high,
+            exact=row_count is not None and n >= row_count,
+        )
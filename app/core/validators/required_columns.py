@@ -1,20 +1,17 @@
 from .base import BaseValidator
 from .exceptions import ValidationException
+from ..schemas.registry import compile_schema
 
 
 class RequiredColumnsValidator(BaseValidator):
 
-    def validate(self, mapping, schema_class):
+    def validate(self, mapping, schema_class, scan=None):
         """
         Checks if all required fields in the Pydantic schema
         are present in the user's mapping
         """
-        # Get all fields that don't have a default value (required fields)
-        required_fields = {
-            name
-            for name, field in schema_class.model_fields.items()
-            if field.is_required()
-        }
+        # Fields without a default value, precomputed per schema
+        required_fields = compile_schema(schema_class).required_fields
         mapped_fields = {
             target for target, source in mapping.items() if source is not None
         }
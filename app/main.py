@@ -1,45 +1,223 @@
+import asyncio
+import json
+import logging
 import os
-from fastapi import FastAPI, UploadFile, File, HTTPException, status, Depends, Form
+import re
+import secrets
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from urllib.parse import quote
+from fastapi import (
+    FastAPI,
+    UploadFile,
+    File,
+    HTTPException,
+    status,
+    Depends,
+    Form,
+    Query,
+    Request,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from app.core.csv_service import CSVService
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.csv_records import read_header
+from app.core.compression import UnsupportedCompression
+from app.core.csv_service import (
+    CSVService,
+    UPLOAD_CHUNK_SIZE,
+    UploadTooLarge,
+    shutdown_scan_pools,
+)
+from app.core.bulk_loader import LoadProgress, SQLiteBulkLoader
+from app.core.exporter import EXPORT_FORMATS, MappedExporter, parquet_available
 from app.core.mapping_engine import MappingEngine
-from app.core.repository import SQLiteRepository
-from app.core.schemas.user_info import UserInfo
+from app.core.metrics import REQUEST_SECONDS, render_metrics, timed
+from app.core.profiling import StackSampler
+from app.core.retention import StorageRetention, UploadPins
+from app.core.repository import DEFAULT_PAGE_SIZE, SQLiteRepository
+from app.core.upload_sessions import (
+    SESSION_CHUNK_SIZE,
+    UPLOADS_DIR,
+    UploadSession,
+    UploadSessionStore,
+)
+from app.core.suggestion_cache import (
+    LRUSuggestionStore,
+    SuggestionCache,
+    suggestion_key,
+)
+from app.core.schemas.registry import DEFAULT_SCHEMA, compile_schema, schema_registry
 from app.core.mapping_strategies.case_insensitive import CaseInsensitiveMappingStrategy
 from app.core.mapping_strategies.fuzzy_match import FuzzyMatchMappingStrategy
-from app.core.validators.exceptions import ValidationException
+from app.core.validation_jobs import (
+    FAILED as JOB_FAILED,
+    FINISHED as JOB_FINISHED,
+    JobSnapshot,
+    QueueFull,
+    ValidationJob,
+    ValidationJobManager,
+    job_key,
+)
 from app.core.validators.required_columns import RequiredColumnsValidator
+from app.core.validators.mapped_columns import MappedColumnsValidator
 from app.core.validators.missing_value_columns import MissingValueColumnsValidator
-from typing import Annotated, Dict
+from app.core.validators.field_types import FieldTypeValidator
+from app.core.validators.base import BaseValidator
+from app.core.validators.planner import ValidationPlanner
+from app.core.validators.preview import PreviewValidator
+from typing import Annotated, AsyncIterator, Dict, List, Literal
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+# gzip and zstd uploads are accepted, this bounds what they inflate to
+MAX_UNCOMPRESSED_SIZE = int(os.getenv("MAX_UNCOMPRESSED_SIZE", 1024 * 1024 * 1024))
+# Keep stored uploads compressed: "gzip" or "zstd" (needs the zstd extra)
+STORAGE_COMPRESSION = os.getenv("STORAGE_COMPRESSION") or None
 STORAGE_PATH = os.getenv("STORAGE_PATH", "data/csv_storage")
 DB_PATH = os.getenv("DB_PATH", "sqlite.db")
+# Database /load writes mapped rows into, kept apart from the app's own
+# database by default, and rows per insert transaction
+LOAD_DB_PATH = os.getenv("LOAD_DB_PATH", "loads.db")
+LOAD_BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", 100_000))
+# Total disk budget for the columnar cache of parsed uploads, 0 disables it
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Worker processes for parallel file scans during validation, 1 disables them
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", os.cpu_count() or 1))
+SUGGESTION_CACHE_SIZE = int(os.getenv("SUGGESTION_CACHE_SIZE", 1024))
+# Also keep suggestions in SQLite so they survive restarts and are shared by workers
+SUGGESTION_CACHE_PERSIST = os.getenv("SUGGESTION_CACHE_PERSIST", "0") == "1"
+
+# Storage retention: total bytes of stored uploads and seconds since an upload
+# was last accessed before it is evicted, 0 disables the limit
+STORAGE_MAX_BYTES = int(os.getenv("STORAGE_MAX_BYTES", 0))
+STORAGE_MAX_AGE = float(os.getenv("STORAGE_MAX_AGE", 0))
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", 60))
+
+# Directory for per-request profiles, profiling is off when unset
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+# With PROFILE_DIR set, requests sending this secret as X-Profile are profiled,
+# none are when it is unset
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+# With PROFILE_DIR set, profile every request instead
+PROFILE_ALL_REQUESTS = os.getenv("PROFILE_ALL_REQUESTS", "0") == "1"
+
+# Saved mappings recommended with each upload
+RECOMMENDED_MAPPINGS = int(os.getenv("RECOMMENDED_MAPPINGS", 3))
+# Upper bound on headers in one batch suggestion request
+MAX_BATCH_HEADERS = int(os.getenv("MAX_BATCH_HEADERS", 1000))
+
+# Background validation jobs: worker threads, jobs waiting or running before
+# new ones are refused, and finished jobs kept for polling
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", 2))
+MAX_PENDING_VALIDATIONS = int(os.getenv("MAX_PENDING_VALIDATIONS", 100))
+FINISHED_VALIDATIONS_KEPT = int(os.getenv("FINISHED_VALIDATIONS_KEPT", 1000))
+# Seconds between job event checks, and between keepalives on a quiet stream
+JOB_EVENTS_INTERVAL = 0.2
+JOB_EVENTS_KEEPALIVE = 15
+
+# Bounds how many uploads can run fuzzy matching at once
+MATCHING_WORKERS = int(os.getenv("MATCHING_WORKERS", 4))
+
+suggestion_store = LRUSuggestionStore(SUGGESTION_CACHE_SIZE)
+matching_executor = ThreadPoolExecutor(
+    max_workers=MATCHING_WORKERS, thread_name_prefix="matching"
+)
+validation_jobs = ValidationJobManager(
+    VALIDATION_WORKERS, MAX_PENDING_VALIDATIONS, FINISHED_VALIDATIONS_KEPT
+)
+# Uploads read by in-flight requests, retention leaves them alone
+upload_pins = UploadPins()
 
 
 # Dependency Providers
 def get_csv_service():
-    return CSVService(STORAGE_PATH)
+    return CSVService(
+        STORAGE_PATH,
+        cache_max_bytes=CACHE_MAX_BYTES,
+        scan_workers=SCAN_WORKERS,
+        compression=STORAGE_COMPRESSION,
+    )
 
 
+@lru_cache
+def get_retention():
+    # One retention thread per process, sharing the pins of its requests
+    return StorageRetention(
+        get_csv_service(),
+        max_bytes=STORAGE_MAX_BYTES,
+        max_age=STORAGE_MAX_AGE,
+        interval=RETENTION_INTERVAL,
+        pins=upload_pins,
+    )
+
+
+@lru_cache
 def get_repository():
+    # One long-lived repository per process, its connections and cache are shared
     return SQLiteRepository(DB_PATH)
 
 
-def get_mapping_engine():
-    return MappingEngine(UserInfo)
+def get_schema(schema_name: Annotated[str, Query(alias="schema")] = DEFAULT_SCHEMA):
+    """
+    Target schema of the request, picked from the registry by ?schema=name.
+    """
+    try:
+        return schema_registry.get(schema_name).schema_class
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown schema {schema_name}.",
+        )
 
 
-def get_schema():
-    return UserInfo
+@lru_cache(maxsize=None)
+def mapping_engine_for(schema: type[BaseModel]) -> MappingEngine:
+    return MappingEngine(schema)
+
+
+def get_mapping_engine(schema: type[BaseModel] = Depends(get_schema)):
+    # Engines hold no per-request state, one per schema is reused
+    return mapping_engine_for(schema)
 
 
 CSVServiceDep = Annotated[CSVService, Depends(get_csv_service)]
 RepoDep = Annotated[SQLiteRepository, Depends(get_repository)]
 EngineDep = Annotated[MappingEngine, Depends(get_mapping_engine)]
 
-app = FastAPI(title="Column Mapper API")
+
+def get_suggestion_cache(repository: RepoDep):
+    return SuggestionCache(
+        suggestion_store, repository if SUGGESTION_CACHE_PERSIST else None
+    )
+
+
+SuggestionCacheDep = Annotated[SuggestionCache, Depends(get_suggestion_cache)]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialise the schema and the saved mapping index once at startup
+    # rather than on the first request
+    get_repository().load_mapping_index()
+    if STORAGE_MAX_BYTES or STORAGE_MAX_AGE:
+        get_retention().start()
+    yield
+    get_retention().stop()
+    matching_executor.shutdown(wait=False, cancel_futures=True)
+    validation_jobs.shutdown()
+    shutdown_scan_pools()
+    get_repository().close()
+
+
+app = FastAPI(title="Column Mapper API", lifespan=lifespan)
 
 # Get the directory where main.py is located
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -49,14 +227,270 @@ static_path = os.path.join(current_dir, "ui")
 app.mount("/ui", StaticFiles(directory=static_path), name="ui")
 
 
+class InstrumentRequests:
+    """
+    Records request latency per route, and profiles the request when asked to.
+    Plain ASGI rather than @app.middleware, which stops at the response
+    headers: streamed bodies (/export, job events) are measured until their
+    last byte is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampler = None
+        if PROFILE_DIR and (
+            PROFILE_ALL_REQUESTS or profile_requested(Headers(scope=scope))
+        ):
+            sampler = StackSampler()
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            REQUEST_SECONDS.observe(
+                f"{scope['method']} {route_path}", time.perf_counter() - start
+            )
+            if sampler is not None:
+                sampler.stop()
+                name = route_path.strip("/").replace("/", "_") or "root"
+                await run_in_threadpool(sampler.dump, PROFILE_DIR, name)
+
+
+def profile_requested(headers: Headers) -> bool:
+    """
+    Profiling costs every thread a sample per interval and writes to disk,
+    so clients can only ask for it with the PROFILE_TOKEN secret.
+    """
+    token = headers.get("x-profile")
+    return bool(PROFILE_TOKEN and token) and secrets.compare_digest(
+        token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8")
+    )
+
+
+app.add_middleware(InstrumentRequests)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Stage latencies, bytes read and written and rows scanned,
+    in Prometheus text format.
+    """
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@timed("upload.suggest")
+def suggest_mapping(
+    source_columns: List[str],
+    apply_mapping_name: str | None,
+    schema: type[BaseModel],
+    repository: SQLiteRepository,
+    mapping_engine: MappingEngine,
+    suggestion_cache: SuggestionCache,
+) -> Dict[str, str | None]:
+    return suggest_mappings(
+        [source_columns],
+        apply_mapping_name,
+        schema,
+        repository,
+        mapping_engine,
+        suggestion_cache,
+    )[0]
+
+
+def suggest_mappings(
+    headers: List[List[str]],
+    apply_mapping_name: str | None,
+    schema: type[BaseModel],
+    repository: SQLiteRepository,
+    mapping_engine: MappingEngine,
+    suggestion_cache: SuggestionCache,
+) -> List[Dict[str, str | None]]:
+    """
+    Suggestions for many headers, in order. Cached ones are served from the
+    suggestion cache and the distinct remaining headers are mapped in one batch.
+    """
+    mapping_strategy = FuzzyMatchMappingStrategy(mapping_engine.compiled)
+    suggestions: Dict[tuple, Dict[str, str | None]] = {}
+    keys = {}
+    for header in dict.fromkeys(tuple(header) for header in headers):
+        keys[header] = suggestion_key(
+            schema, list(header), apply_mapping_name, mapping_strategy
+        )
+        cached = suggestion_cache.get(keys[header], apply_mapping_name)
+        if cached is not None:
+            suggestions[header] = cached
+
+    misses = [header for header in keys if header not in suggestions]
+    if misses:
+        if apply_mapping_name:
+            saved_mapping = repository.get_mapping(apply_mapping_name)
+            if not saved_mapping:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Could not find saved mapping {apply_mapping_name}.",
+                )
+        else:
+            saved_mapping = None
+
+        mapped = mapping_engine.run_batch(
+            [list(header) for header in misses],
+            saved_mapping=saved_mapping,
+            mapping_strategy=mapping_strategy,
+        )
+        for header, suggested_mapping in zip(misses, mapped):
+            suggestion_cache.put(keys[header], apply_mapping_name, suggested_mapping)
+            suggestions[header] = suggested_mapping
+
+    return [dict(suggestions[tuple(header)]) for header in headers]
+
+
+def retrieve_suggestion_error(future):
+    """
+    Done callback for suggestions that may never be awaited, when the upload
+    fails or completes first. Reads their error so it is not left unretrieved.
+    """
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug(f"Discarded suggestion failed: {future.exception()!r}")
+
+
+async def ingest_upload(
+    chunks: AsyncIterator[bytes],
+    file_name: str,
+    has_header: bool,
+    apply_mapping_name: str | None,
+    csv_service: CSVService,
+    repository: SQLiteRepository,
+    mapping_engine: MappingEngine,
+    suggestion_cache: SuggestionCache,
+    schema: type[BaseModel],
+) -> dict:
+    """
+    Streams chunks to storage without blocking the event loop.
+    Matching starts on the bounded matching executor as soon as the header
+    has been written, and overlaps with the rest of the body being stored.
+    """
+    loop = asyncio.get_running_loop()
+    suggestion = None
+    writer = csv_service.open_upload(file_name, has_header, MAX_UNCOMPRESSED_SIZE)
+    received = 0
+    buffer = bytearray()
+
+    def start_suggestion():
+        nonlocal suggestion
+        if suggestion is None and writer.columns:
+            suggestion = loop.run_in_executor(
+                matching_executor,
+                partial(
+                    suggest_mapping,
+                    writer.columns,
+                    apply_mapping_name,
+                    schema,
+                    repository,
+                    mapping_engine,
+                    suggestion_cache,
+                ),
+            )
+            suggestion.add_done_callback(retrieve_suggestion_error)
+
+    async def flush():
+        await run_in_threadpool(writer.write, bytes(buffer))
+        buffer.clear()
+        start_suggestion()
+
+    try:
+        with timed("upload.store"):
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail="File size exceeds 100MB limit.",
+                    )
+                buffer += chunk
+                if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                    await flush()
+            await flush()
+            saved_path = await run_in_threadpool(writer.close)
+        # A body without a newline only reveals its columns once closed
+        start_suggestion()
+    except Exception as e:
+        writer.abort()
+        if suggestion is not None:
+            suggestion.cancel()
+        raise upload_error(e)
+
+    source_columns = writer.columns
+    if not source_columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not parse columns. Please check if the file is a valid CSV.",
+        )
+
+    return upload_response(
+        file_name, saved_path, source_columns, await suggestion, schema, repository
+    )
+
+
+def upload_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, UploadTooLarge):
+        return HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e)
+        )
+    if isinstance(e, UnsupportedCompression):
+        return HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Failed to save file: {str(e)}",
+    )
+
+
+def upload_response(
+    file_name: str,
+    saved_path,
+    source_columns: List[str],
+    suggested_mapping: Dict[str, str | None],
+    schema: type[BaseModel],
+    repository: SQLiteRepository,
+) -> dict:
+    return {
+        "filename": file_name,
+        "saved_filename": os.path.basename(saved_path),
+        "source_columns": source_columns,
+        "target_fields": list(schema.model_fields.keys()),
+        "suggested_mapping": suggested_mapping,
+        "recommended_mappings": [
+            candidate.model_dump()
+            for candidate in repository.recommend_mappings(
+                source_columns, RECOMMENDED_MAPPINGS
+            )
+        ],
+    }
+
+
 @app.post("/upload", status_code=status.HTTP_201_CREATED)
-def upload_file(
+async def upload_file(
     file: UploadFile = File(...),
     has_header: bool = Form(True),
     apply_mapping_name: str = Form(None),
     csv_service: CSVServiceDep = None,
     repository: RepoDep = None,
     mapping_engine: EngineDep = None,
+    suggestion_cache: SuggestionCacheDep = None,
     schema: type[BaseModel] = Depends(get_schema),
 ):
     # File size validation
@@ -66,62 +500,424 @@ def upload_file(
             detail="File size exceeds 100MB limit.",
         )
 
-    # Save file to storage
+    async def file_chunks():
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    return await ingest_upload(
+        file_chunks(),
+        file.filename,
+        has_header,
+        apply_mapping_name,
+        csv_service,
+        repository,
+        mapping_engine,
+        suggestion_cache,
+        schema,
+    )
+
+
+@app.post("/upload/stream", status_code=status.HTTP_201_CREATED)
+async def upload_stream(
+    request: Request,
+    filename: str,
+    has_header: bool = True,
+    apply_mapping_name: str | None = None,
+    csv_service: CSVServiceDep = None,
+    repository: RepoDep = None,
+    mapping_engine: EngineDep = None,
+    suggestion_cache: SuggestionCacheDep = None,
+    schema: type[BaseModel] = Depends(get_schema),
+):
+    """
+    Takes the raw CSV as the request body, so it is written to storage
+    as it arrives instead of being spooled as a multipart file first.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="File size exceeds 100MB limit.",
+        )
+
+    return await ingest_upload(
+        request.stream(),
+        filename,
+        has_header,
+        apply_mapping_name,
+        csv_service,
+        repository,
+        mapping_engine,
+        suggestion_cache,
+        schema,
+    )
+
+
+def get_upload_sessions(csv_service: CSVServiceDep):
+    return UploadSessionStore(csv_service.storage_path / UPLOADS_DIR)
+
+
+UploadSessionsDep = Annotated[UploadSessionStore, Depends(get_upload_sessions)]
+
+
+def get_upload_session(upload_id: str, sessions: UploadSessionsDep) -> UploadSession:
     try:
-        saved_path = csv_service.save_upload(
-            file.filename, file.file, has_header=has_header
+        return sessions.get(upload_id)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find upload {upload_id}.",
         )
-    except Exception as e:
+
+
+class UploadSessionRequest(BaseModel):
+    filename: str
+    size: int
+    chunk_size: int = SESSION_CHUNK_SIZE
+    has_header: bool = True
+    apply_mapping_name: str | None = None
+
+
+def upload_session_status(session: UploadSession) -> dict:
+    header = session.header
+    return {
+        "upload_id": session.info.upload_id,
+        "filename": session.info.filename,
+        "size": session.info.size,
+        "chunk_size": session.info.chunk_size,
+        "chunk_count": session.info.chunk_count,
+        "received_chunks": session.received_chunks(),
+        "missing_chunks": session.missing_chunks(),
+        "source_columns": header.columns if header else None,
+        "suggested_mapping": session.suggestion,
+    }
+
+
+@app.post("/uploads", status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    request: UploadSessionRequest,
+    sessions: UploadSessionsDep,
+    schema: type[BaseModel] = Depends(get_schema),
+):
+    """
+    Starts a resumable upload. The client then PUTs the numbered chunks,
+    in any order and possibly in parallel, and finalises with /complete.
+    """
+    if request.size > MAX_FILE_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save file: {str(e)}",
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="File size exceeds 100MB limit.",
+        )
+    try:
+        session = sessions.create(
+            request.filename,
+            request.size,
+            compile_schema(schema).name,
+            chunk_size=request.chunk_size,
+            has_header=request.has_header,
+            apply_mapping_name=request.apply_mapping_name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return upload_session_status(session)
+
+
+@app.get("/uploads/{upload_id}")
+def get_upload_session_status(
+    session: Annotated[UploadSession, Depends(get_upload_session)],
+):
+    """
+    Which chunks were received, to resume an interrupted upload.
+    """
+    return upload_session_status(session)
+
+
+@app.put("/uploads/{upload_id}/chunks/{index}")
+async def put_upload_chunk(
+    index: int,
+    request: Request,
+    session: Annotated[UploadSession, Depends(get_upload_session)],
+    repository: RepoDep,
+    suggestion_cache: SuggestionCacheDep,
+):
+    """
+    Writes the body straight to the chunk's offset in the upload.
+    Once chunk 0 holds the header, mapping suggestion starts in the
+    background while the remaining chunks arrive.
+    """
+    try:
+        writer = session.open_chunk(index)
+    except IndexError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        async for data in request.stream():
+            await run_in_threadpool(writer.write, data)
+    except ValueError as e:
+        writer.abort()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except BaseException:
+        writer.abort()
+        raise
+    try:
+        # Decompresses the start of chunk 0 to find the header
+        header = await run_in_threadpool(writer.close)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    upload_id = session.info.upload_id
+    if header is not None and session.suggestion is None:
+        schema = schema_registry.get(session.info.schema_name).schema_class
+        matching_executor.submit(
+            suggest_for_session,
+            session,
+            header.columns,
+            session.info.apply_mapping_name,
+            schema,
+            repository,
+            mapping_engine_for(schema),
+            suggestion_cache,
+        ).add_done_callback(retrieve_suggestion_error)
+    return {
+        "upload_id": upload_id,
+        "index": index,
+        "source_columns": header.columns if header else None,
+    }
+
+
+def suggest_for_session(session: UploadSession, source_columns: List[str], *args):
+    """
+    Suggests a mapping while the chunks of a resumable upload arrive.
+    Takes the remaining arguments of suggest_mapping.
+    """
+    suggestion = suggest_mapping(source_columns, *args)
+    try:
+        session.set_suggestion(suggestion)
+    except FileNotFoundError:
+        # Completed, deleted or expired meanwhile
+        pass
+
+
+@app.post("/uploads/{upload_id}/complete", status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+    upload_id: str,
+    sessions: UploadSessionsDep,
+    csv_service: CSVServiceDep,
+    repository: RepoDep,
+    suggestion_cache: SuggestionCacheDep,
+):
+    """
+    Moves the assembled upload into storage, with the same response as /upload.
+    """
+    session = get_upload_session(upload_id, sessions)
+    schema = schema_registry.get(session.info.schema_name).schema_class
+    # Read before the session directory goes with take_data
+    suggestion = session.suggestion
+    try:
+        data_path = sessions.take_data(upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find upload {upload_id}.",
         )
 
-    # Map columns
-    source_columns = csv_service.get_columns(saved_path, has_header=has_header)
+    try:
+        with timed("upload.store"):
+            saved_path = await run_in_threadpool(
+                csv_service.store_file,
+                session.info.filename,
+                data_path,
+                session.info.has_header,
+                MAX_UNCOMPRESSED_SIZE,
+            )
+    except Exception as e:
+        data_path.unlink(missing_ok=True)
+        raise upload_error(e)
 
+    source_columns = csv_service.get_columns(saved_path, session.info.has_header)
     if not source_columns:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not parse columns. Please check if the file is a valid CSV.",
         )
+    if suggestion is None:
+        # First chunk too short to hold the header, or suggestion still running
+        suggestion = await asyncio.wrap_future(
+            matching_executor.submit(
+                suggest_mapping,
+                source_columns,
+                session.info.apply_mapping_name,
+                schema,
+                repository,
+                mapping_engine_for(schema),
+                suggestion_cache,
+            )
+        )
+    return upload_response(
+        session.info.filename,
+        saved_path,
+        source_columns,
+        suggestion,
+        schema,
+        repository,
+    )
+
+
+@app.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(upload_id: str, sessions: UploadSessionsDep):
+    get_upload_session(upload_id, sessions)
+    sessions.delete(upload_id)
+
+
+class BatchSuggestionRequest(BaseModel):
+    headers: List[List[str]]
+    apply_mapping_name: str | None = None
+
+
+def check_batch_size(count: int):
+    if count > MAX_BATCH_HEADERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {MAX_BATCH_HEADERS} headers per batch.",
+        )
+
+
+@app.post("/suggestions/batch")
+def suggest_batch(
+    request: BatchSuggestionRequest,
+    repository: RepoDep,
+    mapping_engine: EngineDep,
+    suggestion_cache: SuggestionCacheDep,
+    schema: type[BaseModel] = Depends(get_schema),
+):
+    """
+    Suggested mappings for many header lists in one call, in request order.
+    Nothing is stored, identical headers are only mapped once.
+    """
+    check_batch_size(len(request.headers))
+    suggestions = suggest_mappings(
+        request.headers,
+        request.apply_mapping_name,
+        schema,
+        repository,
+        mapping_engine,
+        suggestion_cache,
+    )
+    return {
+        "target_fields": list(schema.model_fields.keys()),
+        "suggestions": [
+            {"source_columns": header, "suggested_mapping": suggestion}
+            for header, suggestion in zip(request.headers, suggestions)
+        ],
+    }
+
 
-    if apply_mapping_name:
-        saved_mapping = repository.get_mapping(apply_mapping_name)
-        if not saved_mapping:
+@app.post("/suggestions/batch/files")
+def suggest_batch_files(
+    files: List[UploadFile] = File(...),
+    has_header: bool = Form(True),
+    apply_mapping_name: str = Form(None),
+    repository: RepoDep = None,
+    mapping_engine: EngineDep = None,
+    suggestion_cache: SuggestionCacheDep = None,
+    schema: type[BaseModel] = Depends(get_schema),
+):
+    """
+    Same as /suggestions/batch for header-only (or any) CSV files.
+    Only the first record of each file is read, and none are stored.
+    """
+    check_batch_size(len(files))
+    headers = []
+    for file in files:
+        try:
+            headers.append(read_header(file.file, has_header=has_header).columns)
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Could not find saved mapping {apply_mapping_name}.",
+                detail=f"Could not parse columns of {file.filename}: {e}",
             )
-    else:
-        saved_mapping = None
 
-    suggested_mapping = mapping_engine.run(
-        source_columns=source_columns,
-        saved_mapping=saved_mapping,
-        mapping_strategy=FuzzyMatchMappingStrategy(),
+    suggestions = suggest_mappings(
+        headers,
+        apply_mapping_name,
+        schema,
+        repository,
+        mapping_engine,
+        suggestion_cache,
     )
-
     return {
-        "filename": file.filename,
-        "saved_filename": os.path.basename(saved_path),
-        "source_columns": source_columns,
         "target_fields": list(schema.model_fields.keys()),
-        "suggested_mapping": suggested_mapping,
+        "suggestions": [
+            {
+                "filename": file.filename,
+                "source_columns": header,
+                "suggested_mapping": suggestion,
+            }
+            for file, header, suggestion in zip(files, headers, suggestions)
+        ],
+    }
+
+
+@app.get("/storage")
+def storage_stats(retention: Annotated[StorageRetention, Depends(get_retention)]):
+    """
+    Usage and reclaim statistics of storage retention, as of its last pass.
+    """
+    return {
+        "max_bytes": retention.max_bytes,
+        "max_age": retention.max_age,
+        **retention.stats.model_dump(),
+    }
+
+
+@app.get("/schemas")
+def list_schemas():
+    """
+    Target schemas that requests can select with ?schema=name.
+    """
+    return {
+        "default": DEFAULT_SCHEMA,
+        "schemas": [
+            {
+                "name": name,
+                "fields": schema_registry.get(name).fields,
+                "required_fields": sorted(schema_registry.get(name).required_fields),
+            }
+            for name in schema_registry.names()
+        ],
     }
 
 
 @app.get("/mappings")
-def list_mappings(repository: RepoDep):
-    """Returns all saved mappings for the UI dropdown."""
+def list_mappings(
+    repository: RepoDep,
+    prefix: str | None = None,
+    sort: Literal["name", "created_at"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+):
+    """
+    One page of saved mappings for the UI, filtered by name prefix as the user types.
+    Pass next_cursor back as cursor to fetch the following page.
+    """
     try:
-        mappings = repository.list_mappings()
-        return {"mappings": mappings}
+        page = repository.list_mappings(
+            prefix=prefix,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}",
         )
+    return page.model_dump()
 
 
 class ValidationRequest(BaseModel):
@@ -129,33 +925,98 @@ class ValidationRequest(BaseModel):
     mapping: Dict[str, str | None]
 
 
+def require_stored_file(filename: str, csv_service: CSVService):
+    if (
+        os.path.basename(filename) != filename
+        or not (csv_service.storage_path / filename).is_file()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File {filename} not found.",
+        )
+
+
+def validators_for(filename: str, csv_service: CSVService) -> List[BaseValidator]:
+    return [
+        RequiredColumnsValidator(),
+        MappedColumnsValidator(filename=filename, csv_service=csv_service),
+        MissingValueColumnsValidator(
+            filename=filename, csv_service=csv_service, parallel=True
+        ),
+        FieldTypeValidator(filename=filename, csv_service=csv_service),
+    ]
+
+
+def run_validation(
+    filename: str,
+    mapping: Dict[str, str | None],
+    schema: type[BaseModel],
+    csv_service: CSVService,
+    job: ValidationJob | None = None,
+) -> Dict[str, str]:
+    """
+    Runs every validator over a stored upload, returns the errors by category.
+    With a job, progress and per-validator results are reported to it.
+    """
+    validators = validators_for(filename, csv_service)
+    # One pass over the file serves every validator
+    planner = ValidationPlanner(filename, csv_service, parallel=True)
+    with upload_pins.pin(filename):
+        csv_service.touch(filename)
+        return planner.run(
+            validators,
+            mapping,
+            schema,
+            progress=job.add_rows if job else None,
+            on_validated=job.validated if job else None,
+        )
+
+
+def run_pinned_validation(
+    filename: str,
+    mapping: Dict[str, str | None],
+    schema: type[BaseModel],
+    csv_service: CSVService,
+    job: ValidationJob,
+) -> Dict[str, str]:
+    """
+    Job work for an upload pinned when the job was submitted, so retention
+    cannot evict it while the job waits in the queue.
+    """
+    try:
+        return run_validation(filename, mapping, schema, csv_service, job)
+    finally:
+        upload_pins.release(filename)
+
+
+def validation_detail(errors: Dict[str, str]) -> str:
+    return "\n".join([f"{cat}: {error_msg}" for cat, error_msg in errors.items()])
+
+
 @app.post("/validate")
 def validate_mapping(
     request: ValidationRequest,
+    background: bool = False,
     schema: type[BaseModel] = Depends(get_schema),
     csv_service: CSVService = Depends(get_csv_service),
 ):
-    validators = [
-        RequiredColumnsValidator(),
-        MissingValueColumnsValidator(
-            filename=request.filename, csv_service=csv_service
-        ),
-    ]
-    errors = {}
-
-    for validator in validators:
-        try:
-            validator.validate(request.mapping, schema)
-        except ValidationException as e:
-            errors[validator.validation_category()] = str(e)
+    """
+    Validates in the request, or with background=true as a job on the
+    validation pool: returns 202 with the job to poll or stream events from.
+    """
+    require_stored_file(request.filename, csv_service)
+    if background:
+        return submit_validation_job(request, schema, csv_service)
 
-    if errors:
+    try:
+        errors = run_validation(request.filename, request.mapping, schema, csv_service)
+    except ValueError as e:
         raise HTTPException(
-            status_code=400,
-            detail="\n".join(
-                [f"{cat}: {error_msg}" for cat, error_msg in errors.items()]
-            ),
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read {request.filename}: {e}",
         )
+    if errors:
+        raise HTTPException(status_code=400, detail=validation_detail(errors))
 
     return {
         "status": "success",
@@ -164,13 +1025,143 @@ def validate_mapping(
     }
 
 
+def submit_validation_job(
+    request: ValidationRequest, schema: type[BaseModel], csv_service: CSVService
+) -> JSONResponse:
+    content = csv_service.content_key(request.filename)
+    if content == request.filename:
+        # Placed in storage directly rather than uploaded, so not content
+        # addressed: told apart by location and size instead
+        path = (csv_service.storage_path / request.filename).resolve()
+        content = f"{path}:{path.stat().st_size}"
+    key = job_key(content, request.mapping, schema)
+    profile = csv_service.get_profile(request.filename)
+    # Released by the job, or right away when an existing job is reused
+    upload_pins.acquire(request.filename)
+    csv_service.touch(request.filename)
+    try:
+        job, created = validation_jobs.submit(
+            key,
+            request.filename,
+            [
+                validator.validation_category()
+                for validator in validators_for(request.filename, csv_service)
+            ],
+            partial(
+                run_pinned_validation,
+                request.filename,
+                request.mapping,
+                schema,
+                csv_service,
+            ),
+            total_rows=profile.row_count if profile is not None else None,
+        )
+    except QueueFull as e:
+        upload_pins.release(request.filename)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e)
+        )
+    if not created:
+        upload_pins.release(request.filename)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={**validation_job_status(job.snapshot()), "created": created},
+        headers={"Location": f"/validate/jobs/{job.job_id}"},
+    )
+
+
+def get_validation_job(job_id: str) -> ValidationJob:
+    try:
+        return validation_jobs.get(job_id)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find validation job {job_id}.",
+        )
+
+
+def validation_job_status(snapshot: JobSnapshot) -> dict:
+    result = snapshot.model_dump()
+    if snapshot.status == JOB_FAILED:
+        result["detail"] = validation_detail(snapshot.errors)
+    return result
+
+
+@app.get("/validate/jobs/{job_id}")
+def poll_validation_job(job: Annotated[ValidationJob, Depends(get_validation_job)]):
+    return validation_job_status(job.snapshot())
+
+
+@app.get("/validate/jobs/{job_id}/events")
+async def stream_validation_job(
+    job: Annotated[ValidationJob, Depends(get_validation_job)],
+):
+    """
+    Server-Sent Events: a progress event on every change (rows scanned,
+    validators done), then one result event once the job has finished.
+    """
+
+    async def events():
+        version = -1
+        idle = 0.0
+        while True:
+            snapshot = job.snapshot()
+            if snapshot.version != version:
+                version = snapshot.version
+                event = "result" if snapshot.status in JOB_FINISHED else "progress"
+                data = json.dumps(validation_job_status(snapshot))
+                yield f"event: {event}\nid: {version}\ndata: {data}\n\n"
+                if event == "result":
+                    return
+                idle = 0.0
+            elif idle >= JOB_EVENTS_KEEPALIVE:
+                # Keeps proxies from closing a quiet stream
+                yield ": keepalive\n\n"
+                idle = 0.0
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+            idle += JOB_EVENTS_INTERVAL
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/validate/preview")
+def preview_validation(
+    request: ValidationRequest,
+    schema: type[BaseModel] = Depends(get_schema),
+    csv_service: CSVService = Depends(get_csv_service),
+):
+    """
+    Approximate NA and type violation rates, with 95% confidence bounds,
+    from the row sample drawn at upload time. Answers in milliseconds
+    whatever the file size, /validate remains the exact check.
+    """
+    require_stored_file(request.filename, csv_service)
+    with upload_pins.pin(request.filename):
+        csv_service.touch(request.filename)
+        try:
+            preview = PreviewValidator(request.filename, csv_service).run(
+                request.mapping, schema
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return preview.model_dump()
+
+
 class SaveMappingRequest(BaseModel):
     mapping_name: str
     mapping: Dict[str, str | None]
 
 
 @app.post("/process")
-def process_and_save(request: SaveMappingRequest, repository: RepoDep = None):
+def process_and_save(
+    request: SaveMappingRequest,
+    repository: RepoDep = None,
+    suggestion_cache: SuggestionCacheDep = None,
+):
     # Unique name check
     if repository.get_mapping(request.mapping_name):
         raise HTTPException(
@@ -180,5 +1171,145 @@ def process_and_save(request: SaveMappingRequest, repository: RepoDep = None):
 
     # Save the mapping
     repository.save_mapping(request.mapping_name, request.mapping)
+    suggestion_cache.invalidate_mapping(request.mapping_name)
 
     return {"mapping_name": request.mapping_name}
+
+
+class MappedFileRequest(BaseModel):
+    filename: str
+    # Either an explicit mapping or the name of a saved one
+    mapping: Dict[str, str | None] | None = None
+    mapping_name: str | None = None
+
+
+class ExportRequest(MappedFileRequest):
+    format: Literal["csv", "ndjson", "parquet"] = "csv"
+
+
+def resolve_mapped_file(
+    request: MappedFileRequest,
+    csv_service: CSVService,
+    repository: SQLiteRepository,
+) -> Dict[str, str | None]:
+    """
+    Checks the stored upload exists and returns the mapping to apply to it.
+    Counts as an access for retention.
+    """
+    require_stored_file(request.filename, csv_service)
+    csv_service.touch(request.filename)
+
+    mapping = request.mapping
+    if request.mapping_name:
+        mapping = repository.get_mapping(request.mapping_name)
+        if not mapping:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not find saved mapping {request.mapping_name}.",
+            )
+    if not mapping or not any(mapping.values()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A mapping with at least one mapped column is required.",
+        )
+    return mapping
+
+
+# Characters left out of the plain filename="..." fallback
+_UNSAFE_FILENAME = re.compile(r'[^\x20-\x7e]|["\\]')
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Attachment header for a name taken from the stored file, which may hold
+    quotes, line breaks or non-ASCII text. Clients that understand
+    filename* get the exact name, the others a sanitised ASCII one.
+    """
+    fallback = _UNSAFE_FILENAME.sub("_", filename)
+    return (
+        f'attachment; filename="{fallback}"; '
+        f"filename*=UTF-8''{quote(filename, safe='')}"
+    )
+
+
+@app.post("/export")
+def export_mapped(
+    request: ExportRequest,
+    csv_service: CSVServiceDep,
+    repository: RepoDep,
+):
+    """
+    Streams a stored upload with the mapping applied: mapped source columns
+    renamed to their target fields, everything else dropped.
+    The file is read chunk by chunk, so memory use does not grow with its size.
+    """
+    mapping = resolve_mapped_file(request, csv_service, repository)
+    if request.format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow to be installed.",
+        )
+
+    exporter = MappedExporter(csv_service, request.filename, mapping)
+    missing = exporter.missing_columns()
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Mapped columns not in file: {', '.join(missing)}",
+        )
+
+    stem = os.path.splitext(request.filename)[0]
+    return StreamingResponse(
+        upload_pins.hold(request.filename, exporter.iter_format(request.format)),
+        media_type=EXPORT_FORMATS[request.format],
+        headers={
+            "Content-Disposition": content_disposition(f"{stem}.{request.format}")
+        },
+    )
+
+
+class LoadRequest(MappedFileRequest):
+    # Defaults to the schema name in snake_case
+    table: str | None = None
+    replace: bool = False
+
+
+@app.post("/load")
+def load_mapped(
+    request: LoadRequest,
+    csv_service: CSVServiceDep,
+    repository: RepoDep,
+    schema: type[BaseModel] = Depends(get_schema),
+):
+    """
+    Inserts the mapped rows of a stored upload into a SQLite table
+    built from the target schema.
+    """
+    mapping = resolve_mapped_file(request, csv_service, repository)
+    try:
+        loader = SQLiteBulkLoader(
+            LOAD_DB_PATH,
+            schema,
+            table=request.table,
+            batch_size=LOAD_BATCH_SIZE,
+            owns_db=os.path.abspath(LOAD_DB_PATH) != os.path.abspath(DB_PATH),
+        )
+        with upload_pins.pin(request.filename):
+            result = loader.load(
+                csv_service,
+                request.filename,
+                mapping,
+                replace=request.replace,
+                progress=log_load_progress,
+            )
+    except (ValueError, sqlite3.IntegrityError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return result.model_dump()
+
+
+def log_load_progress(progress: LoadProgress):
+    total = f"/{progress.total_rows}" if progress.total_rows is not None else ""
+    logger.info(
+        f"Loaded {progress.rows_loaded}{total} rows "
+        f"({progress.rows_per_second:.0f} rows/s)"
+    )
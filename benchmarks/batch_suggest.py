@@ -0,0 +1,100 @@
+"""
+Compares N single suggestions against one batch, both in-process
+(MappingEngine.run vs run_batch) and over HTTP (N /upload vs one
+/suggestions/batch). Headers are noisy variants with some repeats.
+
+Run from the repository root:
+    python -m benchmarks.batch_suggest
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from fastapi.testclient import TestClient
+from app.core.csv_service import CSVService
+from app.core.mapping_engine import MappingEngine
+from app.core.mapping_strategies.fuzzy_match import FuzzyMatchMappingStrategy
+from app.core.repository import SQLiteRepository
+from app.core.schemas.user_info import UserInfo
+from app.core.suggestion_cache import LRUSuggestionStore, SuggestionCache
+from app.main import (
+    app,
+    get_csv_service,
+    get_repository,
+    get_schema,
+    get_suggestion_cache,
+)
+from .synthetic import make_header
+
+
+def make_headers(count: int, columns: int, distinct: int, seed: int):
+    rng = random.Random(seed)
+    pool = [make_header(columns, 0.7, rng) for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--headers", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--distinct", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    headers = make_headers(args.headers, args.columns, args.distinct, args.seed)
+    engine = MappingEngine(UserInfo)
+    strategy = FuzzyMatchMappingStrategy(engine.compiled)
+
+    single = timed(
+        lambda: [engine.run(header, mapping_strategy=strategy) for header in headers]
+    )
+    batch = timed(lambda: engine.run_batch(headers, mapping_strategy=strategy))
+    print(f"{len(headers)} headers ({args.distinct} distinct), {args.columns} columns")
+    print(f"engine   single {single * 1000:>9.1f} ms  batch {batch * 1000:>8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_service = CSVService(str(Path(workdir) / "storage"))
+        repository = SQLiteRepository(str(Path(workdir) / "bench.db"))
+        app.dependency_overrides[get_csv_service] = lambda: csv_service
+        app.dependency_overrides[get_repository] = lambda: repository
+        app.dependency_overrides[get_schema] = lambda: UserInfo
+        # A fresh cache per request so neither side is served from memory
+        app.dependency_overrides[get_suggestion_cache] = lambda: SuggestionCache(
+            LRUSuggestionStore()
+        )
+        client = TestClient(app)
+        try:
+            uploads = [
+                (",".join(header) + "\n1\n").encode("utf-8") for header in headers
+            ]
+            single = timed(
+                lambda: [
+                    client.post(
+                        "/upload", files={"file": ("h.csv", BytesIO(body))}
+                    ).raise_for_status()
+                    for body in uploads
+                ]
+            )
+            batch = timed(
+                lambda: client.post(
+                    "/suggestions/batch", json={"headers": headers}
+                ).raise_for_status()
+            )
+        finally:
+            app.dependency_overrides = {}
+    print(f"http     single {single * 1000:>9.1f} ms  batch {batch * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures SQLiteBulkLoader throughput on a synthetic upload
+(about 100MB with the defaults) and reports rows/s and MB/s.
+
+Run from the repository root:
+    python -m benchmarks.bulk_load
+    python -m benchmarks.bulk_load --batch-sizes 10000 100000 --synchronous NORMAL
+"""
+
+import argparse
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from app.core.bulk_loader import LOAD_PRAGMAS, SQLiteBulkLoader
+from app.core.csv_service import CSVService
+from app.core.schemas.user_info import UserInfo
+from .synthetic import generate_csv
+
+MAPPING = {"username": "username", "email": "email", "phone": "phone"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=12)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--synchronous", default=LOAD_PRAGMAS["synchronous"])
+    args = parser.parse_args()
+
+    content = generate_csv(args.rows, args.columns, na_density=0.0)
+    size_mb = len(content) / 1024 / 1024
+    print(f"{args.rows} rows, {args.columns} columns, {size_mb:.1f} MB")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_service = CSVService(str(Path(workdir) / "storage"))
+        filename = csv_service.save_upload("bench.csv", BytesIO(content)).name
+        pragmas = dict(LOAD_PRAGMAS, synchronous=args.synchronous)
+
+        print(f"{'batch':>8} {'seconds':>8} {'rows/s':>10} {'MB/s':>7}")
+        for batch_size in args.batch_sizes:
+            loader = SQLiteBulkLoader(
+                str(Path(workdir) / "bench.db"),
+                UserInfo,
+                batch_size=batch_size,
+                pragmas=pragmas,
+            )
+            result = loader.load(csv_service, filename, MAPPING, replace=True)
+            print(
+                f"{batch_size:>8} {result.elapsed_seconds:>8.2f}"
+                f" {result.rows_per_second:>10.0f}"
+                f" {size_mb / result.elapsed_seconds:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compares the batched n-gram scorer against the per-target difflib matching
+it replaced in FuzzyMatchMappingStrategy.
+
+Run from the repository root:
+    python -m benchmarks.fuzzy_match
+"""
+
+import argparse
+import random
+import string
+import time
+from difflib import get_close_matches
+from typing import Dict, List
+from app.core.mapping_strategies.fuzzy_match import CUTOFF
+from app.core.mapping_strategies.ngram_scorer import NgramScorer
+
+WORDS = [
+    "user",
+    "name",
+    "email",
+    "phone",
+    "address",
+    "city",
+    "country",
+    "zip",
+    "first",
+    "last",
+    "birth",
+    "date",
+    "account",
+    "id",
+    "created",
+    "updated",
+    "status",
+    "company",
+    "title",
+    "mobile",
+    "home",
+    "work",
+    "code",
+    "number",
+]
+
+
+def make_names(count: int, rng: random.Random) -> List[str]:
+    names = set()
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        names.add(
+            "_".join(words) + (str(rng.randint(0, 99)) if rng.random() < 0.3 else "")
+        )
+    return sorted(names)
+
+
+def add_noise(name: str, rng: random.Random) -> str:
+    """Mimics export naming drift: casing, separators and the odd typo."""
+    name = rng.choice([str.lower, str.upper, str.title])(name)
+    name = name.replace("_", rng.choice(["_", "-", " ", ""]))
+    if len(name) > 3 and rng.random() < 0.3:
+        i = rng.randrange(len(name))
+        name = name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1 :]
+    return name
+
+
+def difflib_matches(
+    targets: List[str], source_columns: List[str]
+) -> Dict[str, str | None]:
+    result = {}
+    for target in targets:
+        matches = get_close_matches(target, source_columns, n=1, cutoff=CUTOFF)
+        result[target] = matches[0] if matches else None
+    return result
+
+
+def correct_matches(result: Dict[str, str | None], expected: Dict[str, str]) -> int:
+    return sum(result[target] == source for target, source in expected.items())
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    targets = make_names(args.targets, rng)
+    # Half of the targets appear (noisily) in the header, the rest is filler
+    expected = {target: add_noise(target, rng) for target in targets[::2]}
+    source_columns = list(expected.values())
+    source_columns += make_names(args.columns - len(source_columns), rng)
+    rng.shuffle(source_columns)
+
+    difflib_time = timed(lambda: difflib_matches(targets, source_columns), args.repeat)
+    ngram_time = timed(
+        lambda: NgramScorer(targets).best_matches(source_columns, CUTOFF), args.repeat
+    )
+    difflib_correct = correct_matches(
+        difflib_matches(targets, source_columns), expected
+    )
+    ngram_correct = correct_matches(
+        NgramScorer(targets).best_matches(source_columns, CUTOFF), expected
+    )
+
+    print(f"{len(targets)} targets x {len(source_columns)} source columns")
+    print(
+        f"difflib: {difflib_time * 1000:9.2f} ms, {difflib_correct}/{len(expected)} correct"
+    )
+    print(
+        f"n-gram:  {ngram_time * 1000:9.2f} ms, {ngram_correct}/{len(expected)} correct"
+    )
+    print(f"speedup: {difflib_time / ngram_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
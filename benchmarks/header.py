@@ -0,0 +1,53 @@
+"""
+Compares header extraction with pandas (the previous get_columns path)
+against the stdlib csv header reader, on increasingly wide headers.
+
+Run from the repository root:
+    python -m benchmarks.header
+"""
+
+import argparse
+import time
+from io import BytesIO
+import pandas as pd
+from app.core.csv_records import read_header
+
+
+def make_csv(columns: int, rows: int) -> bytes:
+    header = ",".join(f"column name {i}" for i in range(columns))
+    row = ",".join(str(i) for i in range(columns))
+    return (header + "\n" + "\n".join([row] * rows) + "\n").encode("utf-8")
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--widths", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'columns':>8} {'pandas ms':>10} {'csv ms':>8} {'speedup':>8}")
+    for width in args.widths:
+        content = make_csv(width, args.rows)
+        pandas_time = timed(lambda: pd.read_csv(BytesIO(content), nrows=0), args.repeat)
+        header_time = timed(lambda: read_header(BytesIO(content)), args.repeat)
+        assert read_header(BytesIO(content)).columns == list(
+            pd.read_csv(BytesIO(content), nrows=0).columns
+        )
+        print(
+            f"{width:>8} {pandas_time * 1000:>10.3f} {header_time * 1000:>8.3f}"
+            f" {pandas_time / header_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Times the main code paths on synthetic CSVs and compares against a baseline.
+
+Run from the repository root:
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.25
+
+With --compare the exit status is 1 when any case got slower than the
+baseline by more than the threshold (0.25 = 25%).
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict
+from fastapi.testclient import TestClient
+from app.core.csv_records import read_header
+from app.core.csv_service import CSVService
+from app.core.mapping_engine import MappingEngine
+from app.core.mapping_strategies.case_insensitive import (
+    CaseInsensitiveMappingStrategy,
+)
+from app.core.mapping_strategies.fuzzy_match import FuzzyMatchMappingStrategy
+from app.core.repository import SQLiteRepository
+from app.core.schemas.user_info import UserInfo
+from app.core.suggestion_cache import LRUSuggestionStore, SuggestionCache
+from app.core.validators.exceptions import ValidationException
+from app.core.validators.field_types import FieldTypeValidator
+from app.core.validators.missing_value_columns import MissingValueColumnsValidator
+from app.core.validators.planner import ValidationPlanner
+from app.core.validators.required_columns import RequiredColumnsValidator
+from app.main import (
+    app,
+    get_csv_service,
+    get_repository,
+    get_schema,
+    get_suggestion_cache,
+)
+from .synthetic import generate_csv
+
+MAPPING = {"username": "username", "email": "email", "phone": "phone"}
+
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(times), "min_s": min(times)}
+
+
+def build_cases(workdir: Path, content: bytes, noisy_header: bytes):
+    """
+    Returns the benchmark cases by name, sharing one storage directory.
+    Validators read a file without an upload profile so they really scan it.
+    """
+    csv_service = CSVService(str(workdir / "storage"))
+    raw_path = csv_service.storage_path / "raw.csv"
+    raw_path.write_bytes(content)
+    noisy_columns = read_header(BytesIO(noisy_header)).columns
+    engine = MappingEngine(UserInfo)
+
+    repository = SQLiteRepository(str(workdir / "bench.db"))
+    app.dependency_overrides[get_csv_service] = lambda: csv_service
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.dependency_overrides[get_schema] = lambda: UserInfo
+    app.dependency_overrides[get_suggestion_cache] = lambda: SuggestionCache(
+        LRUSuggestionStore(), repository
+    )
+    client = TestClient(app)
+
+    def upload_and_validate():
+        response = client.post(
+            "/upload",
+            files={"file": ("bench.csv", BytesIO(content), "text/csv")},
+            data={"has_header": "true"},
+        )
+        response.raise_for_status()
+        filename = response.json()["saved_filename"]
+        response = client.post(
+            "/validate", json={"filename": filename, "mapping": MAPPING}
+        )
+        # NAs in the data make validation fail, which is still a full run
+        assert response.status_code in (200, 400), response.text
+
+    return {
+        "save_upload": lambda: csv_service.save_upload("bench.csv", BytesIO(content)),
+        "get_columns": lambda: csv_service.get_columns(raw_path),
+        "get_file_df": lambda: csv_service.get_file_df("raw.csv"),
+        "engine_case_insensitive": lambda: engine.run(
+            noisy_columns, mapping_strategy=CaseInsensitiveMappingStrategy()
+        ),
+        "engine_fuzzy_match": lambda: engine.run(
+            noisy_columns,
+            mapping_strategy=FuzzyMatchMappingStrategy(engine.compiled),
+        ),
+        "validate_missing_values": lambda: _validate(
+            MissingValueColumnsValidator("raw.csv", csv_service)
+        ),
+        "validate_field_types": lambda: _validate(
+            FieldTypeValidator("raw.csv", csv_service)
+        ),
+        # Only checks the mapping, run through the planner against the same
+        # file to show it adds no read of it
+        "validate_required_columns": lambda: ValidationPlanner(
+            "raw.csv", csv_service
+        ).run([RequiredColumnsValidator()], MAPPING, UserInfo),
+        "api_upload_validate": upload_and_validate,
+    }
+
+
+def _validate(validator):
+    try:
+        validator.validate(MAPPING, UserInfo)
+    except ValidationException:
+        pass
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """
+    Prints the change of every case against the baseline medians.
+    Returns False when any case regressed beyond the threshold.
+    """
+    ok = True
+    print(f"{'case':<26} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:<26} {'-':>12} {result['median_s'] * 1000:>11.2f}")
+            continue
+        before = baseline["results"][name]["median_s"]
+        after = result["median_s"]
+        change = after / before - 1 if before else 0.0
+        regressed = change > threshold
+        ok &= not regressed
+        print(
+            f"{name:<26} {before * 1000:>12.2f} {after * 1000:>11.2f}"
+            f" {change:>+7.0%}{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--na-density", type=float, default=0.01)
+    parser.add_argument("--noise", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+    # Keep per-request client logs out of the results table
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    params = {
+        "rows": args.rows,
+        "columns": args.columns,
+        "na_density": args.na_density,
+        "noise": args.noise,
+        "seed": args.seed,
+    }
+    content = generate_csv(**params)
+    noisy_header = generate_csv(0, args.columns, noise=1.0, seed=args.seed)
+
+    results = {
+        "params": params,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = build_cases(Path(workdir), content, noisy_header)
+        try:
+            for name, func in cases.items():
+                if args.cases and name not in args.cases:
+                    continue
+                results["results"][name] = measure(func, args.repeat)
+                print(
+                    f"{name:<26} {results['results'][name]['median_s'] * 1000:>9.2f} ms"
+                )
+        finally:
+            app.dependency_overrides = {}
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get("params") != params:
+            print("Warning: baseline was recorded with different parameters")
+        print()
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Deterministic synthetic CSV generator for benchmarks.
+
+The first columns carry UserInfo-like data (username, email, phone) so mapping
+and validation have something to find, the rest are filler. Header names can
+be made noisy (case, separators, typos) to exercise the mapping strategies.
+
+Run from the repository root to write a file:
+    python -m benchmarks.synthetic --rows 100000 --columns 20 out.csv
+"""
+
+import argparse
+import random
+from typing import List
+
+SCHEMA_COLUMNS = ["username", "email", "phone"]
+
+
+def noisy_name(name: str, rng: random.Random) -> str:
+    """
+    Returns a variant of name a human might have typed into a spreadsheet.
+    """
+    variant = rng.choice(["upper", "title", "separator", "typo"])
+    if variant == "upper":
+        return name.upper()
+    if variant == "title":
+        return name.title()
+    if variant == "separator":
+        middle = max(1, len(name) // 2)
+        return f"{name[:middle]}{rng.choice(['_', ' ', '-'])}{name[middle:]}"
+    i = rng.randrange(len(name))
+    return name[:i] + name[i + 1 :]
+
+
+def make_header(columns: int, noise: float, rng: random.Random) -> List[str]:
+    names = SCHEMA_COLUMNS[:columns] + [
+        f"field_{i}" for i in range(len(SCHEMA_COLUMNS), columns)
+    ]
+    return [noisy_name(name, rng) if rng.random() < noise else name for name in names]
+
+
+def make_value(column: int, row: int, rng: random.Random) -> str:
+    if column == 0:
+        return f"user-{row}"
+    if column == 1:
+        return f"user-{row}@example.com"
+    if column == 2:
+        return str(rng.randrange(10**9, 10**10))
+    return str(rng.randrange(1000)) if column % 2 else f"value {rng.randrange(1000)}"
+
+
+def generate_csv(
+    rows: int,
+    columns: int,
+    na_density: float = 0.0,
+    noise: float = 0.0,
+    seed: int = 0,
+) -> bytes:
+    """
+    Same arguments always give the same bytes.
+    na_density is the share of empty cells, noise the share of mangled names.
+    """
+    rng = random.Random(seed)
+    lines = [",".join(make_header(columns, noise, rng))]
+    for row in range(rows):
+        lines.append(
+            ",".join(
+                "" if rng.random() < na_density else make_value(column, row, rng)
+                for column in range(columns)
+            )
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--na-density", type=float, default=0.0)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.output, "wb") as f:
+        f.write(
+            generate_csv(
+                args.rows, args.columns, args.na_density, args.noise, args.seed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
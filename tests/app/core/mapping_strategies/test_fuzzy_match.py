@@ -1,4 +1,6 @@
 from app.core.mapping_strategies.fuzzy_match import FuzzyMatchMappingStrategy
+from app.core.schemas.registry import compile_schema
+from app.core.schemas.user_info import UserInfo
 
 
 def test_map_in_fuzzy_match_way(empty_mapping):
@@ -8,3 +10,55 @@ def test_map_in_fuzzy_match_way(empty_mapping):
 
     expected = {"username": "user_____name", "email": "em@il", "phone_number": None}
     assert result == expected
+
+
+def test_map_keeps_existing_mappings():
+    strat = FuzzyMatchMappingStrategy()
+    mapping = {"username": "login", "email": None}
+    result = strat.map(mapping, ["login", "username", "E_Mail"])
+
+    assert result == {"username": "login", "email": "E_Mail"}
+
+
+def test_match_single_target():
+    assert (
+        FuzzyMatchMappingStrategy.match("phone", ["Mobile_Phone", "id"])
+        == "Mobile_Phone"
+    )
+    assert FuzzyMatchMappingStrategy.match("phone", ["id"]) is None
+
+
+def test_map_batch_matches_map():
+    strat = FuzzyMatchMappingStrategy()
+    headers = [
+        ["login", "username", "E_Mail"],
+        ["Mobile_Phone", "id"],
+        [],
+        ["login", "username", "E_Mail"],
+    ]
+    mappings = [
+        {"username": "login", "email": None},
+        {"username": None, "email": None},
+        {"username": None, "email": None},
+        {"username": None, "email": None},
+    ]
+    expected = [strat.map(dict(m), h) for m, h in zip(mappings, headers)]
+
+    assert strat.map_batch(mappings, headers) == expected
+
+
+def test_compiled_schema_scorer_is_used(monkeypatch):
+    compiled = compile_schema(UserInfo)
+    strat = FuzzyMatchMappingStrategy(compiled)
+    expected = FuzzyMatchMappingStrategy().map(
+        {field: None for field in compiled.fields}, ["user_name", "mail"]
+    )
+
+    def no_lookup(targets):
+        raise AssertionError(f"scorer looked up for {targets}")
+
+    monkeypatch.setattr("app.core.mapping_strategies.fuzzy_match.get_scorer", no_lookup)
+    mappings = [{field: None for field in compiled.fields} for _ in range(2)]
+
+    assert strat.map(dict(mappings[0]), ["user_name", "mail"]) == expected
+    assert strat.map_batch(mappings, [["user_name", "mail"], []])[0] == expected
@@ -0,0 +1,52 @@
+from app.core.mapping_strategies.ngram_scorer import (
+    NgramScorer,
+    name_ngrams,
+    normalize_name,
+)
+
+
+def test_normalize_name():
+    assert normalize_name("E-mail Address") == "emailaddress"
+    assert normalize_name("User_Name") == "username"
+    assert normalize_name("Straße") == "strasse"
+    assert normalize_name("Имя пользователя") == "имяпользователя"
+    assert normalize_name("電子メール") == "電子メール"
+
+
+def test_name_ngrams_are_padded():
+    assert name_ngrams("Ab") == {" a", "ab", "b "}
+    assert name_ngrams("__") == set()
+
+
+def test_score_matrix_shape_and_range():
+    scorer = NgramScorer(["username", "email"])
+    scores = scorer.score(["UserName", "phone", "@@"])
+
+    assert scores.shape == (2, 3)
+    assert scores[0, 0] == 1.0
+    assert scores[:, 2].tolist() == [0.0, 0.0]
+    assert ((scores >= 0) & (scores <= 1)).all()
+
+
+def test_best_matches():
+    scorer = NgramScorer(["email", "phone", "address"])
+    result = scorer.best_matches(["Primary_Email", "Mobile_Phone", "id"], cutoff=0.5)
+
+    assert result == {
+        "email": "Primary_Email",
+        "phone": "Mobile_Phone",
+        "address": None,
+    }
+
+
+def test_best_matches_without_source_columns():
+    assert NgramScorer(["email"]).best_matches([]) == {"email": None}
+
+
+def test_best_matches_batch_matches_best_matches():
+    scorer = NgramScorer(["email", "phone", "address"])
+    headers = [["Primary_Email", "Mobile_Phone", "id"], [], ["addr", "E-mail"]]
+
+    assert scorer.best_matches_batch(headers) == [
+        scorer.best_matches(header) for header in headers
+    ]
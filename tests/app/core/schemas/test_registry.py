@@ -0,0 +1,49 @@
+import pytest
+from pydantic import BaseModel
+from app.core.schemas.registry import (
+    DEFAULT_SCHEMA,
+    SchemaRegistry,
+    compile_schema,
+    schema_name_for,
+    schema_registry,
+)
+from app.core.schemas.user_info import UserInfo
+
+
+class OrderLine(BaseModel):
+    order_id: int
+    note: str | None = None
+
+
+def test_default_schema_is_registered():
+    compiled = schema_registry.get(DEFAULT_SCHEMA)
+
+    assert compiled.schema_class is UserInfo
+    assert DEFAULT_SCHEMA in schema_registry.names()
+
+
+def test_compiled_metadata():
+    compiled = SchemaRegistry().register(OrderLine)
+
+    assert compiled.name == "order_line"
+    assert compiled.fields == ["order_id", "note"]
+    assert compiled.required_fields == {"order_id"}
+    assert list(compiled.field_checks) == ["order_id"]
+    assert compiled.scorer.targets == ["order_id", "note"]
+
+
+def test_register_under_custom_name():
+    registry = SchemaRegistry()
+    registry.register(OrderLine, name="orders")
+
+    assert registry.get("orders").schema_class is OrderLine
+    with pytest.raises(KeyError):
+        registry.get("order_line")
+
+
+def test_unregistered_class_is_compiled_once():
+    assert compile_schema(OrderLine) is compile_schema(OrderLine)
+
+
+def test_schema_name_for():
+    assert schema_name_for(UserInfo) == "user_info"
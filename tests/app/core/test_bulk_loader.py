@@ -0,0 +1,107 @@
+import sqlite3
+from io import BytesIO
+import pytest
+from pydantic import BaseModel
+from app.core.bulk_loader import SQLiteBulkLoader, create_table_sql
+from app.core.csv_service import CSVService
+
+
+class Person(BaseModel):
+    name: str
+    age: int | None = None
+    score: float | None = None
+    active: bool | None = None
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path / "storage")
+
+
+@pytest.fixture
+def filename(csv_service):
+    content = b"n,a,s,act,x\nann,31,1.5,yes,1\nbob,,2,0,2\ncy,x,,,3\n"
+    return csv_service.save_upload("people.csv", BytesIO(content)).name
+
+
+def test_create_table_sql():
+    assert create_table_sql(Person, "people") == (
+        'CREATE TABLE IF NOT EXISTS "people" ("name" TEXT NOT NULL, '
+        '"age" INTEGER, "score" REAL, "active" INTEGER)'
+    )
+
+
+def test_load_in_batches_with_progress(csv_service, filename, tmp_path):
+    db_path = str(tmp_path / "target.db")
+    progress = []
+    loader = SQLiteBulkLoader(db_path, Person, batch_size=2)
+    mapping = {"name": "n", "age": "a", "score": "s", "active": "act"}
+
+    result = loader.load(csv_service, filename, mapping, progress=progress.append)
+
+    assert result.rows_loaded == 3
+    assert [(p.rows_loaded, p.total_rows) for p in progress] == [(2, 3), (3, 3)]
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT * FROM person ORDER BY rowid").fetchall()
+    # Affinity converts numbers, values that aren't are kept as text
+    assert rows == [
+        ("ann", 31, 1.5, 1),
+        ("bob", None, 2.0, 0),
+        ("cy", "x", None, None),
+    ]
+
+
+def test_load_appends_or_replaces(csv_service, filename, tmp_path):
+    db_path = str(tmp_path / "target.db")
+    loader = SQLiteBulkLoader(db_path, Person, table="people")
+
+    loader.load(csv_service, filename, {"name": "n"})
+    loader.load(csv_service, filename, {"name": "n"})
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM people").fetchone() == (6,)
+
+    loader.load(csv_service, filename, {"name": "n"}, replace=True)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM people").fetchone() == (3,)
+
+
+def test_load_rejects_bad_input(csv_service, filename, tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteBulkLoader(str(tmp_path / "t.db"), Person, table="x; DROP TABLE y")
+    for reserved in ("mappings", "Suggestions", "sqlite_master"):
+        with pytest.raises(ValueError, match="reserved"):
+            SQLiteBulkLoader(str(tmp_path / "t.db"), Person, table=reserved)
+
+    loader = SQLiteBulkLoader(str(tmp_path / "t.db"), Person)
+    with pytest.raises(ValueError):
+        loader.load(csv_service, filename, {"name": None})
+    with pytest.raises(ValueError, match="Mapped columns not in file: nope"):
+        loader.load(csv_service, filename, {"name": "n", "age": "nope"})
+    # Required field with a NULL
+    with pytest.raises(sqlite3.IntegrityError):
+        loader.load(csv_service, filename, {"name": "a"})
+
+
+def test_na_tokens_are_loaded_as_text(csv_service, tmp_path):
+    filename = csv_service.save_upload(
+        "names.csv", BytesIO(b"n,a\nNA,1\nnull,\nNone,2\n")
+    ).name
+    db_path = str(tmp_path / "target.db")
+
+    result = SQLiteBulkLoader(db_path, Person).load(
+        csv_service, filename, {"name": "n", "age": "a"}
+    )
+
+    assert result.rows_loaded == 3
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute('SELECT name, age FROM "person" ORDER BY rowid').fetchall()
+    assert rows == [("NA", 1), ("null", None), ("None", 2)]
+
+
+def test_shared_database_keeps_durability(tmp_path):
+    owned = SQLiteBulkLoader(str(tmp_path / "t.db"), Person)
+    shared = SQLiteBulkLoader(str(tmp_path / "t.db"), Person, owns_db=False)
+
+    assert owned.pragmas["synchronous"] == "OFF"
+    assert "synchronous" not in shared.pragmas
+    assert "journal_mode" not in shared.pragmas
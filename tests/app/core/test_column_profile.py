@@ -0,0 +1,53 @@
+from app.core.column_profile import ColumnProfiler, FileProfile, ColumnProfile
+
+
+def test_profile_counts_rows_nulls_and_samples():
+    profiler = ColumnProfiler(sample_size=2)
+    content = b'name,email,phone\nalice,a@x.com,\nbob,NA,"1\n2"\n,c@x.com,3\n'
+    # Feed in small chunks to cross record boundaries
+    for i in range(0, len(content), 7):
+        profiler.feed(content[i : i + 7])
+
+    profile = profiler.finish()
+
+    assert profile.row_count == 3
+    assert profile.columns["name"] == ColumnProfile(null_count=1, sample=["alice", "bob"])
+    assert profile.columns["email"] == ColumnProfile(null_count=1, sample=["a@x.com", "c@x.com"])
+    assert profile.columns["phone"] == ColumnProfile(null_count=1, sample=["1\n2", "3"])
+
+
+def test_profile_without_header_and_short_rows():
+    profiler = ColumnProfiler(has_header=False)
+    profiler.feed(b"1,2\n3")
+
+    assert profiler.columns == ["column_0", "column_1"]
+    profile = profiler.finish()
+
+    assert profile.row_count == 2
+    assert profile.columns["column_0"].null_count == 0
+    assert profile.columns["column_1"].null_count == 1
+
+
+def test_profile_returns_none_on_malformed_csv():
+    profiler = ColumnProfiler()
+    profiler.feed(b'a,b\n1,"unterminated')
+
+    assert profiler.finish() is None
+
+
+def test_columns_with_na():
+    profile = FileProfile(
+        row_count=2,
+        columns={"a": ColumnProfile(null_count=1), "b": ColumnProfile()},
+    )
+    assert profile.columns_with_na(["a", "b", "unknown"]) == {"a"}
+
+
+def test_profile_draws_a_row_sample():
+    profiler = ColumnProfiler(reservoir_size=10, seed=1)
+    profiler.feed(b"n,s\n" + b"".join(f"{i},x\n".encode() for i in range(1000)))
+    profiler.finish()
+
+    assert len(profiler.sample_rows) == 10
+    assert len({row[0] for row in profiler.sample_rows}) == 10
+    assert all(row[1] == "x" for row in profiler.sample_rows)
@@ -0,0 +1,96 @@
+import os
+import pandas as pd
+import pytest
+from app.core.columnar_cache import ColumnarCache
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {"id": [1, 2, 3], "name": ["a", None, "c"], "score": [1.5, None, 2.0]}
+    )
+
+
+def test_round_trip(tmp_path, frame):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    cache.put("file.csv", frame)
+
+    result = cache.get("file.csv")
+    assert result.columns.tolist() == ["id", "name", "score"]
+    assert result["id"].tolist() == [1, 2, 3]
+    assert result["name"].isna().tolist() == [False, True, False]
+    assert result["score"].dtype == frame["score"].dtype
+
+
+def test_single_column_read(tmp_path, frame):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    cache.put("file.csv", frame)
+
+    result = cache.get("file.csv", ["score", "unknown"])
+    assert result.columns.tolist() == ["score"]
+
+
+def test_miss_returns_none(tmp_path):
+    cache = ColumnarCache(tmp_path, max_bytes=1024)
+    assert cache.get("missing.csv") is None
+
+
+def test_evicts_least_recently_used(tmp_path, frame):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    cache.put("first.csv", frame)
+    cache.put("second.csv", frame)
+    entry_size = cache.size() // 2
+
+    # Make "first" the most recently used entry
+    os.utime(tmp_path / "second.csv", (0, 0))
+    cache.get("first.csv")
+
+    cache.max_bytes = entry_size * 2
+    cache.put("third.csv", frame)
+
+    assert cache.get("second.csv") is None
+    assert cache.get("first.csv") is not None
+    assert cache.get("third.csv") is not None
+    assert cache.size() <= cache.max_bytes
+
+
+def test_skips_frames_larger_than_limit(tmp_path, frame):
+    cache = ColumnarCache(tmp_path, max_bytes=10)
+    cache.put("file.csv", frame)
+
+    assert cache.get("file.csv") is None
+
+
+def test_text_is_stored_without_pickles(tmp_path):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    frame = pd.DataFrame({"name": ["a", None, "ccc"]}, dtype=str)
+    cache.put("file.csv", frame)
+
+    assert list((tmp_path / "file.csv").glob("*.npy")) == []
+    result = cache.get("file.csv")
+    assert result["name"].dtype == frame["name"].dtype
+    assert result["name"].isna().tolist() == [False, True, False]
+    assert result["name"].tolist()[::2] == ["a", "ccc"]
+
+
+def test_put_adds_columns(tmp_path, frame):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    cache.put("file.csv", frame[["score"]], {"score": 2})
+    cache.put("file.csv", frame[["id", "score"]], {"id": 0, "score": 2})
+
+    assert cache.get("file.csv").columns.tolist() == ["id", "score"]
+    assert cache.get("file.csv", ["name"]).columns.tolist() == []
+
+
+def test_chunks_of_long_and_odd_text(tmp_path):
+    cache = ColumnarCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    values = ["x" * 30_000, None, "é\x00", "", "line\nbreak"]
+    cache.put("file.csv", pd.DataFrame({"name": values}, dtype=str))
+
+    chunks = list(cache.iter_chunks("file.csv", ["name"], chunk_size=2))
+    assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+    result = pd.concat(chunks)["name"]
+    assert result.isna().tolist() == [False, True, False, False, False]
+    assert result.dropna().tolist() == [values[0], *values[2:]]
+    assert cache.iter_chunks("file.csv", ["name", "other"], chunk_size=2) is None
+    assert cache.size() < 40_000
@@ -0,0 +1,80 @@
+import gzip
+import pytest
+from app.core.compression import (
+    GZIP,
+    StreamCompressor,
+    StreamDecompressor,
+    decompress_prefix,
+    detect_compression,
+)
+
+CONTENT = b"name,email\n" + b"alice,alice@example.com\n" * 1000
+
+
+def decompress_in_chunks(data: bytes, size: int) -> bytes:
+    decompressor = StreamDecompressor()
+    output = [
+        piece
+        for i in range(0, len(data), size)
+        for piece in decompressor.decompress(data[i : i + size])
+    ]
+    return b"".join(output) + decompressor.flush()
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_gzip_is_decompressed_chunk_by_chunk(size):
+    assert decompress_in_chunks(gzip.compress(CONTENT), size) == CONTENT
+
+
+def test_plain_text_passes_through():
+    assert decompress_in_chunks(CONTENT, 7) == CONTENT
+    assert decompress_in_chunks(b"a\n", 7) == b"a\n"
+
+
+def test_concatenated_gzip_members():
+    data = gzip.compress(CONTENT[:100]) + gzip.compress(CONTENT[100:])
+
+    assert decompress_in_chunks(data, 50) == CONTENT
+
+
+def test_truncated_gzip_is_an_error():
+    decompressor = StreamDecompressor()
+    list(decompressor.decompress(gzip.compress(CONTENT)[:-20]))
+
+    with pytest.raises(ValueError):
+        decompressor.flush()
+
+
+def test_output_comes_in_bounded_pieces(monkeypatch):
+    monkeypatch.setattr("app.core.compression.OUTPUT_CHUNK_SIZE", 1000)
+    data = gzip.compress(b"0" * 100_000) + gzip.compress(CONTENT)
+
+    pieces = list(StreamDecompressor().decompress(data))
+
+    assert max(len(piece) for piece in pieces) == 1000
+    assert b"".join(pieces) == b"0" * 100_000 + CONTENT
+
+
+def test_decompress_prefix_reads_the_first_block_only():
+    data = gzip.compress(CONTENT)
+
+    prefix = decompress_prefix(data[: len(data) // 2], 1024 * 1024)
+
+    assert prefix.startswith(b"name,email\n")
+    assert decompress_prefix(data, 100) == CONTENT[:100]
+    assert detect_compression(data) == GZIP
+    assert detect_compression(CONTENT) is None
+
+
+def test_stream_compressor_round_trip():
+    compressor = StreamCompressor(GZIP)
+    data = compressor.compress(CONTENT[:10]) + compressor.compress(CONTENT[10:])
+
+    assert gzip.decompress(data + compressor.flush()) == CONTENT
+
+
+def test_zstd_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    data = zstandard.ZstdCompressor().compress(CONTENT)
+
+    assert decompress_in_chunks(data, 100) == CONTENT
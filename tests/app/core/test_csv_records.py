@@ -0,0 +1,86 @@
+from io import BytesIO
+import pytest
+from app.core.csv_records import (
+    RecordSplitter,
+    dedupe_column_names,
+    detect_delimiter,
+    find_record_boundaries,
+    header_from_prefix,
+    read_header,
+)
+
+
+def test_record_splitter_keeps_quoted_newlines_together():
+    splitter = RecordSplitter()
+
+    assert splitter.feed('a,b\n1,"multi\nli') == ["a,b\n"]
+    assert splitter.feed('ne"\n2,x') == ['1,"multi\nline"\n']
+    assert splitter.flush() == ["2,x"]
+
+
+def test_dedupe_column_names():
+    assert dedupe_column_names(["a", "a", "", "b"]) == ["a", "a.1", "Unnamed: 2", "b"]
+
+
+def test_record_splitter_reports_open_quotes():
+    splitter = RecordSplitter()
+    splitter.feed('a\n"open\n')
+
+    assert splitter.in_quotes
+
+
+@pytest.mark.parametrize(
+    "record, expected",
+    [
+        ("a,b,c\n", ","),
+        ("a;b;c\n", ";"),
+        ("a\tb\n", "\t"),
+        ('"x;y",b,c\n', ","),
+        ("single\n", ","),
+    ],
+)
+def test_detect_delimiter(record, expected):
+    assert detect_delimiter(record) == expected
+
+
+def test_read_header_handles_bom_quotes_and_multiline_names():
+    content = '\ufeff\n"first\nname";"last;name";age\n1;2;3\n'.encode("utf-8")
+
+    header = read_header(BytesIO(content))
+
+    assert header.columns == ["first\nname", "last;name", "age"]
+    assert header.delimiter == ";"
+
+
+def test_read_header_without_header_row():
+    header = read_header(BytesIO(b"1,2,3"), has_header=False)
+
+    assert header.columns == ["column_0", "column_1", "column_2"]
+
+
+def test_read_header_is_bounded():
+    with pytest.raises(ValueError):
+        read_header(BytesIO(b'"' + b"x" * 1000), max_bytes=100)
+
+
+def test_read_header_empty():
+    with pytest.raises(ValueError):
+        read_header(BytesIO(b"\n\n"))
+
+
+def test_header_from_prefix_waits_for_a_complete_record():
+    assert header_from_prefix(b'\nname,"e\nmail') is None
+
+    header = header_from_prefix(b'\nname,"e\nmail"\nalice,a@x.com\nbo')
+
+    assert header.columns == ["name", "e\nmail"]
+
+
+@pytest.mark.parametrize("block_size", [3, 1024])
+def test_find_record_boundaries_skips_quoted_newlines(monkeypatch, block_size):
+    monkeypatch.setattr("app.core.csv_records.BOUNDARY_BLOCK_SIZE", block_size)
+    content = b'a,b\n1,"x\ny"\n2,3\n4,"5\n\n6"\n7,8'
+
+    boundaries = find_record_boundaries(BytesIO(content), [0, 5, 9, 12, 20, 30])
+
+    assert boundaries == [4, 12, 16, 25]
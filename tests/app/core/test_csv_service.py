@@ -1,8 +1,11 @@
+import gzip
+import tracemalloc
+import zlib
 import pytest
 import pandas as pd
 from io import BytesIO, StringIO
 from pathlib import Path
-from app.core.csv_service import CSVService
+from app.core.csv_service import CSVService, UploadTooLarge
 
 
 @pytest.fixture
@@ -47,3 +50,264 @@ def test_get_columns_without_header(csv_service, tmp_path):
 
     cols = csv_service.get_columns(file_path, has_header=False)
     assert cols == ["column_0", "column_1", "column_2"]
+
+
+def test_scan_na_columns(csv_service, tmp_path):
+    (tmp_path / "data.csv").write_text("a,b,c\n1,,x\n2,5,\n3,6,z\n,7,w\n")
+
+    result = csv_service.scan_na_columns("data.csv", ["a", "b"], chunk_size=1)
+    assert result == {"a", "b"}
+
+
+def test_scan_na_columns_ignores_unknown_columns(csv_service, tmp_path):
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n3,4\n")
+
+    assert csv_service.scan_na_columns("data.csv", ["a", "missing"]) == set()
+
+
+def test_scan_na_columns_stops_early(csv_service, tmp_path):
+    # The trailing row is malformed and would fail parsing if ever reached
+    (tmp_path / "data.csv").write_text('a,b\n,\n1,2\n3,"4\n')
+
+    result = csv_service.scan_na_columns("data.csv", ["a", "b"], chunk_size=1)
+    assert result == {"a", "b"}
+
+
+def test_save_upload_writes_profile(csv_service):
+    saved_path = csv_service.save_upload("test.csv", BytesIO(b"id,name\n1,\n2,b"))
+
+    profile = csv_service.get_profile(saved_path.name)
+    assert profile.row_count == 2
+    assert profile.columns["name"].null_count == 1
+    assert profile.columns["id"].sample == ["1", "2"]
+
+
+def test_get_profile_missing(csv_service, tmp_path):
+    (tmp_path / "plain.csv").write_text("a\n1\n")
+
+    assert csv_service.get_profile("plain.csv") is None
+
+
+def test_get_file_df_columns(csv_service, tmp_path):
+    (tmp_path / "data.csv").write_text("a,b,c\n1,2,3\n")
+
+    df = csv_service.get_file_df("data.csv", columns=["c", "a"])
+    assert df.columns.tolist() == ["a", "c"]
+
+
+def test_scans_served_from_cache(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=1024 * 1024)
+    (tmp_path / "data.csv").write_text("a,b,c\n1,,z\n2,x,z\n")
+
+    first = pd.concat(csv_service.iter_chunks("data.csv", ["b", "a"], chunk_size=1))
+    # Overwrite the CSV so only the cache can answer for a and b
+    (tmp_path / "data.csv").write_text("a,b,c\n9,9,9\n")
+    cached = pd.concat(csv_service.iter_chunks("data.csv", ["a", "b"], chunk_size=1))
+
+    pd.testing.assert_frame_equal(cached, first)
+    assert cached.index.tolist() == [0, 1]
+    assert csv_service.scan_na_columns("data.csv", ["a", "b"]) == {"b"}
+    # c is not cached yet, so it is read from the file
+    assert pd.concat(csv_service.iter_chunks("data.csv", ["c"]))["c"].tolist() == ["9"]
+
+
+def test_partial_scans_are_not_cached(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=1024 * 1024)
+    (tmp_path / "data.csv").write_text("a\n1\n2\n")
+
+    next(csv_service.iter_chunks("data.csv", ["a"], chunk_size=1))
+
+    assert csv_service.cache.get("data.csv") is None
+
+
+def test_cache_filled_chunk_by_chunk(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=1024 * 1024)
+    long_value = "x" * 30_000
+    rows = "".join(f"{i},{long_value if i == 5 else 'v'}\n" for i in range(1000))
+    (tmp_path / "data.csv").write_text("id,note\n" + rows)
+
+    first = pd.concat(csv_service.iter_chunks("data.csv", ["note"], chunk_size=100))
+    cached = pd.concat(csv_service.iter_chunks("data.csv", ["note"], chunk_size=100))
+
+    pd.testing.assert_frame_equal(cached, first)
+    assert cached["note"][5] == long_value
+    # Variable-length text, one long value costs only its own length
+    assert csv_service.cache.size() < 50_000
+
+
+def test_scans_outgrowing_the_cache_are_dropped(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=2000)
+    (tmp_path / "data.csv").write_text("a\n" + "value\n" * 1000)
+
+    assert (
+        len(pd.concat(csv_service.iter_chunks("data.csv", ["a"], chunk_size=10)))
+        == 1000
+    )
+
+    assert csv_service.cache.get("data.csv") is None
+    assert csv_service.cache.size() == 0
+
+
+def test_open_upload_exposes_columns_after_first_record(csv_service):
+    writer = csv_service.open_upload("test.csv")
+    writer.write(b"id,na")
+    assert writer.columns is None
+
+    writer.write(b"me\n1,a\n")
+    assert writer.columns == ["id", "name"]
+
+    saved_path = writer.close()
+    assert saved_path.read_bytes() == b"id,name\n1,a\n"
+
+
+def test_open_upload_without_header_holds_data_until_width_known(csv_service):
+    with csv_service.open_upload("test.csv", has_header=False) as writer:
+        writer.write(b"1,")
+        writer.write(b"a")
+        saved_path = writer.close()
+
+    assert writer.columns == ["column_0", "column_1"]
+    assert saved_path.read_bytes() == b"column_0,column_1\n1,a"
+
+
+def test_open_upload_abort_removes_file(csv_service):
+    with pytest.raises(RuntimeError):
+        with csv_service.open_upload("test.csv") as writer:
+            writer.write(b"id\n1\n")
+            raise RuntimeError("connection dropped")
+
+    assert not writer.path.exists()
+
+
+def test_semicolon_delimited_upload(csv_service):
+    saved_path = csv_service.save_upload("test.csv", BytesIO(b"id;name\n1;\n2;b\n"))
+
+    assert csv_service.get_columns(saved_path) == ["id", "name"]
+    assert csv_service.get_profile(saved_path.name).columns["name"].null_count == 1
+    assert csv_service.get_file_df(saved_path.name)["id"].tolist() == [1, 2]
+    assert csv_service.scan_na_columns(saved_path.name, ["id", "name"]) == {"name"}
+
+
+def test_semicolon_delimited_upload_without_header(csv_service):
+    saved_path = csv_service.save_upload(
+        "test.csv", BytesIO(b"1;a\n2;b\n"), has_header=False
+    )
+
+    assert saved_path.read_bytes() == b"column_0;column_1\n1;a\n2;b\n"
+
+
+def test_identical_uploads_are_stored_once(csv_service, tmp_path):
+    first = csv_service.save_upload("a.csv", BytesIO(b"id,name\n1,x\n"))
+    second = csv_service.save_upload("b.csv", BytesIO(b"id,name\n1,x\n"))
+    other = csv_service.save_upload("c.csv", BytesIO(b"id,name\n2,y\n"))
+
+    assert first != second
+    assert first.read_bytes() == second.read_bytes()
+    assert csv_service.content_key(first.name) == csv_service.content_key(second.name)
+    assert csv_service.content_key(first.name) != csv_service.content_key(other.name)
+    assert len(list((tmp_path / "objects").glob("*.csv"))) == 2
+    assert list((tmp_path / "objects").glob(".tmp-*")) == []
+    assert csv_service.get_profile(second.name).row_count == 1
+
+
+def test_upload_names_are_unique_and_sanitized(csv_service):
+    first = csv_service.save_upload("../same.csv", BytesIO(b"id\n1\n"))
+    second = csv_service.save_upload("same.csv", BytesIO(b"id\n1\n"))
+
+    assert first != second
+    assert first.parent == second.parent == csv_service.storage_path
+    assert first.name.endswith("_same.csv")
+
+
+def test_content_key_of_plain_file(csv_service, tmp_path):
+    (tmp_path / "plain.csv").write_text("a\n1\n")
+
+    assert csv_service.content_key("plain.csv") == "plain.csv"
+
+
+def test_columnar_cache_shared_by_identical_uploads(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=1024 * 1024)
+    first = csv_service.save_upload("a.csv", BytesIO(b"id\n1\n"))
+    second = csv_service.save_upload("b.csv", BytesIO(b"id\n1\n"))
+
+    list(csv_service.iter_chunks(first.name, ["id"]))
+
+    key = csv_service.content_key(second.name)
+    assert csv_service.cache.get(key) is not None
+
+
+def test_split_ranges_are_record_aligned(csv_service, tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b'id,note\n1,"a\nb"\n2,c\n3,"d\n\ne"\n4,f\n')
+
+    header_end, ranges = csv_service.split_ranges(path, 3)
+
+    assert header_end == 8
+    assert ranges[0][0] == 8 and ranges[-1][1] == path.stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    for start, end in ranges:
+        chunk = pd.read_csv(BytesIO(b"id,note\n" + path.read_bytes()[start:end]))
+        assert chunk["id"].notna().all()
+
+
+def test_parallel_scan_na_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.csv_service.SCAN_RANGE_BYTES", 64)
+    csv_service = CSVService(storage_path=tmp_path, scan_workers=2)
+    rows = [f'{i},"multi\nline {i}",{i}' for i in range(50)]
+    rows[40] = '40,"x",'
+    (tmp_path / "data.csv").write_text("a,b,c\n" + "\n".join(rows) + "\n")
+
+    na_columns = csv_service.scan_na_columns("data.csv", ["a", "b", "c"], parallel=True)
+
+    assert na_columns == {"c"}
+
+
+def test_save_gzip_upload_stores_plain_text(csv_service):
+    content = b"id,name\n1,test\n"
+
+    saved_path = csv_service.save_upload("test.csv.gz", BytesIO(gzip.compress(content)))
+
+    assert saved_path.read_bytes() == content
+    assert csv_service.get_profile(saved_path.name).row_count == 1
+
+
+def test_compressed_storage(tmp_path):
+    csv_service = CSVService(storage_path=tmp_path, compression="gzip")
+    content = b"id,name\n1,test\n2,\n"
+
+    saved_path = csv_service.save_upload("test.csv", BytesIO(content))
+    again = csv_service.save_upload("test.csv", BytesIO(gzip.compress(content)))
+
+    assert saved_path.resolve().name.endswith(".csv.gz")
+    assert gzip.decompress(saved_path.read_bytes()) == content
+    assert again.resolve() == saved_path.resolve()
+    assert csv_service.content_key(saved_path.name) == csv_service.content_key(
+        again.name
+    )
+    assert csv_service.get_columns(saved_path) == ["id", "name"]
+    assert csv_service.get_file_df(saved_path.name)["id"].tolist() == [1, 2]
+    assert csv_service.scan_na_columns(saved_path.name, ["id", "name"]) == {"name"}
+
+
+def test_upload_size_is_bounded_uncompressed(csv_service):
+    content = gzip.compress(b"id\n" + b"1\n" * 10_000)
+
+    with pytest.raises(UploadTooLarge):
+        csv_service.save_upload("test.csv.gz", BytesIO(content), max_size=1000)
+    assert not list(csv_service.storage_path.glob("*.gz"))
+
+
+def test_upload_limit_applies_while_a_chunk_inflates(csv_service):
+    # 64 MB of plain text in a few hundred KB of gzip
+    deflater = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    block = b"1\n" * (512 * 1024)
+    content = b"".join(deflater.compress(block) for _ in range(64)) + deflater.flush()
+
+    tracemalloc.start()
+    try:
+        with pytest.raises(UploadTooLarge):
+            csv_service.save_upload("test.csv.gz", BytesIO(content), max_size=1000)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 16 * 1024 * 1024
@@ -0,0 +1,81 @@
+import json
+from io import BytesIO
+import pandas as pd
+import pytest
+from app.core.csv_service import CSVService
+from app.core.exporter import MappedExporter
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    (tmp_path / "file.csv").write_text(
+        'u,e,extra\nann,"a@b.com",1\n"bob, jr",,2\ncy,c@d.com,3\n'
+    )
+    return CSVService(storage_path=tmp_path)
+
+
+@pytest.fixture
+def exporter(csv_service):
+    return MappedExporter(
+        csv_service,
+        "file.csv",
+        {"email": "e", "username": "u", "login": "u", "phone": None},
+        chunk_size=2,
+    )
+
+
+def test_frames_are_projected_renamed_and_chunked(exporter):
+    frames = list(exporter.iter_frames())
+
+    assert [len(frame) for frame in frames] == [2, 1]
+    assert list(frames[0].columns) == ["email", "username", "login"]
+    assert frames[1].index.tolist() == [2]
+
+
+def test_csv_export(exporter):
+    content = b"".join(exporter.iter_csv())
+
+    df = pd.read_csv(BytesIO(content), dtype=str)
+    assert list(df.columns) == ["email", "username", "login"]
+    assert df["username"].tolist() == ["ann", "bob, jr", "cy"]
+    assert df["email"].isna().tolist() == [False, True, False]
+
+
+def test_ndjson_export(exporter):
+    lines = b"".join(exporter.iter_ndjson()).decode().splitlines()
+
+    assert [json.loads(line) for line in lines][1] == {
+        "email": None,
+        "username": "bob, jr",
+        "login": "bob, jr",
+    }
+
+
+def test_parquet_export(exporter):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    table = pq.read_table(BytesIO(b"".join(exporter.iter_parquet())))
+
+    assert table.column_names == ["email", "username", "login"]
+    assert table.num_rows == 3
+
+
+def test_missing_columns(csv_service):
+    exporter = MappedExporter(csv_service, "file.csv", {"email": "mail", "x": "u"})
+
+    assert exporter.missing_columns() == ["mail"]
+
+
+@pytest.mark.parametrize("cache_max_bytes", [0, 1024 * 1024])
+def test_na_tokens_round_trip(tmp_path, cache_max_bytes):
+    (tmp_path / "tokens.csv").write_text(
+        "name,note\nAlice,NA\nBob,None\nCarl,null\nDee,\n"
+    )
+    csv_service = CSVService(storage_path=tmp_path, cache_max_bytes=cache_max_bytes)
+    # A default scan first, so a cached parse with NA tokens could be served
+    list(csv_service.iter_chunks("tokens.csv", ["note"]))
+    exporter = MappedExporter(csv_service, "tokens.csv", {"n": "name", "x": "note"})
+
+    content = b"".join(exporter.iter_csv())
+
+    assert content == b"n,x\nAlice,NA\nBob,None\nCarl,null\nDee,\n"
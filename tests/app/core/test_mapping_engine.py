@@ -33,3 +33,31 @@ def test_mapping_engine_with_saved_mapping(mapping_engine):
     )
     expected = {"username": "user", "email": "email_address", "phone_number": None}
     assert result == expected
+
+
+def test_mapping_engine_run_batch(mapping_engine):
+    calls = []
+
+    class RecordingStrategy(FakeStrategy):
+        def map(self, mapping, source_columns):
+            calls.append(source_columns)
+            return super().map(mapping, source_columns)
+
+    headers = [["user", "e-mail"], ["phone"], ["user", "e-mail"]]
+    results = mapping_engine.run_batch(
+        headers,
+        saved_mapping={"username": "user"},
+        mapping_strategy=RecordingStrategy(),
+    )
+
+    assert calls == [["user", "e-mail"], ["phone"]]
+    assert results == [
+        mapping_engine.run(
+            header,
+            saved_mapping={"username": "user"},
+            mapping_strategy=FakeStrategy(),
+        )
+        for header in headers
+    ]
+    results[0]["email"] = "changed"
+    assert results[2]["email"] == "e-mail"
@@ -0,0 +1,110 @@
+import random
+import time
+from app.core.mapping_index import MappingIndex
+from app.core.mapping_strategies.ngram_scorer import normalize_name
+
+
+def test_rank_by_overlap():
+    index = MappingIndex()
+    index.add("crm", {"username": "User_Name", "email": "E-Mail", "phone": "Tel"})
+    index.add("shop", {"username": "login", "email": "email"})
+    index.add("other", {"username": "id"})
+
+    candidates = index.rank(["user name", "EMAIL", "tel", "city"])
+
+    assert [(c.name, c.matched_columns) for c in candidates] == [
+        ("crm", 3),
+        ("shop", 1),
+    ]
+    assert candidates[0].score == round(2 * 3 / (4 + 3), 4)
+    assert index.rank(["city"]) == []
+
+
+def test_rank_non_latin_headers():
+    index = MappingIndex()
+    index.add("ru", {"username": "Имя", "email": "Почта"})
+    index.add("jp", {"username": "名前", "email": "メール"})
+
+    candidates = index.rank(["имя", "ПОЧТА"])
+
+    assert [(c.name, c.matched_columns) for c in candidates] == [("ru", 2)]
+
+
+def test_incremental_add_and_limit():
+    index = MappingIndex()
+    for i in range(5):
+        index.add(f"m{i}", {"a": "shared", "b": f"own{i}"})
+    assert len(index.rank(["shared"], limit=2)) == 2
+
+    index.add("m1", {"a": "ignored"})
+    index.add("late", {"a": "shared", "b": "own9"})
+
+    assert [c.name for c in index.rank(["shared", "own9"], limit=1)] == ["late"]
+    assert len(index) == 6
+
+
+def test_mappings_sharing_only_common_columns_are_ranked():
+    index = MappingIndex()
+    for i in range(99):
+        index.add(f"common{i}", {"a": "email", "b": "username", "c": "phone"})
+    index.add("rareonly", {"a": "rarecol", "b": "x", "c": "y", "d": "z"})
+
+    candidates = index.rank(["email", "username", "phone", "rarecol"], limit=2)
+
+    assert [(c.name, c.score) for c in candidates] == [
+        ("common0", 0.8571),
+        ("common1", 0.8571),
+    ]
+
+
+def brute_force_rank(mappings, header, limit):
+    header = {normalize_name(col) for col in header}
+    ranked = []
+    for name, mapping in mappings.items():
+        sources = {normalize_name(source) for source in mapping.values()}
+        matched = len(header & sources)
+        if matched:
+            score = round(2 * matched / (len(header) + len(sources)), 4)
+            ranked.append((-score, name, matched))
+    return [(name, -score, matched) for score, name, matched in sorted(ranked)[:limit]]
+
+
+def test_rank_matches_brute_force():
+    rng = random.Random(0)
+    # A few columns are used by most mappings, the rest are rare
+    pool = ["email", "username", "phone"] + [f"col{i}" for i in range(300)]
+    weights = [50, 40, 30] + [1] * 300
+    mappings = {
+        f"m{i}": {
+            f"t{j}": column
+            for j, column in enumerate(
+                set(rng.choices(pool, weights, k=rng.randint(1, 6)))
+            )
+        }
+        for i in range(500)
+    }
+    index = MappingIndex()
+    index.add_all(mappings.items())
+
+    for _ in range(200):
+        header = rng.sample(pool[:3], rng.randint(0, 3)) + rng.sample(
+            pool[3:], rng.randint(0, 3)
+        )
+        limit = rng.randint(1, 5)
+        assert [
+            (c.name, c.score, c.matched_columns) for c in index.rank(header, limit)
+        ] == brute_force_rank(mappings, header, limit)
+
+
+def test_rank_scales_without_scanning_mappings():
+    index = MappingIndex()
+    for i in range(100_000):
+        index.add(f"m{i}", {"a": f"col_{i}", "b": f"col_{i + 1}", "c": "email"})
+    index.rank(["email"])
+
+    start = time.perf_counter()
+    candidates = index.rank(["col_500", "col_501", "zip"])
+    elapsed = time.perf_counter() - start
+
+    assert candidates[0].name == "m500"
+    assert elapsed < 0.01
@@ -0,0 +1,39 @@
+from app.core.metrics import Counter, Histogram, STAGE_SECONDS, timed
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe("read", 0.05)
+    histogram.observe("read", 0.5)
+    histogram.observe("read", 5)
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{stage="read",le="0.1"} 1',
+        'latency_seconds_bucket{stage="read",le="1.0"} 2',
+        'latency_seconds_bucket{stage="read",le="+Inf"} 3',
+        'latency_seconds_sum{stage="read"} 5.55',
+        'latency_seconds_count{stage="read"} 3',
+    ]
+
+
+def test_counter_escapes_labels():
+    counter = Counter("bytes_total", "Bytes")
+    counter.inc('a"b', 10)
+    counter.inc('a"b', 5)
+
+    assert counter.render()[-1] == 'bytes_total{stage="a\\"b"} 15'
+
+
+def test_timed_as_context_manager_and_decorator():
+    before = STAGE_SECONDS.count("test.stage")
+
+    @timed("test.stage")
+    def work():
+        return 1
+
+    with timed("test.stage"):
+        work()
+
+    assert STAGE_SECONDS.count("test.stage") == before + 2
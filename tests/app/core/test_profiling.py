@@ -0,0 +1,25 @@
+import threading
+import time
+from app.core.profiling import StackSampler
+
+
+def busy_loop(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_sees_other_threads(tmp_path):
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    worker = threading.Thread(target=busy_loop, args=(0.2,))
+    worker.start()
+    worker.join()
+    stacks = sampler.stop()
+
+    assert any("busy_loop" in stack for stack in stacks)
+
+    path = sampler.dump(tmp_path / "profiles", "upload")
+    line = path.read_text().splitlines()[0]
+    assert path.suffix == ".folded"
+    assert int(line.rsplit(" ", 1)[1]) > 0
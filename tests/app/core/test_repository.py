@@ -1,6 +1,7 @@
 import pytest
 import sqlite3
 import json
+import threading
 from app.core.repository import SQLiteRepository
 
 
@@ -51,3 +52,110 @@ def test_get_mapping(repo):
 
 def test_get_non_existent_mapping(repo):
     assert repo.get_mapping("Nothing") is None
+
+
+def test_wal_mode_enabled(repo):
+    with sqlite3.connect(repo.db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_connection_reused_per_thread(repo):
+    assert repo._connection() is repo._connection()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(repo._connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not repo._connection()
+
+
+def test_get_mapping_is_cached(repo):
+    repo.save_mapping("cached", {"email": "e"})
+    assert repo.get_mapping("cached") == {"email": "e"}
+
+    with sqlite3.connect(repo.db_path) as conn:
+        conn.execute("DELETE FROM mappings WHERE name = 'cached'")
+
+    assert repo.get_mapping("cached") == {"email": "e"}
+
+
+def test_list_mappings_sees_saves(repo):
+    assert repo.list_mappings().mappings == []
+    repo.save_mapping("first", {"email": "e"})
+
+    assert [m.name for m in repo.list_mappings().mappings] == ["first"]
+
+
+def test_list_mappings_prefix_search(repo):
+    for name in ["alpha", "Alpine", "AZx", "azy", "beta", "b_1"]:
+        repo.save_mapping(name, {"email": "e"})
+
+    def names(prefix):
+        return [m.name for m in repo.list_mappings(prefix=prefix).mappings]
+
+    assert names("AL") == ["alpha", "Alpine"]
+    assert names("az") == ["AZx", "azy"]
+    assert names("b_") == ["b_1"]
+    assert names("c") == []
+
+
+@pytest.mark.parametrize("sort", ["name", "created_at"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_list_mappings_keyset_pages(repo, sort, descending):
+    names = [f"mapping-{i:02}" for i in range(7)]
+    for name in names:
+        repo.save_mapping(name, {"email": "e"})
+
+    pages = []
+    cursor = None
+    while True:
+        page = repo.list_mappings(
+            sort=sort, descending=descending, limit=3, cursor=cursor
+        )
+        pages.append([m.name for m in page.mappings])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = names[::-1] if descending else names
+    assert pages == [expected[0:3], expected[3:6], expected[6:]]
+
+
+def test_list_mappings_rejects_bad_cursor(repo):
+    with pytest.raises(ValueError):
+        repo.list_mappings(cursor="not-a-cursor")
+
+
+def test_list_mappings_uses_indexes(repo):
+    conn = repo._connection()
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT name FROM mappings "
+        "WHERE name COLLATE NOCASE >= 'a' AND name COLLATE NOCASE < 'b' "
+        "ORDER BY name COLLATE NOCASE, id LIMIT 10"
+    ).fetchall()
+
+    assert "idx_mappings_name_nocase" in plan[0][-1]
+
+
+def test_close(repo):
+    conn = repo._connection()
+    repo.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert repo.get_mapping("missing") is None
+
+
+def test_recommend_mappings_tracks_saves(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "index.db"))
+    repo.save_mapping("before", {"username": "login", "email": "mail"})
+
+    assert [c.name for c in repo.recommend_mappings(["Login", "Mail"])] == ["before"]
+
+    repo.save_mapping("after", {"username": "login", "email": "mail", "phone": "tel"})
+    candidates = repo.recommend_mappings(["login", "mail", "tel"])
+
+    assert [c.name for c in candidates] == ["after", "before"]
+    # A fresh repository rebuilds the same index from the table
+    reopened = SQLiteRepository(str(tmp_path / "index.db"))
+    assert reopened.recommend_mappings(["login", "mail", "tel"]) == candidates
@@ -0,0 +1,113 @@
+import os
+import time
+from io import BytesIO
+import pytest
+from app.core.csv_service import CSVService, sidecar_paths
+from app.core.retention import StorageRetention, UploadPins
+from app.core.upload_sessions import UPLOADS_DIR, UploadSessionStore
+
+# Far enough ahead that freshly written objects are past their grace period
+LATER = time.time() + 3600
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def upload(csv_service, content: bytes, accessed: float):
+    path = csv_service.save_upload("data.csv", BytesIO(content))
+    os.utime(path, (accessed, accessed), follow_symlinks=False)
+    return path
+
+
+def object_size(path) -> int:
+    sidecars = sidecar_paths(path.resolve())
+    return path.stat().st_size + sum(sidecar.stat().st_size for sidecar in sidecars)
+
+
+def test_quota_evicts_least_recently_accessed_first(csv_service):
+    oldest = upload(csv_service, b"a\n" + b"1\n" * 500, 100)
+    newest = upload(csv_service, b"a\n" + b"2\n" * 500, 300)
+    middle = upload(csv_service, b"a\n" + b"3\n" * 500, 200)
+    retention = StorageRetention(csv_service, max_bytes=object_size(newest) * 2)
+
+    stats = retention.collect(now=LATER)
+
+    assert not oldest.exists() and newest.exists() and middle.exists()
+    assert stats.uploads_evicted == 1
+    assert stats.objects_deleted == 1
+    assert stats.bytes_used <= retention.max_bytes
+    assert len(list(csv_service.objects_path.glob("*.csv"))) == 2
+
+
+def test_max_age_and_shared_objects(csv_service):
+    content = b"a\n1\n"
+    stale = upload(csv_service, content, LATER - 7200)
+    fresh = upload(csv_service, content, LATER)
+    retention = StorageRetention(csv_service, max_age=3600)
+
+    stats = retention.collect(now=LATER)
+
+    assert not stale.exists() and fresh.exists()
+    # The object is still linked by the fresh upload
+    assert stats.objects_deleted == 0
+    assert fresh.read_bytes() == content
+
+
+def test_pinned_uploads_are_kept(csv_service):
+    pins = UploadPins()
+    path = upload(csv_service, b"a\n1\n", 0)
+    retention = StorageRetention(csv_service, max_age=1, pins=pins)
+
+    with pins.pin(path.name):
+        stats = retention.collect(now=LATER)
+
+    assert path.exists()
+    assert stats.pinned_skipped == 1
+    assert retention.collect(now=LATER).uploads_evicted == 1
+    assert not path.exists()
+
+
+def test_hold_pins_until_the_stream_ends():
+    pins = UploadPins()
+
+    stream = pins.hold("data.csv", iter([b"a", b"b"]))
+    assert pins.is_pinned("data.csv")
+    assert list(stream) == [b"a", b"b"]
+    assert not pins.is_pinned("data.csv")
+
+    # A response whose body never starts is only dropped
+    stream = pins.hold("data.csv", iter([b"a"]))
+    del stream
+    assert not pins.is_pinned("data.csv")
+
+
+def test_orphans_are_deleted_after_grace(csv_service):
+    path = upload(csv_service, b"a\n1\n", LATER)
+    path.unlink()
+    retention = StorageRetention(csv_service)
+
+    assert retention.collect().objects_deleted == 0
+    assert retention.collect(now=LATER).objects_deleted == 1
+    assert not list(csv_service.objects_path.iterdir())
+
+
+def test_touch_marks_access(csv_service):
+    path = upload(csv_service, b"a\n1\n", 100)
+
+    csv_service.touch(path.name)
+
+    assert path.lstat().st_mtime > 100
+
+
+def test_idle_upload_sessions_expire(csv_service):
+    sessions = UploadSessionStore(csv_service.storage_path / UPLOADS_DIR)
+    session = sessions.create("a.csv", 10, "user_info")
+    retention = StorageRetention(csv_service, max_age=60)
+
+    assert retention.collect().sessions_expired == 0
+    stats = retention.collect(now=LATER)
+
+    assert stats.sessions_expired == 1
+    assert not session.path.exists()
@@ -0,0 +1,42 @@
+from collections import Counter
+import pytest
+from app.core.sampling import ReservoirSampler, wilson_interval
+
+
+def test_reservoir_keeps_everything_until_full():
+    sampler = ReservoirSampler(10, seed=1)
+    sampler.offer([1, 2, 3])
+    sampler.offer([4])
+
+    assert sampler.items == [1, 2, 3, 4]
+    assert sampler.seen == 4
+
+
+def test_reservoir_is_uniform_across_batches():
+    counts = Counter()
+    for seed in range(500):
+        sampler = ReservoirSampler(20, seed=seed)
+        for start in range(0, 1000, 37):
+            sampler.offer(range(start, min(start + 37, 1000)))
+        assert len(sampler.items) == 20
+        assert len(set(sampler.items)) == 20
+        counts.update(item // 100 for item in sampler.items)
+
+    # 1000 picks per decile expected
+    assert all(900 < counts[decile] < 1100 for decile in range(10))
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(10, 1000)
+
+    assert low < 0.01 < high
+    assert wilson_interval(0, 1000)[0] == 0
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_wilson_interval_finite_population():
+    wide = wilson_interval(10, 1000)
+    narrow = wilson_interval(10, 1000, population=1200)
+
+    assert narrow[1] - narrow[0] < wide[1] - wide[0]
+    assert wilson_interval(10, 1000, population=1000) == pytest.approx((0.01, 0.01))
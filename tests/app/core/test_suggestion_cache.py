@@ -0,0 +1,80 @@
+import pytest
+from pydantic import BaseModel
+from app.core.mapping_strategies.case_insensitive import CaseInsensitiveMappingStrategy
+from app.core.mapping_strategies.fuzzy_match import FuzzyMatchMappingStrategy
+from app.core.repository import SQLiteRepository
+from app.core.suggestion_cache import (
+    LRUSuggestionStore,
+    SuggestionCache,
+    suggestion_key,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return SQLiteRepository(str(tmp_path / "test.db"))
+
+
+def test_suggestion_key_depends_on_every_input(dummy_schema, monkeypatch):
+    class OtherSchema(BaseModel):
+        username: str
+
+    fuzzy = FuzzyMatchMappingStrategy()
+    base = suggestion_key(dummy_schema, ["a", "b"], None, fuzzy)
+
+    assert base == suggestion_key(dummy_schema, ["a", "b"], None, fuzzy)
+    assert base != suggestion_key(dummy_schema, ["b", "a"], None, fuzzy)
+    assert base != suggestion_key(dummy_schema, ["a", "b"], "saved", fuzzy)
+    assert base != suggestion_key(OtherSchema, ["a", "b"], None, fuzzy)
+    assert base != suggestion_key(
+        dummy_schema, ["a", "b"], None, CaseInsensitiveMappingStrategy()
+    )
+
+    monkeypatch.setattr("app.core.suggestion_cache.SUGGESTION_VERSION", 2)
+    assert base != suggestion_key(dummy_schema, ["a", "b"], None, fuzzy)
+
+
+def test_lru_store_evicts_least_recently_used():
+    store = LRUSuggestionStore(max_entries=2)
+    store.put("a", None, {"email": "a"})
+    store.put("b", None, {"email": "b"})
+    store.get("a")
+    store.put("c", None, {"email": "c"})
+
+    assert store.get("b") is None
+    assert store.get("a") == {"email": "a"}
+    assert len(store) == 2
+
+
+def test_lru_store_returns_copies():
+    store = LRUSuggestionStore()
+    store.put("a", None, {"email": "a"})
+    store.get("a")["email"] = "changed"
+
+    assert store.get("a") == {"email": "a"}
+
+
+def test_invalidate_mapping():
+    store = LRUSuggestionStore()
+    store.put("a", "saved", {"email": "a"})
+    store.put("b", None, {"email": "b"})
+    store.invalidate_mapping("saved")
+
+    assert store.get("a") is None
+    assert store.get("b") == {"email": "b"}
+
+
+def test_persistent_tier_is_promoted(repo):
+    SuggestionCache(LRUSuggestionStore(), repo).put("a", "saved", {"email": "a"})
+
+    memory = LRUSuggestionStore()
+    cache = SuggestionCache(memory, repo)
+    assert cache.get("a", "saved") == {"email": "a"}
+    assert memory.get("a") == {"email": "a"}
+
+
+def test_saving_mapping_invalidates_persisted_suggestions(repo):
+    repo.save_suggestion("a", "saved", {"email": "a"})
+    repo.save_mapping("saved", {"email": "e"})
+
+    assert repo.get_suggestion("a") is None
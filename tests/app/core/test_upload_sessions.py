@@ -0,0 +1,118 @@
+import gzip
+import pytest
+from app.core.csv_service import CSVService
+from app.core.upload_sessions import MIN_CHUNK_SIZE, UPLOADS_DIR, UploadSessionStore
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+@pytest.fixture
+def sessions(csv_service):
+    return UploadSessionStore(csv_service.storage_path / UPLOADS_DIR)
+
+
+def make_content(rows: int) -> bytes:
+    lines = ["name,email"] + [f"user{i},user{i}@example.com" for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def put_chunk(session, index: int, content: bytes):
+    size = session.info.chunk_size
+    writer = session.open_chunk(index)
+    writer.write(content[index * size : (index + 1) * size])
+    return writer.close()
+
+
+def test_chunks_out_of_order_assemble_in_place(sessions, csv_service):
+    content = make_content(10_000)
+    session = sessions.create("users.csv", len(content), "user_info", MIN_CHUNK_SIZE)
+    chunks = list(range(session.info.chunk_count))
+
+    for index in reversed(chunks[1:]):
+        put_chunk(session, index, content)
+    assert session.missing_chunks() == [0]
+    header = put_chunk(session, 0, content)
+
+    assert header.columns == ["name", "email"]
+    assert sessions.get(session.info.upload_id).header == header
+    assert session.received_chunks() == chunks
+
+    data_path = sessions.take_data(session.info.upload_id)
+    saved_path = csv_service.store_file("users.csv", data_path)
+
+    assert saved_path.read_bytes() == content
+    assert csv_service.get_profile(saved_path.name).row_count == 10_000
+    with pytest.raises(KeyError):
+        sessions.get(session.info.upload_id)
+
+
+def test_short_or_long_chunks_are_not_received(sessions):
+    content = make_content(10_000)
+    session = sessions.create("users.csv", len(content), "user_info", MIN_CHUNK_SIZE)
+
+    writer = session.open_chunk(0)
+    writer.write(content[:100])
+    with pytest.raises(ValueError):
+        writer.close()
+    writer = session.open_chunk(1)
+    with pytest.raises(ValueError):
+        writer.write(content[: MIN_CHUNK_SIZE + 1])
+    writer.abort()
+
+    assert session.received_chunks() == []
+    with pytest.raises(IndexError):
+        session.open_chunk(session.info.chunk_count)
+
+
+def test_take_data_needs_every_chunk(sessions):
+    content = make_content(10)
+    session = sessions.create("users.csv", len(content), "user_info", MIN_CHUNK_SIZE)
+
+    with pytest.raises(ValueError):
+        sessions.take_data(session.info.upload_id)
+    put_chunk(session, 0, content)
+    sessions.take_data(session.info.upload_id)
+    with pytest.raises(KeyError):
+        sessions.take_data(session.info.upload_id)
+
+
+def test_suggestion_goes_with_the_session(sessions):
+    content = make_content(10)
+    session = sessions.create("users.csv", len(content), "user_info", MIN_CHUNK_SIZE)
+
+    assert session.suggestion is None
+    session.set_suggestion({"username": "name", "email": None})
+    assert sessions.get(session.info.upload_id).suggestion == {
+        "username": "name",
+        "email": None,
+    }
+    sessions.delete(session.info.upload_id)
+    with pytest.raises(FileNotFoundError):
+        session.set_suggestion({"username": "name"})
+
+
+def test_create_rejects_bad_chunk_size_and_ids(sessions):
+    with pytest.raises(ValueError):
+        sessions.create("users.csv", 10, "user_info", chunk_size=1)
+    with pytest.raises(KeyError):
+        sessions.get("../objects")
+
+
+def test_compressed_upload_header_from_first_chunk(sessions, csv_service):
+    content = make_content(50_000)
+    compressed = gzip.compress(content)
+    session = sessions.create("u.csv.gz", len(compressed), "user_info", MIN_CHUNK_SIZE)
+
+    header = put_chunk(session, 0, compressed)
+    for index in range(1, session.info.chunk_count):
+        put_chunk(session, index, compressed)
+    saved_path = csv_service.store_file(
+        "u.csv.gz", sessions.take_data(session.info.upload_id)
+    )
+
+    assert session.info.chunk_count > 1
+    assert header.columns == ["name", "email"]
+    assert saved_path.read_bytes() == content
@@ -0,0 +1,124 @@
+import threading
+import pytest
+from pydantic import BaseModel
+from app.core.validation_jobs import (
+    ERROR,
+    FAILED,
+    PASSED,
+    PENDING,
+    SUCCEEDED,
+    QueueFull,
+    ValidationJobManager,
+    job_key,
+)
+
+
+class Schema(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def manager():
+    manager = ValidationJobManager(workers=1, max_pending=2, max_finished=2)
+    yield manager
+    manager.shutdown()
+
+
+def wait(job):
+    for _ in range(500):
+        if job.finished:
+            return job.snapshot()
+        threading.Event().wait(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_key():
+    key = job_key("abc", {"name": "n", "age": None}, Schema)
+
+    assert key == job_key("abc", {"age": None, "name": "n"}, Schema)
+    assert key != job_key("abc", {"name": "m", "age": None}, Schema)
+    assert key != job_key("def", {"name": "n", "age": None}, Schema)
+
+
+def test_job_reports_progress(manager):
+    def work(job):
+        job.add_rows(10)
+        job.add_rows(5)
+        job.validated("A", None)
+        job.validated("B", "bad")
+        return {"B": "bad"}
+
+    job, created = manager.submit("key", "file.csv", ["A", "B"], work, 15)
+    snapshot = wait(job)
+
+    assert created
+    assert snapshot.status == FAILED
+    assert snapshot.rows_scanned == 15
+    assert snapshot.total_rows == 15
+    assert [(v.category, v.status, v.error) for v in snapshot.validators] == [
+        ("A", PASSED, None),
+        ("B", FAILED, "bad"),
+    ]
+    assert snapshot.errors == {"B": "bad"}
+    assert snapshot.finished_at >= snapshot.started_at >= snapshot.created_at
+    assert manager.get(job.job_id) is job
+
+
+def test_duplicate_submissions_share_one_job(manager):
+    release = threading.Event()
+    runs = []
+
+    def work(job):
+        runs.append(job.job_id)
+        release.wait(5)
+        return {}
+
+    first, created = manager.submit("key", "file.csv", ["A"], work)
+    second, created_again = manager.submit("key", "file.csv", ["A"], work)
+    release.set()
+    wait(first)
+    # Finished results are reused as well
+    third, _ = manager.submit("key", "file.csv", ["A"], work)
+
+    assert created and not created_again
+    assert first is second is third
+    assert runs == [first.job_id]
+    assert first.snapshot().status == SUCCEEDED
+
+
+def test_errored_job_is_retried(manager):
+    def broken(job):
+        raise OSError("disk gone")
+
+    job, _ = manager.submit("key", "file.csv", ["A"], broken)
+    snapshot = wait(job)
+    retry, created = manager.submit("key", "file.csv", ["A"], lambda job: {})
+
+    assert snapshot.status == ERROR
+    assert snapshot.error == "disk gone"
+    assert snapshot.validators[0].status != PENDING
+    assert created and retry is not job
+    assert wait(retry).status == SUCCEEDED
+
+
+def test_queue_is_bounded(manager):
+    release = threading.Event()
+
+    def work(job):
+        release.wait(5)
+        return {}
+
+    first, _ = manager.submit("a", "file.csv", [], work)
+    manager.submit("b", "file.csv", [], work)
+    with pytest.raises(QueueFull):
+        manager.submit("c", "file.csv", [], work)
+    release.set()
+    wait(first)
+
+
+def test_oldest_finished_jobs_are_forgotten(manager):
+    jobs = [wait(manager.submit(key, "f.csv", [], lambda job: {})[0]) for key in "abc"]
+
+    with pytest.raises(KeyError):
+        manager.get(jobs[0].job_id)
+    assert manager.get(jobs[2].job_id).job_id == jobs[2].job_id
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from pydantic import BaseModel, EmailStr, Field
+from app.core.csv_service import CSVService
+from app.core.validators.exceptions import ValidationException
+from app.core.schemas.field_checks import compile_field_checks
+from app.core.validators.field_types import FieldTypeValidator
+
+
+class TypedSchema(BaseModel):
+    email: EmailStr
+    age: int | None = Field(None, ge=0)
+    score: float | None = None
+    active: bool | None = None
+    code: str | None = Field(None, max_length=3, pattern="^[A-Z]")
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def invalid(field: str, values: list) -> list:
+    series = pd.Series(values, dtype=str)
+    mask = pd.Series(False, index=series.index)
+    for check in compile_field_checks(TypedSchema.model_fields[field]):
+        mask |= check.invalid(series).fillna(True).astype(bool)
+    return mask.tolist()
+
+
+def test_compiled_checks():
+    assert invalid("email", ["a@b.com", "nope", "a@b"]) == [False, True, True]
+    assert invalid("age", ["1", " 2 ", "3.0", "x", "-1", "1e3"]) == [
+        False,
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert invalid("score", ["1.5", "1e3", "abc"]) == [False, False, True]
+    assert invalid("active", ["True", "no", "maybe"]) == [False, False, True]
+    assert invalid("code", ["ABC", "ABCD", "abc"]) == [False, True, True]
+
+
+def test_valid_file(csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("m,a\nx@y.com,1\nz@y.com,\n")
+    validator = FieldTypeValidator("file.csv", csv_service)
+
+    validator.validate({"email": "m", "age": "a"}, TypedSchema)
+
+
+def test_reports_counts_and_first_rows(csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("m,a\nbad,1\nx@y.com,x\nbad,2\nbad,3\n,4\n")
+    validator = FieldTypeValidator("file.csv", csv_service, max_reported_rows=2)
+
+    with pytest.raises(ValidationException) as exc_info:
+        validator.validate({"email": "m", "age": "a"}, TypedSchema)
+
+    assert str(exc_info.value) == (
+        "email (m): 3 invalid value(s), not a valid email, first rows [0, 2]; "
+        "age (a): 1 invalid value(s), not an integer, first rows [1]"
+    )
+
+
+def test_ignores_unmapped_and_missing_columns(csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("m\nbad\n")
+    validator = FieldTypeValidator("file.csv", csv_service)
+
+    validator.validate({"email": "not_in_file", "age": None}, TypedSchema)
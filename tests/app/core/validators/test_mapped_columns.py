@@ -0,0 +1,33 @@
+import pytest
+from app.core.csv_service import CSVService
+from app.core.validators.exceptions import ValidationException
+from app.core.validators.mapped_columns import MappedColumnsValidator
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def test_mapped_columns_in_file(dummy_schema, csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("u,e,p\nuser-1,user-1@email.com,1\n")
+    validator = MappedColumnsValidator("file.csv", csv_service)
+    validator.validate(
+        {"username": "u", "email": "e", "phone_number": None}, dummy_schema
+    )
+
+
+def test_mapped_columns_not_in_file(dummy_schema, csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("u,e\nuser-1,user-1@email.com\n")
+    validator = MappedColumnsValidator("file.csv", csv_service)
+    mapping = {"username": "u", "email": "mail", "phone_number": "phone"}
+
+    with pytest.raises(ValidationException, match="Not in file: mail, phone"):
+        validator.validate(mapping, dummy_schema)
+
+
+def test_missing_file_raises(dummy_schema, csv_service):
+    validator = MappedColumnsValidator("missing.csv", csv_service)
+
+    with pytest.raises(FileNotFoundError):
+        validator.validate({"username": "u"}, dummy_schema)
@@ -1,45 +1,56 @@
 import re
+from io import BytesIO
 import pytest
-import pandas as pd
 from app.core.validators.missing_value_columns import MissingValueColumnsValidator
 from app.core.validators.exceptions import ValidationException
 from app.core.csv_service import CSVService
-from unittest.mock import MagicMock
 
 
 @pytest.fixture
-def mock_csv_service():
-    mock = MagicMock(spec=CSVService)
-    return mock
-
-
-def test_no_missing_value_columns(dummy_schema, mock_csv_service):
-    mock_csv_service.get_file_df.return_value = pd.DataFrame(
-        [
-            [
-                ["user-1", "user-1@email.com", "12351521"],
-                ["user-2", "user-2@email.com", "12351522"],
-                ["user-3", "user-3@email.com", "12351523"],
-            ]
-        ],
-        columns=["u", "e", "p"],
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def test_no_missing_value_columns(dummy_schema, csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text(
+        "u,e,p\n"
+        "user-1,user-1@email.com,12351521\n"
+        "user-2,user-2@email.com,12351522\n"
+        "user-3,user-3@email.com,12351523\n"
     )
-    validator = MissingValueColumnsValidator("file.csv", mock_csv_service)
+    validator = MissingValueColumnsValidator("file.csv", csv_service)
     mapping = {"username": "u", "email": "e", "phone_number": "p"}
     validator.validate(mapping, dummy_schema)
 
 
-def test_has_missing_value_columns(dummy_schema, mock_csv_service):
-    mock_csv_service.get_file_df.return_value = pd.DataFrame(
-        [
-            ["user-1", "user-1@email.com", "12351521"],
-            [pd.NA, "user-2@email.com", "12351522"],
-            ["user-3", pd.NA, "12351523"],
-        ],
-        columns=["u", "e", "p"],
+def test_has_missing_value_columns(dummy_schema, csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text(
+        "u,e,p\n"
+        "user-1,user-1@email.com,12351521\n"
+        ",user-2@email.com,12351522\n"
+        "user-3,,12351523\n"
     )
-    validator = MissingValueColumnsValidator("file.csv", mock_csv_service)
+    validator = MissingValueColumnsValidator("file.csv", csv_service)
     mapping = {"username": "u", "email": "e", "phone_number": "p"}
     expected_error_message = "NA(s) exist in: e, u"
     with pytest.raises(ValidationException, match=re.escape(expected_error_message)):
         validator.validate(mapping, dummy_schema)
+
+
+def test_optional_column_na_is_ignored(dummy_schema, csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("u,e,p\nuser-1,user-1@email.com,\n")
+    validator = MissingValueColumnsValidator("file.csv", csv_service)
+    mapping = {"username": "u", "email": "e", "phone_number": "p"}
+    validator.validate(mapping, dummy_schema)
+
+
+def test_uses_upload_profile(dummy_schema, csv_service):
+    saved_path = csv_service.save_upload(
+        "file.csv", BytesIO(b"u,e\nuser-1,\nuser-2,user-2@email.com\n")
+    )
+    # Remove the data so only the profile can answer
+    saved_path.write_text("u,e\n")
+
+    validator = MissingValueColumnsValidator(saved_path.name, csv_service)
+    with pytest.raises(ValidationException, match="NA\\(s\\) exist in: e"):
+        validator.validate({"username": "u", "email": "e"}, dummy_schema)
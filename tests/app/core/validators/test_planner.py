@@ -0,0 +1,148 @@
+import pytest
+from pydantic import BaseModel
+from app.core.csv_service import CSVService
+from app.core.schemas.user_info import UserInfo
+from app.core.validators.base import BaseValidator, ValueScan
+from app.core.validators.field_types import FieldTypeValidator
+from app.core.validators.missing_value_columns import MissingValueColumnsValidator
+from app.core.validators.planner import ValidationPlanner
+from app.core.validators.required_columns import RequiredColumnsValidator
+
+
+class Schema(BaseModel):
+    name: str
+    age: int
+
+
+class RowCount(ValueScan):
+    def __init__(self, column):
+        self.column = column
+        self.rows = 0
+
+    @property
+    def columns(self):
+        return {self.column}
+
+    def consume(self, chunk):
+        self.rows += len(chunk)
+
+    def merge(self, other, row_offset):
+        self.rows += other.rows
+
+
+class RowCounter(BaseValidator):
+    def __init__(self):
+        self.rows = 0
+
+    def value_scan(self, mapping, schema_class):
+        return RowCount(mapping["name"])
+
+    def validate(self, mapping, schema_class, scan=None):
+        self.rows = scan.values["Rows"].rows
+
+    def validation_category(self) -> str:
+        return "Rows"
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def test_validators_share_one_scan(csv_service, tmp_path, monkeypatch):
+    (tmp_path / "file.csv").write_text("n,a\nann,1\n,x\nbob,3\n")
+    scans = []
+    iter_chunks = csv_service.iter_chunks
+
+    def counting_iter_chunks(filename, columns, *args, **kwargs):
+        scans.append(set(columns))
+        return iter_chunks(filename, columns, *args, **kwargs)
+
+    monkeypatch.setattr(csv_service, "iter_chunks", counting_iter_chunks)
+    counter = RowCounter()
+    validators = [
+        RequiredColumnsValidator(),
+        MissingValueColumnsValidator("file.csv", csv_service),
+        FieldTypeValidator("file.csv", csv_service),
+        counter,
+    ]
+
+    errors = ValidationPlanner("file.csv", csv_service).run(
+        validators, {"name": "n", "age": "a"}, Schema
+    )
+
+    assert scans == [{"n", "a"}]
+    assert counter.rows == 3
+    assert errors == {
+        "NA values": "NA(s) exist in: n",
+        "Field types": "age (a): 1 invalid value(s), not an integer, first rows [1]",
+    }
+
+
+def test_mapping_only_validators_skip_the_scan(csv_service, monkeypatch):
+    monkeypatch.setattr(csv_service, "get_profile", None)
+
+    errors = ValidationPlanner("missing.csv", csv_service).run(
+        [RequiredColumnsValidator()], {"name": "n"}, Schema
+    )
+
+    assert errors == {"Required Mapping": "Missing required mappings for: age"}
+
+
+def test_run_reports_progress(csv_service, tmp_path):
+    (tmp_path / "file.csv").write_text("n,a\nann,1\n,x\nbob,3\n")
+    rows = []
+    validated = []
+
+    ValidationPlanner("file.csv", csv_service).run(
+        [RequiredColumnsValidator(), RowCounter()],
+        {"name": "n", "age": "a"},
+        Schema,
+        progress=rows.append,
+        on_validated=lambda category, error: validated.append((category, error)),
+    )
+
+    assert sum(rows) == 3
+    assert validated == [("Required Mapping", None), ("Rows", None)]
+
+
+def test_parallel_scan_checks_values(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.csv_service.SCAN_RANGE_BYTES", 256)
+    rows = [f"user{i},user{i}@example.com" for i in range(100)]
+    for i in (3, 42, 97):
+        rows[i] = f"user{i},broken{i}"
+    rows[60] = "user60,"
+    (tmp_path / "file.csv").write_text("u,e\n" + "\n".join(rows) + "\n")
+    mapping = {"username": "u", "email": "e"}
+
+    def run(csv_service, parallel):
+        validators = [
+            MissingValueColumnsValidator("file.csv", csv_service),
+            FieldTypeValidator("file.csv", csv_service),
+        ]
+        progress = []
+        planner = ValidationPlanner("file.csv", csv_service, parallel=parallel)
+        errors = planner.run(validators, mapping, UserInfo, progress=progress.append)
+        return errors, sum(progress)
+
+    serial = CSVService(storage_path=tmp_path)
+    parallel = CSVService(storage_path=tmp_path, scan_workers=2)
+    scan_ranges = parallel.scan_ranges
+    calls = []
+
+    def counting_scan_ranges(*args):
+        calls.append(args)
+        return scan_ranges(*args)
+
+    monkeypatch.setattr(parallel, "scan_ranges", counting_scan_ranges)
+
+    assert run(parallel, True) == run(serial, False)
+    assert len(calls) == 1
+    assert run(serial, False) == (
+        {
+            "NA values": "NA(s) exist in: e",
+            "Field types": "email (e): 3 invalid value(s), not a valid email, "
+            "first rows [3, 42, 97]",
+        },
+        100,
+    )
@@ -0,0 +1,75 @@
+from io import BytesIO
+import pytest
+from pydantic import BaseModel, EmailStr
+from app.core.csv_service import CSVService
+from app.core.validators.preview import PreviewValidator
+
+
+class Contact(BaseModel):
+    email: EmailStr
+    age: int | None = None
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    return CSVService(storage_path=tmp_path)
+
+
+def make_upload(csv_service, rows: int) -> str:
+    lines = ["mail,years,extra"]
+    for i in range(rows):
+        email = "broken" if i % 10 == 0 else f"u{i}@example.com"
+        age = "" if i % 4 == 0 else str(i)
+        lines.append(f"{email},{age},x")
+    content = ("\n".join(lines) + "\n").encode("utf-8")
+    return csv_service.save_upload("contacts.csv", BytesIO(content)).name
+
+
+def test_preview_estimates_rates_from_the_sample(csv_service):
+    filename = make_upload(csv_service, 20_000)
+
+    preview = PreviewValidator(filename, csv_service).run(
+        {"email": "mail", "age": "years"}, Contact
+    )
+
+    assert preview.row_count == 20_000
+    assert preview.sample_size == 2000
+    email = preview.fields["email"]
+    assert email.required
+    # The sample is random, 0.03 is more than four standard errors
+    assert email.invalid.rate == pytest.approx(0.1, abs=0.03)
+    assert email.invalid.low < email.invalid.rate < email.invalid.high
+    assert not email.invalid.exact
+    assert email.failed_checks == ["not a valid email"]
+    # NA rates come from the upload profile
+    age = preview.fields["age"]
+    assert age.na.exact and age.na.rate == 0.25
+    assert age.invalid.rate == 0
+
+
+def test_small_files_are_exact(csv_service):
+    filename = make_upload(csv_service, 100)
+
+    preview = PreviewValidator(filename, csv_service).run({"email": "mail"}, Contact)
+
+    assert preview.fields["email"].invalid.exact
+    assert preview.fields["email"].invalid.rate == 0.1
+
+
+def test_missing_required_and_unknown_columns(csv_service):
+    filename = make_upload(csv_service, 10)
+
+    preview = PreviewValidator(filename, csv_service).run({"age": "nope"}, Contact)
+
+    assert preview.missing_required == ["email"]
+    assert preview.unknown_columns == ["nope"]
+    assert preview.fields == {}
+
+
+def test_files_without_sample_are_sampled_once(csv_service):
+    (csv_service.storage_path / "plain.csv").write_text("mail\nbroken\na@b.com\n")
+
+    preview = PreviewValidator("plain.csv", csv_service).run({"email": "mail"}, Contact)
+
+    assert preview.sample_size == 2
+    assert preview.fields["email"].invalid.rate == 0.5
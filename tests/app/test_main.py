@@ -1,11 +1,31 @@
+import asyncio
+import gc
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
 import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
 from io import BytesIO
-from app.main import app, get_csv_service, get_repository, get_schema
+from app.main import (
+    app,
+    get_csv_service,
+    get_repository,
+    get_retention,
+    get_schema,
+    get_suggestion_cache,
+    retrieve_suggestion_error,
+    upload_pins,
+)
 from app.core.csv_service import CSVService
 from app.core.repository import SQLiteRepository
+from app.core.retention import StorageRetention
 from app.core.schemas.user_info import UserInfo
+from app.core.suggestion_cache import LRUSuggestionStore, SuggestionCache
+from app.core.validation_jobs import ValidationJobManager
 
 client = TestClient(app)
 
@@ -23,13 +43,19 @@ def test_setup(tmp_path):
     # Define the mock services
     mock_csv_service = CSVService(str(temp_storage))
     mock_repo = SQLiteRepository(str(temp_db))
+    suggestion_cache = SuggestionCache(LRUSuggestionStore(), mock_repo)
 
     # Apply overrides
     app.dependency_overrides[get_csv_service] = lambda: mock_csv_service
     app.dependency_overrides[get_repository] = lambda: mock_repo
     app.dependency_overrides[get_schema] = lambda: UserInfo
+    app.dependency_overrides[get_suggestion_cache] = lambda: suggestion_cache
 
-    yield {"repo": mock_repo, "storage": temp_storage}
+    yield {
+        "repo": mock_repo,
+        "storage": temp_storage,
+        "suggestion_cache": suggestion_cache,
+    }
 
     # Clear overrides after the test
     app.dependency_overrides = {}
@@ -74,6 +100,39 @@ def test_upload_file_too_large(test_setup):
     assert "exceeds 100MB" in response.json()["detail"]
 
 
+def test_upload_stream(test_setup):
+    csv_content = b"UserName,Email,Phone\nalice,alice@example.com,12345"
+
+    response = client.post(
+        "/upload/stream",
+        params={"filename": "users.csv"},
+        content=csv_content,
+        headers={"content-type": "text/csv"},
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["source_columns"] == ["UserName", "Email", "Phone"]
+    assert data["suggested_mapping"]["email"] == "Email"
+    saved_path = Path(test_setup["storage"]) / data["saved_filename"]
+    assert saved_path.read_bytes() == csv_content
+
+
+def test_upload_stream_too_large(test_setup, monkeypatch):
+    monkeypatch.setattr("app.main.MAX_FILE_SIZE", 10)
+
+    def body():
+        yield b"UserName,Email\n"
+        yield b"alice,alice@example.com\n"
+
+    response = client.post(
+        "/upload/stream", params={"filename": "users.csv"}, content=body()
+    )
+
+    assert response.status_code == 413
+    assert list(Path(test_setup["storage"]).glob("*users.csv")) == []
+
+
 def test_upload_with_saved_mapping(test_setup):
     # 1. Manually seed a mapping in our temp repo
     repo = test_setup["repo"]
@@ -117,6 +176,52 @@ def test_upload_file_no_header(test_setup):
     assert "suggested_mapping" in data
 
 
+def test_upload_suggestion_is_memoized(test_setup, monkeypatch):
+    csv_content = b"UserName,Email,Phone\nalice,alice@example.com,12345"
+    first = client.post(
+        "/upload", files={"file": ("a.csv", BytesIO(csv_content), "text/csv")}
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mapping engine should not run on a cache hit")
+
+    monkeypatch.setattr("app.main.MappingEngine.run", fail)
+    second = client.post(
+        "/upload", files={"file": ("b.csv", BytesIO(csv_content), "text/csv")}
+    )
+
+    assert second.status_code == 201
+    assert second.json()["suggested_mapping"] == first.json()["suggested_mapping"]
+
+
+def test_discarded_suggestion_error_is_retrieved():
+    async def discard_failed_suggestion():
+        loop = asyncio.get_running_loop()
+        unretrieved = []
+        loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+        suggestion = loop.create_future()
+        suggestion.add_done_callback(retrieve_suggestion_error)
+        suggestion.set_exception(ValueError("no mapping"))
+        await asyncio.sleep(0)
+        del suggestion
+        gc.collect()
+        return unretrieved
+
+    assert asyncio.run(discard_failed_suggestion()) == []
+
+
+def test_process_invalidates_memoized_suggestions(test_setup):
+    cache = test_setup["suggestion_cache"]
+    cache.put("key", "new_mapping", {"email": "stale"})
+
+    response = client.post(
+        "/process", json={"mapping_name": "new_mapping", "mapping": {"email": "e"}}
+    )
+
+    assert response.status_code == 200
+    assert cache.get("key", "new_mapping") is None
+
+
 def test_upload_file_mapping_not_found(test_setup):
     """
     Verify that providing a non-existent mapping name returns
@@ -167,7 +272,32 @@ def test_validate_failed(test_setup):
     assert response.status_code == 400
     assert (
         response.json()["detail"]
-        == "Required Mapping: Missing required mappings for: username\nNA values: NA(s) exist in: e"
+        == "Required Mapping: Missing required mappings for: username\n"
+        "Mapped columns: Not in file: p\nNA values: NA(s) exist in: e"
+    )
+
+
+def test_validate_missing_file(test_setup):
+    response = client.post(
+        "/validate",
+        json={"filename": "nope.csv", "mapping": {"username": "u", "email": "e"}},
+    )
+
+    assert response.status_code == 404
+
+
+def test_validate_invalid_field_types(test_setup):
+    csv_content = b"u,e\nalice,alice@example.com\nbob,not-an-email"
+    with open(test_setup["storage"] / "abc.csv", "wb") as f:
+        f.write(csv_content)
+
+    response = client.post(
+        "/validate",
+        json={"filename": "abc.csv", "mapping": {"username": "u", "email": "e"}},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Field types: email (e): 1 invalid value(s), not a valid email, first rows [1]"
     )
 
 
@@ -187,3 +317,494 @@ def test_process_and_save_unique_name_check(test_setup):
         response.json()["detail"]
         == f"Mapping name '{used_mapping_name}' already exists. Please choose another."
     )
+
+
+def test_metrics_report_upload_stages(test_setup):
+    client.post(
+        "/upload",
+        files={"file": ("users.csv", BytesIO(b"UserName,Email\nalice,a@b.com\n"))},
+    )
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'column_mapper_stage_seconds_count{stage="upload.store"}' in response.text
+    assert 'column_mapper_stage_seconds_count{stage="upload.suggest"}' in response.text
+    assert 'column_mapper_request_seconds_count{route="POST /upload"}' in response.text
+    assert 'column_mapper_bytes_written_total{stage="upload"}' in response.text
+
+
+def test_request_time_covers_streamed_body(test_setup, monkeypatch):
+    (test_setup["storage"] / "file.csv").write_text("User\nann\n")
+    observed = []
+    monkeypatch.setattr(
+        "app.main.REQUEST_SECONDS.observe",
+        lambda route, seconds: observed.append((route, seconds)),
+    )
+
+    def slow_rows():
+        yield "username\n"
+        time.sleep(0.2)
+        yield "ann\n"
+
+    monkeypatch.setattr(
+        "app.main.MappedExporter.iter_format", lambda self, f: slow_rows()
+    )
+    client.post(
+        "/export", json={"filename": "file.csv", "mapping": {"username": "User"}}
+    )
+
+    assert observed[0][0] == "POST /export"
+    assert observed[0][1] >= 0.2
+
+
+def test_profile_requested_by_header(test_setup, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.main.PROFILE_DIR", str(tmp_path / "profiles"))
+
+    client.get("/mappings", headers={"X-Profile": "1"})
+    monkeypatch.setattr("app.main.PROFILE_TOKEN", "secret")
+    client.get("/mappings")
+    client.get("/mappings", headers={"X-Profile": "wrong"})
+    assert not (tmp_path / "profiles").exists()
+
+    client.get("/mappings", headers={"X-Profile": "secret"})
+    assert [path.name.split("-")[2] for path in (tmp_path / "profiles").iterdir()] == [
+        "mappings"
+    ]
+
+
+def test_batch_suggestions(test_setup):
+    test_setup["repo"].save_mapping("saved", {"phone": "Tel"})
+
+    response = client.post(
+        "/suggestions/batch",
+        json={
+            "headers": [["UserName", "E_Mail"], ["Tel"], ["UserName", "E_Mail"]],
+            "apply_mapping_name": "saved",
+        },
+    )
+
+    assert response.status_code == 200
+    suggestions = [item["suggested_mapping"] for item in response.json()["suggestions"]]
+    assert suggestions == [
+        {"username": "UserName", "email": "E_Mail", "phone": "Tel"},
+        {"username": None, "email": None, "phone": "Tel"},
+        {"username": "UserName", "email": "E_Mail", "phone": "Tel"},
+    ]
+    assert len(test_setup["suggestion_cache"].memory) == 2
+
+
+def test_batch_suggestions_from_files(test_setup):
+    response = client.post(
+        "/suggestions/batch/files",
+        files=[
+            ("files", ("a.csv", BytesIO(b"UserName,Email\n"), "text/csv")),
+            ("files", ("b.csv", BytesIO(b"mail;login\nx;y\n"), "text/csv")),
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.json()["suggestions"][1] == {
+        "filename": "b.csv",
+        "source_columns": ["mail", "login"],
+        "suggested_mapping": {"username": None, "email": "mail", "phone": None},
+    }
+    assert list(test_setup["storage"].iterdir()) == [test_setup["storage"] / "objects"]
+
+
+def test_batch_suggestions_size_limit(test_setup, monkeypatch):
+    monkeypatch.setattr("app.main.MAX_BATCH_HEADERS", 1)
+
+    response = client.post("/suggestions/batch", json={"headers": [["a"], ["b"]]})
+
+    assert response.status_code == 413
+
+
+def test_export_with_saved_mapping(test_setup):
+    test_setup["repo"].save_mapping("saved", {"username": "User", "email": "Mail"})
+    (test_setup["storage"] / "file.csv").write_text("User,Mail,Other\nann,a@b.com,x\n")
+
+    response = client.post(
+        "/export",
+        json={"filename": "file.csv", "mapping_name": "saved", "format": "ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == '{"username":"ann","email":"a@b.com"}\n'
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=\"file.ndjson\"; filename*=UTF-8''file.ndjson"
+    )
+
+
+def test_export_filename_is_escaped(test_setup):
+    filename = 'résumé"; x=.csv'
+    (test_setup["storage"] / filename).write_text("User\nann\n")
+
+    response = client.post(
+        "/export", json={"filename": filename, "mapping": {"username": "User"}}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="r_sum__; x=.csv"; '
+        "filename*=UTF-8''r%C3%A9sum%C3%A9%22%3B%20x%3D.csv"
+    )
+
+
+def test_export_errors(test_setup, monkeypatch):
+    (test_setup["storage"] / "file.csv").write_text("User\nann\n")
+
+    response = client.post(
+        "/export", json={"filename": "../file.csv", "mapping": {"username": "User"}}
+    )
+    assert response.status_code == 404
+
+    response = client.post(
+        "/export", json={"filename": "file.csv", "mapping": {"email": "Mail"}}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Mapped columns not in file: Mail"
+
+    monkeypatch.setattr("app.main.parquet_available", lambda: False)
+    response = client.post(
+        "/export",
+        json={
+            "filename": "file.csv",
+            "mapping": {"username": "User"},
+            "format": "parquet",
+        },
+    )
+    assert response.status_code == 400
+
+
+def test_load_mapped_rows(test_setup, tmp_path, monkeypatch):
+    db_path = tmp_path / "load.db"
+    monkeypatch.setattr("app.main.LOAD_DB_PATH", str(db_path))
+    (test_setup["storage"] / "file.csv").write_text(
+        "User,Mail\nann,a@b.com\nbob,b@c.com\n"
+    )
+
+    response = client.post(
+        "/load",
+        json={"filename": "file.csv", "mapping": {"username": "User", "email": "Mail"}},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["table"] == "user_info"
+    assert response.json()["rows_loaded"] == 2
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT * FROM user_info").fetchall() == [
+            ("ann", "a@b.com", None),
+            ("bob", "b@c.com", None),
+        ]
+
+
+def test_load_keeps_app_data_safe(test_setup, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.main.LOAD_DB_PATH", str(tmp_path / "load.db"))
+    test_setup["repo"].save_mapping("crm", {"username": "User"})
+    (test_setup["storage"] / "file.csv").write_text("User,Mail\nann,a@b.com\n")
+
+    reserved = client.post(
+        "/load",
+        json={
+            "filename": "file.csv",
+            "mapping": {"username": "User"},
+            "table": "mappings",
+            "replace": True,
+        },
+    )
+    missing = client.post(
+        "/load",
+        json={"filename": "file.csv", "mapping": {"username": "Login"}},
+    )
+
+    assert reserved.status_code == 400
+    assert missing.status_code == 400
+    assert missing.json()["detail"] == "Mapped columns not in file: Login"
+    assert test_setup["repo"].get_mapping("crm") == {"username": "User"}
+
+
+def test_upload_recommends_saved_mappings(test_setup):
+    test_setup["repo"].save_mapping("crm", {"username": "Login", "email": "Mail"})
+
+    response = client.post(
+        "/upload", files={"file": ("users.csv", BytesIO(b"login,MAIL,x\n1,2,3\n"))}
+    )
+
+    assert response.json()["recommended_mappings"] == [
+        {"name": "crm", "score": 0.8, "matched_columns": 2}
+    ]
+
+
+def test_list_mappings_pages(test_setup):
+    for name in ["crm", "Crm-eu", "shop"]:
+        test_setup["repo"].save_mapping(name, {"email": "e"})
+
+    first = client.get("/mappings", params={"prefix": "cr", "limit": 1}).json()
+    second = client.get(
+        "/mappings", params={"prefix": "cr", "limit": 1, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [m["name"] for m in first["mappings"]] == ["crm"]
+    assert [m["name"] for m in second["mappings"]] == ["Crm-eu"]
+    assert second["next_cursor"] is None
+    assert client.get("/mappings", params={"cursor": "x"}).status_code == 400
+
+
+def test_schema_query_param(test_setup):
+    app.dependency_overrides.pop(get_schema)
+    csv_content = b"UserName,Email\nalice,alice@example.com"
+
+    ok = client.post(
+        "/upload",
+        params={"schema": "user_info"},
+        files={"file": ("users.csv", BytesIO(csv_content), "text/csv")},
+    )
+    unknown = client.post(
+        "/upload",
+        params={"schema": "nope"},
+        files={"file": ("users.csv", BytesIO(csv_content), "text/csv")},
+    )
+
+    assert ok.status_code == 201
+    assert unknown.status_code == 400
+
+
+def test_list_schemas(test_setup):
+    response = client.get("/schemas").json()
+
+    assert response["default"] == "user_info"
+    user_info = next(s for s in response["schemas"] if s["name"] == "user_info")
+    assert user_info["fields"] == list(UserInfo.model_fields)
+
+
+def test_resumable_upload(test_setup):
+    content = b"UserName,Email\n" + b"alice,alice@example.com\n" * 5000
+    chunk_size = 64 * 1024
+    created = client.post(
+        "/uploads",
+        json={"filename": "users.csv", "size": len(content), "chunk_size": chunk_size},
+    ).json()
+    upload_id = created["upload_id"]
+    chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    first = client.put(f"/uploads/{upload_id}/chunks/0", content=chunks[0])
+    incomplete = client.post(f"/uploads/{upload_id}/complete")
+    status = client.get(f"/uploads/{upload_id}").json()
+    for index, chunk in enumerate(chunks[1:], start=1):
+        client.put(f"/uploads/{upload_id}/chunks/{index}", content=chunk)
+    for _ in range(500):
+        suggested = client.get(f"/uploads/{upload_id}").json()["suggested_mapping"]
+        if suggested is not None:
+            break
+        time.sleep(0.01)
+    completed = client.post(f"/uploads/{upload_id}/complete")
+
+    assert first.json()["source_columns"] == ["UserName", "Email"]
+    assert incomplete.status_code == 409
+    assert status["received_chunks"] == [0]
+    assert status["missing_chunks"] == list(range(1, len(chunks)))
+    assert completed.status_code == 201
+    body = completed.json()
+    assert body["suggested_mapping"]["username"] == "UserName"
+    assert suggested == body["suggested_mapping"]
+    assert (test_setup["storage"] / body["saved_filename"]).read_bytes() == content
+    assert client.get(f"/uploads/{upload_id}").status_code == 404
+
+
+def test_resumable_upload_errors(test_setup):
+    too_large = client.post(
+        "/uploads", json={"filename": "big.csv", "size": 200 * 1024 * 1024}
+    )
+    created = client.post("/uploads", json={"filename": "a.csv", "size": 10}).json()
+    upload_id = created["upload_id"]
+
+    short = client.put(f"/uploads/{upload_id}/chunks/0", content=b"a,b\n")
+    out_of_range = client.put(f"/uploads/{upload_id}/chunks/1", content=b"a")
+    deleted = client.delete(f"/uploads/{upload_id}")
+
+    assert too_large.status_code == 413
+    assert short.status_code == 400
+    assert out_of_range.status_code == 400
+    assert deleted.status_code == 204
+    assert client.put(f"/uploads/{upload_id}/chunks/0", content=b"a").status_code == 404
+
+
+def test_upload_gzip_compressed_csv(test_setup):
+    content = b"UserName,Email\nalice,alice@example.com\n"
+
+    response = client.post(
+        "/upload/stream",
+        params={"filename": "users.csv.gz"},
+        content=gzip.compress(content),
+    )
+
+    assert response.status_code == 201
+    assert response.json()["source_columns"] == ["UserName", "Email"]
+    saved = test_setup["storage"] / response.json()["saved_filename"]
+    assert saved.read_bytes() == content
+
+
+def test_upload_uncompressed_size_limit(test_setup, monkeypatch):
+    monkeypatch.setattr("app.main.MAX_UNCOMPRESSED_SIZE", 100)
+    content = gzip.compress(b"UserName,Email\n" + b"alice,alice@example.com\n" * 100)
+
+    response = client.post(
+        "/upload/stream", params={"filename": "users.csv.gz"}, content=content
+    )
+
+    assert response.status_code == 413
+
+
+def test_storage_retention_stats(test_setup):
+    retention = StorageRetention(CSVService(str(test_setup["storage"])), max_age=3600)
+    app.dependency_overrides[get_retention] = lambda: retention
+    saved = test_setup["storage"] / "users.csv"
+    saved.write_text("username,email\nalice,alice@example.com\n")
+    os.utime(saved, (0, 0))
+
+    client.post(
+        "/validate",
+        json={
+            "filename": "users.csv",
+            "mapping": {"username": "username", "email": "email"},
+        },
+    )
+    retention.collect()
+    stats = client.get("/storage").json()
+
+    assert saved.exists()
+    assert stats["runs"] == 1
+    assert stats["uploads"] == 1
+    assert stats["max_age"] == 3600
+
+
+def test_validate_preview(test_setup):
+    content = b"UserName,Email\nalice,alice@example.com\nbob,not-an-email\n"
+    upload = client.post(
+        "/upload",
+        files={"file": ("users.csv", BytesIO(content), "text/csv")},
+    ).json()
+
+    response = client.post(
+        "/validate/preview",
+        json={
+            "filename": upload["saved_filename"],
+            "mapping": {"username": "UserName", "email": "Email"},
+        },
+    )
+    missing = client.post(
+        "/validate/preview", json={"filename": "nope.csv", "mapping": {}}
+    )
+
+    assert response.status_code == 200
+    preview = response.json()
+    assert preview["row_count"] == 2
+    assert preview["fields"]["email"]["invalid"]["rate"] == 0.5
+    assert preview["fields"]["email"]["invalid"]["exact"]
+    assert missing.status_code == 404
+
+
+def wait_for_job(job_id):
+    for _ in range(500):
+        job = client.get(f"/validate/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("validation job did not finish")
+
+
+def test_validate_in_background(test_setup):
+    content = b"UserName,Email\nalice,alice@example.com\nbob,not-an-email\n"
+    upload = client.post(
+        "/upload",
+        files={"file": ("jobs.csv", BytesIO(content), "text/csv")},
+    ).json()
+    request = {
+        "filename": upload["saved_filename"],
+        "mapping": {"username": "UserName", "email": "Email"},
+    }
+
+    response = client.post("/validate", params={"background": True}, json=request)
+    duplicate = client.post("/validate", params={"background": True}, json=request)
+    job = wait_for_job(response.json()["job_id"])
+
+    assert response.status_code == 202
+    assert response.headers["location"] == f"/validate/jobs/{job['job_id']}"
+    assert duplicate.json()["job_id"] == job["job_id"]
+    assert not duplicate.json()["created"]
+    assert job["status"] == "failed"
+    assert job["total_rows"] == 2
+    assert job["detail"] == (
+        "Field types: email (Email): 1 invalid value(s), not a valid email, first rows [1]"
+    )
+    assert {v["category"]: v["status"] for v in job["validators"]} == {
+        "Required Mapping": "passed",
+        "Mapped columns": "passed",
+        "NA values": "passed",
+        "Field types": "failed",
+    }
+    assert client.get("/validate/jobs/nope").status_code == 404
+    assert (
+        client.post(
+            "/validate",
+            params={"background": True},
+            json={"filename": "nope.csv", "mapping": {}},
+        ).status_code
+        == 404
+    )
+
+
+def test_queued_validation_keeps_upload_pinned(test_setup, monkeypatch):
+    jobs = ValidationJobManager(workers=1)
+    monkeypatch.setattr("app.main.validation_jobs", jobs)
+    busy = threading.Event()
+    jobs.submit("busy", "other.csv", [], lambda job: busy.wait(5) and {})
+    upload = client.post(
+        "/upload",
+        files={"file": ("queued.csv", BytesIO(b"UserName\nann\n"), "text/csv")},
+    ).json()
+    filename = upload["saved_filename"]
+
+    job = client.post(
+        "/validate",
+        params={"background": True},
+        json={"filename": filename, "mapping": {"username": "UserName"}},
+    ).json()
+
+    assert job["status"] == "queued"
+    assert upload_pins.is_pinned(filename)
+    busy.set()
+    assert wait_for_job(job["job_id"])["status"] != "error"
+    assert not upload_pins.is_pinned(filename)
+    jobs.shutdown()
+
+
+def test_validation_job_events(test_setup):
+    content = b"UserName,Email\ncarol,carol@example.com\n"
+    upload = client.post(
+        "/upload",
+        files={"file": ("events.csv", BytesIO(content), "text/csv")},
+    ).json()
+    job = client.post(
+        "/validate",
+        params={"background": True},
+        json={
+            "filename": upload["saved_filename"],
+            "mapping": {"username": "UserName", "email": "Email"},
+        },
+    ).json()
+
+    with client.stream("GET", f"/validate/jobs/{job['job_id']}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        lines = list(response.iter_lines())
+    events = [line.removeprefix("event: ") for line in lines if line[:6] == "event:"]
+    data = [line.removeprefix("data: ") for line in lines if line[:5] == "data:"]
+    # The stream ends with the result event
+    body = json.loads(data[-1])
+
+    assert events[-1] == "result"
+    assert set(events[:-1]) <= {"progress"}
+    assert body["status"] == "succeeded"